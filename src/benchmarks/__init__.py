@@ -0,0 +1,8 @@
+"""
+Initializes the 'benchmarks' package.
+
+This package holds performance benchmarks and the synthetic game
+states they run against. Run them from the 'src' directory,
+e.g. 'python -m benchmarks.serializers'.
+"""
+# This file can remain empty.
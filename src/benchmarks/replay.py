@@ -0,0 +1,59 @@
+"""
+replay.py
+
+Benchmarks deterministic replay of the action log (core/action_log.py):
+records a session of random actions, then replays it on a fresh
+controller, checks that the rebuilt state is identical and reports
+the replay throughput in actions per second.
+
+Usage (from the 'src' directory):
+    python -m benchmarks.replay [--actions 20000] [--seed 0] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from core.driver import random_actions
+from core.game_controller import GameController
+
+def record_session(n_actions: int, seed: int) -> GameController:
+    """
+    Plays n_actions random actions on a new game and returns its controller.
+    """
+    controller = GameController(persist_actions=False)
+    controller.new_game(seed=seed)
+    actions = random_actions(controller, random.Random(seed))
+    for _ in range(n_actions - 1):
+        method, args = next(actions)
+        getattr(controller, method)(*args)
+    return controller
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark action log replay.")
+    parser.add_argument("--actions", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    recorded = record_session(args.actions, args.seed)
+    log = recorded.action_log.to_bytes()
+    expected = recorded.game_state.to_sections()
+
+    times: List[float] = []
+    for _ in range(args.repeat):
+        controller = GameController(persist_actions=False)
+        start = time.perf_counter()
+        replayed = controller.replay(log)
+        times.append(time.perf_counter() - start)
+    identical = controller.game_state.to_sections() == expected
+
+    best = min(times)
+    print(f"actions:      {replayed}")
+    print(f"log size:     {len(log) / 1024:.1f} KiB ({len(log) / replayed:.1f} bytes/action)")
+    print(f"replay:       {best * 1000:.1f} ms ({replayed / best:,.0f} actions/s)")
+    print(f"state equal:  {identical}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+serializers.py
+
+Benchmarks the save file backends of core/serializers.py:
+full save time, load time and file size for several roster sizes.
+
+Usage (from the 'src' directory):
+    python -m benchmarks.serializers [--sizes 5 500 50000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+from core.hero import Hero
+from core.save_engine import SaveEngine
+from core.serializers import available_backends, get_serializer
+from benchmarks.synthetic import make_game_state, state_sections
+
+def bench_backend(backend: str, n_heroes: int, repeat: int, directory: str) -> dict:
+    """
+    Returns the best save/load time (seconds) and the file size for one backend and roster size.
+    """
+    sections = state_sections(make_game_state(n_heroes, n_items=n_heroes))
+    filepath = os.path.join(directory, f"bench_{backend}_{n_heroes}.sav")
+    save_times: List[float] = []
+    load_times: List[float] = []
+
+    for _ in range(repeat):
+        # A fresh engine always writes a full snapshot
+        engine = SaveEngine(filepath, serializer=get_serializer(backend))
+        start = time.perf_counter()
+        engine.save(sections)
+        save_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        data = SaveEngine(filepath).load()
+        [Hero.from_dict(h) for h in data["heroes"]]
+        load_times.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "heroes": n_heroes,
+        "save_s": min(save_times),
+        "load_s": min(load_times),
+        "size_bytes": os.path.getsize(filepath),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save file backends.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 500, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'heroes':>8}{'save ms':>12}{'load ms':>12}{'size KiB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_heroes in args.sizes:
+            for backend in available_backends():
+                r = bench_backend(backend, n_heroes, args.repeat, directory)
+                print(f"{r['backend']:<10}{r['heroes']:>8}{r['save_s'] * 1000:>12.2f}"
+                      f"{r['load_s'] * 1000:>12.2f}{r['size_bytes'] / 1024:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+startup.py
+
+Checks the cold start of the game against its budget
+(utils/startup_trace.STARTUP_BUDGETS). Starts the game several times in
+fresh processes with 'main.py --trace-startup --exit-after-startup',
+takes the median of every phase and exits with status 1 if one of them
+is over budget, so a slow import or init is caught before release.
+
+Usage (from the 'src' directory):
+    python -m benchmarks.startup [--runs 5] [--budget first_frame=1.5] [--report startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from utils import startup_trace
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def trace_cold_start() -> Dict[str, Any]:
+    """
+    Runs one traced startup in a new interpreter and returns its report.
+    """
+    fd, report_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run(
+            [sys.executable, "main.py", "--trace-startup", report_path, "--exit-after-startup"],
+            cwd=SRC_DIR, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(report_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(report_path)
+
+def median_report(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    A report whose phases and marks are the medians over several runs.
+    """
+    report = dict(reports[0])
+    report["phases"] = [
+        dict(entry, seconds=statistics.median(r["phases"][i]["seconds"] for r in reports))
+        for i, entry in enumerate(reports[0]["phases"])
+    ]
+    report["marks"] = {
+        name: statistics.median(r["marks"].get(name, float("inf")) for r in reports)
+        for name in reports[0]["marks"]
+    }
+    report["runs"] = len(reports)
+    return report
+
+def parse_budget(text: str):
+    name, _, seconds = text.partition("=")
+    return name, float(seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cold start time against its budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[],
+                        metavar="NAME=SECONDS", help="override or add a budget entry")
+    parser.add_argument("--report", help="write the median report (with budgets) to this JSON file")
+    args = parser.parse_args()
+
+    budgets = dict(startup_trace.STARTUP_BUDGETS, **dict(args.budget))
+    report = median_report([trace_cold_start() for _ in range(args.runs)])
+    report["budgets"] = budgets
+
+    for entry in report["phases"]:
+        print(f"{'  ' * entry['depth']}{entry['name']:<{28 - 2 * entry['depth']}} {entry['seconds'] * 1000:8.1f} ms")
+    for name, seconds in report["marks"].items():
+        print(f"{name:<28} {seconds * 1000:8.1f} ms (since start)")
+
+    problems = startup_trace.check_budget(report, budgets)
+    report["over_budget"] = problems
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    for problem in problems:
+        print(f"OVER BUDGET {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"Startup within budget (median of {args.runs} runs).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+suite.py
+
+Reproducible benchmark suite for core and game_logic. Every benchmark
+runs on a synthetic state built from a fixed seed (benchmarks/synthetic.py),
+so two runs on the same machine measure the same work.
+
+    run      times every benchmark (best and median of --repeat rounds)
+             and writes the results with machine metadata as JSON
+    compare  compares two result files and exits with status 1 if a
+             benchmark got slower than the baseline by more than --threshold
+
+Usage (from the 'src' directory):
+    python -m benchmarks.suite run [--output results.json] [--repeat 5] [--scale 1] [--filter save]
+    python -m benchmarks.suite compare BASELINE.json RESULTS.json [--threshold 0.15]
+
+Regressions are judged on the best round of each benchmark, the figure
+least disturbed by other activity on the machine. Compare results from
+the same machine only (compare warns when the metadata differs).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import make_game_state
+from core.game_controller import GameController
+from core.game_state import GameState
+from game_logic import base_manager, battle_system, hero_manager, item_manager
+
+SEED = 0
+
+# Default slowdown (fraction of the baseline) reported as a regression
+DEFAULT_THRESHOLD = 0.15
+
+# name -> (setup, calls per round); setup(scale, directory) returns the
+# operation to time. Operations must leave the state as they found it
+# (or reset it cheaply themselves) so every round does the same work.
+Benchmark = Callable[[float, str], Callable[[], Any]]
+BENCHMARKS: Dict[str, Tuple[Benchmark, int]] = {}
+
+def benchmark(name: str, number: int):
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+def _size(base: int, scale: float) -> int:
+    return max(int(base * scale), 1)
+
+@benchmark("game_state.save_state", number=20)
+def bench_save_state(scale: float, directory: str):
+    """
+    An autosave of a large state after one inventory change (journal append).
+    """
+    state = make_game_state(_size(5000, scale), n_items=_size(5000, scale), seed=SEED)
+    filepath = os.path.join(directory, "save_state.sav")
+    state.save_state(filepath) # The first save writes the full snapshot
+    gold = [state.inventory["gold"]]
+
+    def run():
+        gold[0] += 1
+        state.mutable_inventory()["gold"] = gold[0]
+        state.save_state(filepath)
+    return run
+
+@benchmark("game_state.load_state", number=5)
+def bench_load_state(scale: float, directory: str):
+    """
+    A full (non-lazy) load of a large save.
+    """
+    filepath = os.path.join(directory, "load_state.sav")
+    make_game_state(_size(5000, scale), n_items=_size(5000, scale), seed=SEED).save_state(filepath)
+
+    def run():
+        GameState().load_state(filepath)
+    return run
+
+@benchmark("hero_manager.calculate_hero_stats", number=2000)
+def bench_calculate_hero_stats(scale: float, directory: str):
+    """
+    One stat calculation from scratch (cache invalidated first).
+    """
+    state = make_game_state(_size(1000, scale), seed=SEED)
+    effects = base_manager.get_base_effects(state)
+    heroes = state.heroes
+    position = [0]
+
+    def run():
+        hero = heroes[position[0] % len(heroes)]
+        position[0] += 1
+        hero_manager.invalidate_hero_stats(hero)
+        hero_manager.calculate_hero_stats(hero, effects)
+    return run
+
+@benchmark("hero_manager.calculate_hero_stats.cached", number=20000)
+def bench_cached_hero_stats(scale: float, directory: str):
+    state = make_game_state(10, seed=SEED)
+    effects = base_manager.get_base_effects(state)
+    hero = state.heroes[0]
+
+    def run():
+        hero_manager.calculate_hero_stats(hero, effects)
+    return run
+
+@benchmark("item_manager.apply_item", number=2000)
+def bench_apply_item(scale: float, directory: str):
+    """
+    Swapping the weapon of a hero in the middle of a large roster.
+    """
+    state = make_game_state(_size(5000, scale), n_items=_size(5000, scale), seed=SEED)
+    state.mutable_base_status()["forge"] = 1 # Unlocks the steel sword
+    state.mutable_inventory().update({"sword_basic": 10**6, "steel_sword": 10**6})
+    hero_id = state.heroes[len(state.heroes) // 2].id
+    weapons = ["steel_sword", "sword_basic"]
+    turn = [0]
+
+    def run():
+        turn[0] ^= 1
+        if not item_manager.apply_item(state, hero_id, weapons[turn[0]]):
+            raise RuntimeError("apply_item failed")
+    return run
+
+@benchmark("base_manager.apply_upgrade", number=2000)
+def bench_apply_upgrade(scale: float, directory: str):
+    """
+    One upgrade (with its base effect update) on a copy-on-write
+    snapshot of a state with many buildings; the snapshot is O(1).
+    """
+    state = make_game_state(10, n_buildings=_size(2000, scale), seed=SEED)
+    base_manager.get_base_effects(state)
+
+    def run():
+        if not base_manager.apply_upgrade(state.snapshot(), "barracks"):
+            raise RuntimeError("apply_upgrade failed")
+    return run
+
+@benchmark("battle_system.process_battle_turn", number=200)
+def bench_process_battle_turn(scale: float, directory: str):
+    """
+    One seeded fight of goblin_encounter, played turn by turn to the end.
+    """
+    controller = GameController(persist_actions=False)
+    controller.new_game(seed=SEED)
+    initial = battle_system.start_battle(controller.game_state, "goblin_encounter")
+    fight = [0]
+
+    def run():
+        fight[0] += 1
+        rng = random.Random(fight[0])
+        battle_state = dict(initial, heroes=[dict(h) for h in initial["heroes"]],
+                            enemies=[dict(e) for e in initial["enemies"]], events=[])
+        while battle_state["result"] is None:
+            battle_system.process_battle_turn(None, battle_state, {"type": "attack"}, rng)
+    return run
+
+@benchmark("game_controller.new_game", number=500)
+def bench_new_game(scale: float, directory: str):
+    controller = GameController(os.path.join(directory, "new_game.sav"), persist_actions=False)
+
+    def run():
+        controller.new_game(seed=SEED)
+    return run
+
+def machine_metadata() -> Dict[str, Any]:
+    """
+    Where and on what the results were measured.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+def run_suite(repeat: int = 5, scale: float = 1.0, name_filter: str = "") -> Dict[str, Any]:
+    """
+    Runs the benchmarks whose name contains name_filter and returns the results
+    (seconds per call, best and median round) with machine metadata.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (setup, number) in BENCHMARKS.items():
+            if name_filter not in name:
+                continue
+            run = setup(scale, directory)
+            run() # Warm-up (imports, caches, first file writes)
+            rounds: List[float] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(number):
+                    run()
+                rounds.append((time.perf_counter() - start) / number)
+            results[name] = {
+                "best_s": min(rounds),
+                "median_s": statistics.median(rounds),
+                "number": number,
+                "rounds": repeat,
+            }
+            print(f"{name:<44}{min(rounds) * 1e6:>12.1f} us{statistics.median(rounds) * 1e6:>12.1f} us", flush=True)
+    return {
+        "metadata": machine_metadata(),
+        "config": {"repeat": repeat, "scale": scale, "seed": SEED},
+        "results": results,
+    }
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compares the best times of the benchmarks both runs have.
+    Returns one entry per benchmark with its ratio to the baseline
+    and whether it regressed (ratio > 1 + threshold).
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["best_s"] / base["best_s"] if base["best_s"] else float("inf")
+        rows.append({
+            "name": name,
+            "baseline_s": base["best_s"],
+            "current_s": result["best_s"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+def _load(filepath: str) -> Dict[str, Any]:
+    with open(filepath) as f:
+        return json.load(f)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for core and game_logic.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="write the results to this JSON file")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--scale", type=float, default=1.0, help="multiplies the synthetic state sizes")
+    run_parser.add_argument("--filter", default="", help="only benchmarks whose name contains this")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed slowdown as a fraction of the baseline (default 0.15)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print(f"{'benchmark':<44}{'best':>15}{'median':>15}")
+        report = run_suite(args.repeat, args.scale, args.filter)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        return
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    for key in ("python", "implementation", "platform", "machine", "processor"):
+        if baseline["metadata"].get(key) != current["metadata"].get(key):
+            print(f"warning: {key} differs ({baseline['metadata'].get(key)} vs {current['metadata'].get(key)})")
+    if baseline["config"] != current["config"]:
+        print(f"warning: config differs ({baseline['config']} vs {current['config']})")
+
+    rows = compare_results(baseline, current, args.threshold)
+    print(f"{'benchmark':<44}{'baseline':>12}{'current':>12}{'change':>10}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:<44}{row['baseline_s'] * 1e6:>10.1f}us{row['current_s'] * 1e6:>10.1f}us"
+              f"{(row['ratio'] - 1) * 100:>+9.1f}%{flag}")
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}.")
+        sys.exit(1)
+    print("No regressions.")
+
+if __name__ == "__main__":
+    main()
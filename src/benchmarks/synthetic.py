@@ -0,0 +1,55 @@
+"""
+synthetic.py
+
+Builds synthetic, seeded game states of arbitrary size for benchmarks.
+"""
+
+import random
+from typing import Dict, Any
+
+from core.game_state import GameState
+from core.hero import Hero
+
+HERO_CLASSES = ("warrior", "mage", "ranger")
+
+def make_hero(index: int, rng: random.Random) -> Hero:
+    """
+    Creates one random hero.
+    """
+    hero_class = rng.choice(HERO_CLASSES)
+    return Hero(
+        id=f"hero_{index}",
+        name=f"{hero_class.capitalize()} {index}",
+        hero_class=hero_class,
+        level=rng.randint(1, 30),
+        current_xp=rng.randint(0, 99),
+        base_stats={"hp": rng.randint(60, 200), "attack": rng.randint(3, 40), "defense": rng.randint(1, 25)},
+        equipment={"weapon": "sword_basic"} if rng.random() < 0.5 else {},
+        is_active=index < 5,
+    )
+
+def make_game_state(n_heroes: int, n_items: int = 0, n_buildings: int = 2, seed: int = 0) -> GameState:
+    """
+    Creates a game state with n_heroes heroes, n_items distinct inventory
+    entries and n_buildings buildings. Same arguments, same state.
+    """
+    rng = random.Random(seed)
+    state = GameState()
+    state.heroes = [make_hero(i, rng) for i in range(n_heroes)]
+    inventory = {"health_potion": 3, "sword_basic": 1, "gold": 1000}
+    inventory.update({f"item_{i}": rng.randint(1, 99) for i in range(n_items)})
+    state.inventory = inventory
+    base_status = {"barracks": 0, "forge": 0}
+    base_status.update({f"building_{i}": rng.randint(0, 5) for i in range(max(n_buildings - 2, 0))})
+    state.base_status = base_status
+    return state
+
+def state_sections(state: GameState) -> Dict[str, Any]:
+    """
+    Returns the save file sections of a state (as GameState.save_state writes them).
+    """
+    return {
+        "heroes": [h.to_dict() for h in state.heroes],
+        "inventory": dict(state.inventory),
+        "base_status": dict(state.base_status),
+    }
@@ -0,0 +1,239 @@
+"""
+ui.py
+
+Frame-time benchmark of the TUI screens, run headless with Textual's
+test pilot against synthetic game states of increasing size.
+
+For every screen (MainMenuScreen, BaseScreen, HeroScreen, BattleScreen)
+and state size it measures
+  - compose: time spent in the screen's compose()
+  - mount:   first push of the screen until it is painted
+  - push/pop: showing the (installed) screen again and leaving it
+  - interactions typical of the screen (button presses, keys)
+Each measurement runs from the input event until the messages it caused
+are processed and the screen has been refreshed (settle()): the time the
+player waits for the next frame. Inputs are posted directly rather than
+through Pilot.click/press, whose idle detection sleeps in 20 ms steps.
+The table shows p50 and p99 in milliseconds.
+
+Usage (from the 'src' directory):
+    python -m benchmarks.ui [--sizes 10 1000 10000] [--repeat 30] [--json]
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from textual import events
+from textual.widgets import Button
+
+from benchmarks.synthetic import make_game_state
+from core.game_controller import GameController
+from tui.app import GameApp
+
+# Terminal size of the headless app
+SCREEN_SIZE = (160, 50)
+
+Timings = Dict[str, List[float]] # measurement -> seconds
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)), 1) - 1]
+
+def _time_compose(screen, timings: Timings):
+    """
+    Wraps the compose() of a screen instance to time the work done in it
+    (not the time its widgets spend being mounted in between).
+    """
+    compose = screen.compose
+
+    def timed_compose():
+        elapsed = 0.0
+        widgets = compose()
+        while True:
+            start = time.perf_counter()
+            try:
+                widget = next(widgets)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                break
+            elapsed += time.perf_counter() - start
+            yield widget
+        timings.setdefault("compose", []).append(elapsed)
+    screen.compose = timed_compose
+
+async def _drain(app):
+    """
+    Waits until the app, the current screen and the focused widget have
+    processed the messages queued so far.
+    """
+    nodes = {app, app.screen}
+    if app.focused is not None:
+        nodes.add(app.focused)
+    count = 0
+    drained = asyncio.Event()
+
+    def processed():
+        nonlocal count
+        count -= 1
+        if count == 0:
+            drained.set()
+
+    for node in nodes:
+        if node.call_later(processed):
+            count += 1
+    if count:
+        await drained.wait()
+
+async def settle(app):
+    """
+    Waits until an input has been fully handled: the messages it caused
+    (and those their handlers posted) are processed and the screen has
+    been refreshed.
+    """
+    await _drain(app)
+    await _drain(app)
+    refreshed = asyncio.get_running_loop().create_future()
+    app.screen.call_after_refresh(lambda: refreshed.done() or refreshed.set_result(None))
+    await refreshed
+
+async def _timed(timings: Timings, name: str, app, action: Callable[[], Any]):
+    start = time.perf_counter()
+    result = action()
+    if inspect.isawaitable(result):
+        await result
+    await settle(app)
+    timings.setdefault(name, []).append(time.perf_counter() - start)
+
+def _press(app, button_id: str) -> Callable[[], Any]:
+    return lambda: app.screen.query_one(button_id, Button).press()
+
+def _key(app, key: str) -> Callable[[], Any]:
+    return lambda: app.post_message(events.Key(key, key if len(key) == 1 else None))
+
+async def bench_screens(size: int, repeat: int, directory: str) -> Dict[str, Timings]:
+    """
+    Runs every screen benchmark against a state of 'size' heroes, items
+    and buildings and returns the timings per screen.
+    """
+    controller = GameController(os.path.join(directory, f"ui_{size}.sav"), persist_actions=False)
+    controller.new_game(seed=0)
+    state = make_game_state(size, n_items=size, n_buildings=size, seed=0)
+    controller.game_state = state
+
+    results: Dict[str, Timings] = {}
+    app = GameApp(controller=controller)
+    async with app.run_test(size=SCREEN_SIZE):
+        await settle(app)
+        menu = app.screen
+        timings = results["MainMenuScreen"] = {}
+        # The main menu was mounted by the app itself; time fresh ones
+        for _ in range(repeat):
+            fresh = type(menu)()
+            _time_compose(fresh, timings)
+            await _timed(timings, "mount", app, lambda: app.push_screen(fresh))
+            await _timed(timings, "pop", app, app.pop_screen)
+
+        for screen_name, button_id in (("base", "#btn_goto_base"), ("heroes", "#btn_goto_heroes"),
+                                       ("battle", "#btn_goto_battle")):
+            screen = app.get_screen(screen_name)
+            timings = results[type(screen).__name__] = {}
+            _time_compose(screen, timings)
+            await _timed(timings, "mount", app, _press(app, button_id))
+            await _timed(timings, "pop", app, app.pop_screen)
+            for _ in range(repeat):
+                await _timed(timings, "push", app, _press(app, button_id))
+                await _timed(timings, "pop", app, app.pop_screen)
+            await app.push_screen(screen_name)
+            await settle(app)
+            await INTERACTIONS[screen_name](app, timings, repeat)
+            await app.pop_screen()
+            await settle(app)
+    controller.shutdown()
+    return results
+
+async def _base_interactions(app, timings: Timings, repeat: int):
+    screen = app.screen
+    buildings = screen.query_one("#upgrade_list")
+    for _ in range(repeat):
+        buildings.focus()
+        buildings.select("barracks")
+        await settle(app)
+        await _timed(timings, "upgrade", app, _key(app, "enter"))
+        app.controller.undo_upgrade()
+        screen.refresh_base_display(["barracks"])
+        await settle(app)
+
+async def _hero_interactions(app, timings: Timings, repeat: int):
+    for _ in range(repeat):
+        await _timed(timings, "sort", app, _press(app, "#btn_sort"))
+    app.screen.query_one("#inventory_list").focus()
+    for _ in range(repeat):
+        await _timed(timings, "cursor down", app, _key(app, "down"))
+        await _timed(timings, "page down", app, _key(app, "pagedown"))
+    app.screen.query_one("#inventory_filter").focus()
+    for _ in range(repeat):
+        await _timed(timings, "filter key", app, _key(app, "1"))
+        await _timed(timings, "filter key", app, _key(app, "backspace"))
+
+async def _battle_interactions(app, timings: Timings, repeat: int):
+    for _ in range(repeat):
+        if app.screen.battle_state.get("result"):
+            # Leave and come back for a new battle
+            await app.pop_screen()
+            await app.push_screen("battle")
+            await settle(app)
+        await _timed(timings, "attack", app, _press(app, "#btn_attack"))
+        # Let the battle log's frame timer paint the turn
+        await asyncio.sleep(1 / 30)
+
+INTERACTIONS = {
+    "base": _base_interactions,
+    "heroes": _hero_interactions,
+    "battle": _battle_interactions,
+}
+
+def summarize(results: Dict[str, Timings]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    return {
+        screen: {
+            name: {
+                "count": len(values),
+                "p50_ms": statistics.median(values) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+            for name, values in timings.items()
+        }
+        for screen, timings in results.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TUI screen frame times.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10_000],
+                        help="heroes, items and buildings of the synthetic states")
+    parser.add_argument("--repeat", type=int, default=30, help="samples per interaction")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            report[size] = summarize(asyncio.run(bench_screens(size, args.repeat, directory)))
+
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(f"{'size':>7}  {'screen':<16}{'measurement':<14}{'p50 ms':>10}{'p99 ms':>10}")
+    for size, screens in report.items():
+        for screen, measurements in screens.items():
+            for name, summary in measurements.items():
+                print(f"{size:>7}  {screen:<16}{name:<14}{summary['p50_ms']:>10.2f}{summary['p99_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
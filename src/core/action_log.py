@@ -0,0 +1,233 @@
+"""
+action_log.py
+
+A compact binary log of every state-changing GameController call.
+
+Together with the seeded RNG of the controller, the log makes a session
+deterministic: replaying its actions on top of the state they started
+from rebuilds the exact same state (see GameController.replay).
+
+Record layout (little endian):
+    u8 opcode | u16 payload length | payload
+Payload: one field per argument, either
+    b"i" + i64            (int)
+    b"s" + u16 len + utf8 (str)
+    b"n"                  (None)
+"""
+
+import os
+import struct
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Opcodes
+NEW_GAME = 1         # (seed)
+CHECKPOINT = 2       # (seed) - state was saved here; the RNG is reseeded
+EQUIP_ITEM = 3       # (hero_id, item_id)
+UPGRADE_BUILDING = 4 # (building)
+UNDO_UPGRADE = 5     # ()
+START_BATTLE = 6     # (encounter_id)
+BATTLE_TURN = 7      # (action type, target_index)
+
+OPCODE_NAMES = {
+    NEW_GAME: "new_game",
+    CHECKPOINT: "checkpoint",
+    EQUIP_ITEM: "equip_item",
+    UPGRADE_BUILDING: "upgrade_building",
+    UNDO_UPGRADE: "undo_upgrade",
+    START_BATTLE: "start_battle",
+    BATTLE_TURN: "battle_turn",
+}
+
+_HEADER = struct.Struct("<BH")
+_INT = struct.Struct("<q")
+_LEN = struct.Struct("<H")
+
+Field = Union[int, str, None]
+
+def encode_record(opcode: int, args: Tuple[Field, ...]) -> bytes:
+    """
+    Encodes one action as a binary record.
+    """
+    payload = bytearray()
+    for arg in args:
+        if arg is None:
+            payload += b"n"
+        elif isinstance(arg, int):
+            payload += b"i" + _INT.pack(arg)
+        else:
+            data = str(arg).encode("utf-8")
+            payload += b"s" + _LEN.pack(len(data)) + data
+    return _HEADER.pack(opcode, len(payload)) + payload
+
+def decode_records(data: bytes) -> Iterator[Tuple[int, Tuple[Field, ...]]]:
+    """
+    Yields (opcode, args) for every complete record in data.
+    A truncated record at the end (e.g., from a crash) is ignored.
+    """
+    view = memoryview(data)
+    pos = 0
+    while pos + _HEADER.size <= len(view):
+        opcode, length = _HEADER.unpack_from(view, pos)
+        end = pos + _HEADER.size + length
+        if end > len(view):
+            return
+        args: List[Field] = []
+        p = pos + _HEADER.size
+        while p < end:
+            tag = view[p:p + 1].tobytes()
+            p += 1
+            if tag == b"i":
+                args.append(_INT.unpack_from(view, p)[0])
+                p += _INT.size
+            elif tag == b"s":
+                (n,) = _LEN.unpack_from(view, p)
+                p += _LEN.size
+                args.append(view[p:p + n].tobytes().decode("utf-8"))
+                p += n
+            else:
+                args.append(None)
+        yield opcode, tuple(args)
+        pos = end
+
+class ActionLog:
+    """
+    In-memory action log, optionally mirrored to an append-only file
+    so a crashed session can be rebuilt.
+    """
+
+    def __init__(self, filepath: Optional[str] = None):
+        self.filepath = filepath
+        self._data = bytearray()
+        # Offsets are absolute: bytes already discarded from the front
+        self._base = 0
+        self._file = None
+        self._detached = False # See detach()
+        self._lock = threading.Lock()
+
+    def _open_file(self):
+        # Called with self._lock held. The file is created on the first write.
+        if self._file is None and self.filepath is not None and not self._detached:
+            self._file = open(self.filepath, 'ab')
+
+    def append(self, opcode: int, *args: Field) -> int:
+        """
+        Records an action. Returns the log offset before the record.
+        """
+        record = encode_record(opcode, args)
+        with self._lock:
+            offset = self._base + len(self._data)
+            self._data += record
+            self._open_file()
+            if self._file is not None:
+                self._file.write(record)
+                self._file.flush()
+        return offset
+
+    def reset(self, opcode: int, *args: Field):
+        """
+        Starts a new log whose first record is (opcode, args),
+        e.g. NEW_GAME: nothing before it is needed for a replay.
+        Returns the offset of that record.
+        """
+        with self._lock:
+            self._base += len(self._data)
+            self._data = bytearray()
+            self._detached = False
+            self._open_file()
+            if self._file is not None:
+                self._file.seek(0)
+                self._file.truncate()
+        return self.append(opcode, *args)
+
+    def discard_before(self, offset: int):
+        """
+        Drops all records before offset (a value returned by append),
+        e.g. once the state at that point has been saved.
+        Safe to call from another thread.
+        """
+        with self._lock:
+            cut = offset - self._base
+            if cut <= 0:
+                return
+            self._data = self._data[cut:]
+            self._base = offset
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._rewrite_file()
+                self._file = open(self.filepath, 'ab')
+
+    def _rewrite_file(self):
+        # Called with self._lock held: atomically replaces the file with the in-memory log
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.filepath) + ".",
+                                        dir=os.path.dirname(os.path.abspath(self.filepath)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def detach(self):
+        """
+        Empties the log and stops mirroring it to its file, which is left
+        as it is (e.g., a crash log that could not be recovered because
+        its save did not load). The next reset() or attach() attaches it again.
+        """
+        with self._lock:
+            self._base += len(self._data)
+            self._data = bytearray()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._detached = True
+
+    def attach(self):
+        """
+        Mirrors the log to its file again after detach(), replacing the
+        file with what was logged since (e.g., once a crash log has been
+        replayed successfully).
+        """
+        with self._lock:
+            self._detached = False
+            if self.filepath is not None and self._file is None:
+                self._rewrite_file()
+                self._file = open(self.filepath, 'ab')
+
+    @property
+    def size(self) -> int:
+        """
+        Current length of the log in bytes.
+        """
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            return bytes(self._data)
+
+    def __iter__(self) -> Iterator[Tuple[int, Tuple[Field, ...]]]:
+        return decode_records(self.to_bytes())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def read_log_file(filepath: str) -> bytes:
+    """
+    Returns the contents of a log file, or b"" if it does not exist.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
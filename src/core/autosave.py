@@ -0,0 +1,108 @@
+"""
+autosave.py
+
+Saves the game state on a background thread so the Textual event loop
+never blocks on file I/O.
+
+request_save() takes a copy-on-write snapshot of the state (O(1), see
+GameState.snapshot) and returns immediately. A worker thread serializes
+the snapshot and writes it through the save engine. Requests that
+arrive while a write is pending or running are merged: only the newest
+snapshot is written.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core.save_engine import get_save_engine
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from core.game_state import GameState
+
+log = get_logger(__name__)
+
+class AutosaveService:
+    """
+    Coalescing background writer for one save file.
+    """
+
+    def __init__(self, filepath: str = "savegame.sav", coalesce_delay: float = 0.25):
+        self.filepath = filepath
+        # Time to wait for further requests before writing a snapshot
+        self.coalesce_delay = coalesce_delay
+
+        self._condition = threading.Condition()
+        self._pending: Optional["GameState"] = None
+        self._on_saved: Optional[Callable[[], None]] = None
+        self._writing = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters (e.g., to confirm that bursts were merged)
+        self.requests = 0
+        self.writes = 0
+
+    def request_save(self, game_state: "GameState", on_saved: Optional[Callable[[], None]] = None):
+        """
+        Queues a save of the current game state. Returns immediately.
+        on_saved is called on the worker thread once this state (or a
+        newer one that replaced it) is on disk.
+        """
+        snapshot = game_state.snapshot()
+        with self._condition:
+            self._pending = snapshot # A newer snapshot replaces an unwritten one
+            self._on_saved = on_saved
+            self.requests += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every queued save has been written.
+        Returns False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Writes any queued save and stops the worker thread.
+        """
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None:
+                    return # Stopping with nothing left to write
+
+            # Give a burst of requests the chance to merge into one write
+            if self.coalesce_delay > 0 and not self._stopping:
+                time.sleep(self.coalesce_delay)
+
+            with self._condition:
+                snapshot, self._pending = self._pending, None
+                on_saved, self._on_saved = self._on_saved, None
+                self._writing = True
+            try:
+                get_save_engine(self.filepath).save(snapshot.to_sections())
+                self.writes += 1
+                if on_saved is not None:
+                    on_saved()
+            except Exception as e:
+                log.error("Autosave to %s failed: %s", self.filepath, e, exc_info=True)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,242 @@
+"""
+driver.py
+
+Drives GameController without Textual, for load and throughput tests
+of the rules engine (see loadtest.py for the command line).
+
+A Session is one independent game (its own controller and seeded new
+game) fed by an action stream: either random actions that are valid
+in the current state (random_actions) or a script (load_script) - a
+JSON list of [method, arg...] entries naming GameController methods,
+e.g.
+    [["start_battle", "goblin_encounter"], ["battle_turn", "attack"],
+     ["upgrade_building", "barracks"], ["equip_item", "hero_0", "sword_basic"]]
+Scripts are repeated until a session has played its number of actions;
+battle turns a script asks for after its battle ended are skipped (and
+counted as refused), and a "new_game" without a seed restarts with the
+session's seed, so scripted runs are as reproducible as random ones.
+scripts/battle.json is an example.
+
+run_sessions spreads many sessions over worker processes; each worker
+interleaves its sessions one action at a time, like concurrent players
+sharing one server process. Every action is timed, so the report has
+the throughput and the exact latency distribution (tail included) per
+action type.
+"""
+
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.game_controller import GameController
+from game_logic import battle_system
+from game_logic.item_catalog import get_item_catalog
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# GameController methods an action stream may call
+ACTIONS = ("new_game", "equip_item", "upgrade_building", "undo_upgrade",
+           "start_battle", "battle_turn", "save_game")
+
+# Latency percentiles in reports
+PERCENTILES = (50, 90, 99, 99.9)
+
+Action = Tuple[str, Sequence[Any]] # (method, args)
+
+def session_seed(seed: int, session_index: int) -> int:
+    """
+    Seed of one session of a run (independent of how sessions are split across workers).
+    """
+    return (seed << 32) + session_index
+
+def load_script(filepath: str) -> List[Action]:
+    """
+    Reads a script file. Raises ValueError for an empty script or an
+    entry that is not [method, arg...] with a method from ACTIONS.
+    """
+    with open(filepath) as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"Script {filepath} must be a non-empty list of [method, arg...] entries.")
+    script = []
+    for entry in entries:
+        if not isinstance(entry, list) or not entry or entry[0] not in ACTIONS:
+            raise ValueError(f"Invalid script entry {entry!r}; methods are {', '.join(ACTIONS)}.")
+        script.append((entry[0], tuple(entry[1:])))
+    return script
+
+def scripted_actions(script: List[Action]) -> Iterator[Action]:
+    while True:
+        yield from script
+
+def random_actions(controller: GameController, rng: random.Random) -> Iterator[Action]:
+    """
+    Endless random actions that make sense in the controller's current
+    state: battle turns while a battle runs, otherwise equipping,
+    upgrades, undos and new battles.
+    """
+    encounters = battle_system.list_encounters()
+    item_ids = sorted(get_item_catalog().items)
+    while True:
+        if controller.battle_state is not None:
+            yield "battle_turn", ("attack", rng.choice([None, 0, 1]))
+            continue
+        roll = rng.random()
+        if roll < 0.4:
+            hero = rng.choice(controller.game_state.heroes)
+            yield "equip_item", (hero.id, rng.choice(item_ids))
+        elif roll < 0.6:
+            yield "upgrade_building", (rng.choice(list(controller.game_state.base_status)),)
+        elif roll < 0.7:
+            yield "undo_upgrade", ()
+        else:
+            yield "start_battle", (rng.choice(encounters),)
+
+class SessionStats:
+    """
+    Latencies (ns) of the actions of one or more sessions, per method.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, array] = {}
+        self.failed = 0 # Actions the rules refused (returned False)
+        self.errors = 0 # Actions that raised
+
+    @property
+    def actions(self) -> int:
+        return sum(len(a) for a in self.latencies.values())
+
+    def record(self, method: str, elapsed_ns: int):
+        latencies = self.latencies.get(method)
+        if latencies is None:
+            latencies = self.latencies[method] = array('q')
+        latencies.append(elapsed_ns)
+
+    def merge(self, other: "SessionStats"):
+        for method, latencies in other.latencies.items():
+            self.latencies.setdefault(method, array('q')).extend(latencies)
+        self.failed += other.failed
+        self.errors += other.errors
+
+def latency_summary(latencies: Sequence[int]) -> Dict[str, float]:
+    """
+    Count, mean and percentiles (nearest rank) of latencies in ns, in microseconds.
+    """
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"count": 0}
+    summary = {"count": len(ordered), "mean_us": sum(ordered) / len(ordered) / 1000}
+    for p in PERCENTILES:
+        rank = max(math.ceil(p / 100 * len(ordered)), 1)
+        summary[f"p{p:g}_us"] = ordered[rank - 1] / 1000
+    summary["max_us"] = ordered[-1] / 1000
+    return summary
+
+class Session:
+    """
+    One headless game fed by an action stream.
+    """
+
+    def __init__(self, seed: int, save_path: str, script: Optional[List[Action]] = None):
+        self.seed = seed
+        self.controller = GameController(save_path, persist_actions=False)
+        self.controller.new_game(seed=seed)
+        if script is not None:
+            self.actions = scripted_actions(script)
+        else:
+            self.actions = random_actions(self.controller, random.Random(seed))
+        self.stats = SessionStats()
+
+    def step(self):
+        """
+        Plays the next action and records its latency.
+        """
+        method, args = next(self.actions)
+        if method == "battle_turn" and self.controller.battle_state is None:
+            # A script with more turns than the battle lasted; not an action
+            self.stats.failed += 1
+            return
+        if method == "new_game" and not args:
+            args = (self.seed,)
+        start = time.perf_counter_ns()
+        try:
+            result = getattr(self.controller, method)(*args)
+        except Exception:
+            log.debug("Action %s%r raised.", method, tuple(args), exc_info=True)
+            self.stats.errors += 1
+            result = None
+        self.stats.record(method, time.perf_counter_ns() - start)
+        if result is False:
+            self.stats.failed += 1
+
+    def close(self):
+        self.controller.shutdown()
+
+def run_worker(session_indexes: List[int], n_actions: int, seed: int,
+               script: Optional[List[Action]] = None, save_dir: Optional[str] = None) -> SessionStats:
+    """
+    Plays n_actions actions in each of the given sessions, interleaved.
+    save_dir: where sessions write their saves (save_game actions);
+    by default a temporary directory that is removed afterwards.
+    """
+    if save_dir is None:
+        with tempfile.TemporaryDirectory() as directory:
+            return run_worker(session_indexes, n_actions, seed, script, directory)
+
+    sessions = [
+        Session(session_seed(seed, i), os.path.join(save_dir, f"session_{i}.sav"), script)
+        for i in session_indexes
+    ]
+    for _ in range(n_actions):
+        for session in sessions:
+            session.step()
+    stats = SessionStats()
+    for session in sessions:
+        session.close()
+        stats.merge(session.stats)
+    return stats
+
+def run_sessions(n_sessions: int, n_actions: int, seed: int = 0, workers: Optional[int] = None,
+                 script: Optional[List[Action]] = None, save_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs n_sessions sessions of n_actions actions each on a pool of
+    worker processes (default: one per CPU, at most one per session)
+    and returns the report: throughput, and latency per action type
+    and overall.
+    """
+    workers = min(workers or os.cpu_count() or 1, n_sessions)
+    assignments = [list(range(w, n_sessions, workers)) for w in range(workers)]
+    total = SessionStats()
+    start = time.perf_counter()
+    if workers == 1:
+        total.merge(run_worker(assignments[0], n_actions, seed, script, save_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_worker, indexes, n_actions, seed, script, save_dir)
+                       for indexes in assignments]
+            for future in as_completed(futures):
+                total.merge(future.result())
+    elapsed = time.perf_counter() - start
+
+    everything = array('q')
+    for latencies in total.latencies.values():
+        everything.extend(latencies)
+    return {
+        "sessions": n_sessions,
+        "workers": workers,
+        "actions": total.actions,
+        "failed": total.failed,
+        "errors": total.errors,
+        "seconds": elapsed,
+        "actions_per_second": total.actions / elapsed if elapsed else 0.0,
+        "latency": latency_summary(everything),
+        "by_action": {method: latency_summary(latencies)
+                      for method, latencies in sorted(total.latencies.items())},
+    }
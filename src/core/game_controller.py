@@ -4,88 +4,291 @@ game_controller.py
 The main "conductor" of the game.
 Manages game state transitions and coordinates between the TUI
 and the game logic modules.
+
+Every state-changing call is recorded in an action log (see
+action_log.py), and all randomness comes from the controller's seeded
+RNG. Replaying the log therefore rebuilds the exact same state, e.g.
+to reproduce a bug or to recover the actions since the last save after
+a crash. save_game() marks a checkpoint in the log; records before the
+checkpoint are dropped once the save is on disk.
 """
 
+import functools
+import os
+import random
+
+from core import action_log
+from core.action_log import ActionLog, decode_records, read_log_file
+from core.autosave import AutosaveService
 from core.game_state import GameState
-# from game_logic import hero_manager, item_manager, battle_system, base_manager
-from typing import Any # Using 'Any' for stubs
+from core.hero import Hero
+from game_logic import hero_manager, item_manager, battle_system, base_manager
+from game_logic.content import get_content
+from utils import instrumentation, startup_trace
+from utils.logger import get_logger
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union # Using 'Any' for stubs
+
+log = get_logger(__name__)
+
+# Hero classes (data/heroes.json) of a new game's party
+STARTING_PARTY = ("warrior", "mage")
+
+# Number of base upgrades that can be undone
+MAX_UNDO_STEPS = 20
+
+# The game's save file. Its sectioned format (see core/serializers.py)
+# lets load_game show the first screen before the whole save is decoded.
+SAVE_PATH = "savegame.sav"
+
+# Saves of older versions were plain JSON documents next to it, e.g.
+# 'savegame.json'; load_game reads such a save if there is no other
+# one yet, and saves it in the new format.
+LEGACY_SAVE_EXTENSION = ".json"
+
+# The action log of a save is kept next to it, e.g. 'savegame.sav.actions'
+ACTION_LOG_SUFFIX = ".actions"
+
+# Controller method that replays each action log opcode
+_REPLAY_METHODS = {
+    action_log.NEW_GAME: "new_game",
+    action_log.CHECKPOINT: "_checkpoint",
+    action_log.EQUIP_ITEM: "equip_item",
+    action_log.UPGRADE_BUILDING: "upgrade_building",
+    action_log.UNDO_UPGRADE: "undo_upgrade",
+    action_log.START_BATTLE: "start_battle",
+    action_log.BATTLE_TURN: "battle_turn",
+}
 
 class GameController:
     """
     Manages the game's core state and logic flow.
     """
-    def __init__(self):
+    def __init__(self, save_path: str = SAVE_PATH, persist_actions: bool = False):
+        """
+        persist_actions: mirror the action log to a file next to the save,
+        so the actions since the last save survive a crash (the game
+        itself turns this on, see main.py).
+        """
+        self.save_path = save_path
+
         # The game_state will hold all persistent data (heroes, inventory, base)
-        self.game_state: GameState = GameState()
+        with startup_trace.phase("GameState init"):
+            self.game_state: GameState = GameState()
 
         # The controller will also manage the current high-level game state
         # e.g., "MAIN_MENU", "BATTLE", "BASE_MANAGEMENT"
         self.current_screen: str = "MAIN_MENU"
 
-        print("GameController initialized.")
+        # Writes saves on a worker thread so the TUI never waits for the disk
+        self.autosave = AutosaveService(save_path)
+
+        # Copy-on-write snapshots taken before each base upgrade (newest last)
+        self._undo_stack: List[GameState] = []
+
+        # Source of all randomness in the game; reseeded by new_game and at checkpoints
+        self.rng = random.Random()
+        self.action_log = ActionLog(save_path + ACTION_LOG_SUFFIX if persist_actions else None)
+
+        # The running battle (None outside of battles)
+        self.battle_state: Optional[Dict[str, Any]] = None
+
+        log.debug("GameController initialized.")
 
-    def new_game(self):
+    def new_game(self, seed: Optional[int] = None):
         """
         Initializes a new game state with starting values.
         (Called from MainMenuScreen)
+        The game's RNG is seeded with seed (a random one if None).
         """
-        print("Initializing new game state...")
+        log.debug("Initializing new game state...")
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.rng = random.Random(seed)
+        self.action_log.reset(action_log.NEW_GAME, seed)
+
         # 1. Create a fresh GameState object
         self.game_state = GameState()
+        self._undo_stack.clear()
+        self.battle_state = None
 
-        # 2. Add starting heroes (example structure)
-        # In a real implementation, load archetypes from heroes.json
-        self.game_state.heroes.append({
-            "id": "hero_0",
-            "name": "Warrior Hero",
-            "class": "warrior",
-            "level": 1,
-            "current_xp": 0,
-            "base_stats": {"hp": 120, "attack": 12, "defense": 8},
-            "equipment": {}, # e.g., {"weapon": "sword_basic"}
-            "is_active": True
-        })
-        self.game_state.heroes.append({
-            "id": "hero_1",
-            "name": "Mage Hero",
-            "class": "mage",
-            "level": 1,
-            "current_xp": 0,
-            "base_stats": {"hp": 80, "attack": 5, "defense": 3},
-            "equipment": {},
-            "is_active": True
-        })
-        # Add up to 5 heroes as needed
+        # 2. Add the starting heroes from their class templates (data/heroes.json)
+        hero_classes = get_content().heroes
+        self.game_state.heroes = [
+            Hero.from_template(f"hero_{index}", hero_class, hero_classes[hero_class])
+            for index, hero_class in enumerate(STARTING_PARTY)
+        ]
 
         # 3. Add starting items
-        self.game_state.inventory["health_potion"] = 3
-        self.game_state.inventory["sword_basic"] = 1 # Example starting item
+        self.game_state.inventory = {
+            "health_potion": 3,
+            "sword_basic": 1, # Example starting item
+            "gold": 250, # Enough for the level 1 barracks and forge
+        }
 
         # 4. Set initial base status
-        self.game_state.base_status["barracks"] = 0
-        self.game_state.base_status["forge"] = 0
+        self.game_state.base_status = {"barracks": 0, "forge": 0}
 
-        print("New game state initialized with starting heroes, items, and base status.")
+        log.info("New game state initialized with starting heroes, items, and base status.", extra={"seed": seed})
 
 
-    def load_game(self):
+    def load_game(self) -> bool:
         """
         Loads the game state from a file.
         (Responsibility is in game_state.py, but controller triggers it)
+        The reserve roster and the inventory are built in the background
+        (see GameState.load_state for what is decoded up front).
+        Actions logged after the save (e.g., before a crash) are replayed.
+        A plain JSON save of an older version is converted (see _load_path).
+
+        Returns False if there is no save or it could not be read. The
+        state is then empty, and neither the save nor its action log is
+        touched, so nothing is lost until the player starts a new game or saves.
         """
+        # Make sure a queued save is on disk before reading it back
+        self.autosave.flush()
+        load_path = self._load_path()
+        unsaved_actions = read_log_file(load_path + ACTION_LOG_SUFFIX) if self.action_log.filepath else b""
+
         # Re-initialize GameState before loading to clear any old data
         self.game_state = GameState()
-        self.game_state.load_state() # load_state handles FileNotFoundError etc.
-        print("Controller triggered game load.")
+        self._undo_stack.clear()
+        self.battle_state = None
+        if not self.game_state.load_state(load_path, lazy=True): # load_state handles FileNotFoundError etc.
+            self._abandon_load()
+            log.warning("Could not load %s; the save and its action log were left unchanged.", load_path)
+            return False
 
+        migrated = load_path != self.save_path
+        checkpoint_id = self.game_state.meta.get("action_checkpoint")
+        if checkpoint_id is None:
+            # Save without a checkpoint (new or from an older version): give it one
+            self._save_at_checkpoint(reset_log=True)
+        else:
+            try:
+                recovered = self._recover(unsaved_actions, checkpoint_id)
+            except Exception as e:
+                # E.g., an action on content that was removed since: the
+                # next attempt (with that content back) can still recover it
+                self._abandon_load()
+                log.error("Could not replay the unsaved actions of %s: %s; the save and its action log "
+                          "were left unchanged.", load_path, e, exc_info=True)
+                return False
+            if recovered or migrated:
+                self.save_game()
+        if migrated:
+            # The old save is left in place; the game now uses save_path
+            log.info("Converted %s to %s.", load_path, self.save_path)
+        log.debug("Controller triggered game load.")
+        return True
 
-    def save_game(self):
+    def _load_path(self) -> str:
+        """
+        The file load_game reads: the save, or if there is none yet, a
+        save of an older version next to it (e.g. 'savegame.json' for
+        'savegame.sav'), which is then saved again in the new format.
+        """
+        legacy_path = os.path.splitext(self.save_path)[0] + LEGACY_SAVE_EXTENSION
+        if legacy_path != self.save_path and not os.path.exists(self.save_path) and os.path.exists(legacy_path):
+            return legacy_path
+        return self.save_path
+
+    def _abandon_load(self):
+        # Back to an empty state; keep the crash log as it is, and don't record into it either
+        self.game_state = GameState()
+        self._undo_stack.clear()
+        self.battle_state = None
+        self.action_log.detach()
+
+    def _recover(self, unsaved_actions: bytes, checkpoint_id: int) -> bool:
+        """
+        Restarts the action log at the loaded save's checkpoint and replays
+        the logged actions that followed it. Returns True if any were replayed.
+        The log file is only replaced once the replay succeeded; if it
+        raises, the file still holds the unsaved actions.
+        """
+        records = list(decode_records(unsaved_actions))
+        start = next((i for i, (opcode, args) in enumerate(records)
+                      if opcode == action_log.CHECKPOINT and args == (checkpoint_id,)), None)
+        unsaved = [] if start is None else records[start + 1:]
+
+        # Replay into the in-memory log only, then write it to the file
+        self.action_log.detach()
+        self.action_log.append(action_log.CHECKPOINT, checkpoint_id)
+        self.rng = random.Random(checkpoint_id)
+        replayed = self.replay(unsaved)
+        self.action_log.attach()
+        if replayed:
+            log.info("Recovered %d unsaved actions.", replayed)
+        return replayed > 0
+
+    def save_game(self, wait: bool = False):
         """
         Saves the current game state to a file.
         (Responsibility is in game_state.py, but controller triggers it)
+        The write happens on the autosave worker; bursts of calls are
+        merged into one write. Pass wait=True to block until it is on disk.
         """
-        self.game_state.save_state()
-        print("Controller triggered game save.")
+        self._save_at_checkpoint(reset_log=False, wait=wait)
+        log.debug("Controller triggered game save.")
+
+    def _save_at_checkpoint(self, reset_log: bool, wait: bool = False):
+        offset = self._checkpoint(reset_log=reset_log)
+        # Once the save is on disk, the actions before it are no longer needed
+        on_saved = functools.partial(self.action_log.discard_before, offset)
+        self.autosave.request_save(self.game_state, on_saved=on_saved)
+        if wait:
+            self.autosave.flush()
+
+    def _checkpoint(self, checkpoint_id: Optional[int] = None, reset_log: bool = False) -> int:
+        """
+        Records a CHECKPOINT (the state is about to be saved), stores its
+        id in the state and reseeds the RNG with it, so a replay can start
+        from the saved state. Returns the log offset of the record.
+        """
+        if checkpoint_id is None:
+            checkpoint_id = self.rng.getrandbits(63)
+        if reset_log:
+            offset = self.action_log.reset(action_log.CHECKPOINT, checkpoint_id)
+        else:
+            offset = self.action_log.append(action_log.CHECKPOINT, checkpoint_id)
+        self.rng = random.Random(checkpoint_id)
+        self.game_state.meta = dict(self.game_state.meta, action_checkpoint=checkpoint_id)
+        return offset
+
+    def replay(self, actions: Union[bytes, ActionLog, Iterable[Tuple[int, Tuple[Any, ...]]]]) -> int:
+        """
+        Re-executes logged actions (raw log bytes, an ActionLog or decoded
+        records) on the current state. A log that starts with NEW_GAME
+        rebuilds a whole session. The actions are recorded again in this
+        controller's log. Returns the number of actions replayed.
+        """
+        if isinstance(actions, (bytes, bytearray)):
+            actions = decode_records(bytes(actions))
+        count = 0
+        for opcode, args in actions:
+            getattr(self, _REPLAY_METHODS[opcode])(*args)
+            count += 1
+        return count
+
+    def shutdown(self):
+        """
+        Writes any pending save and stops background workers.
+        (Called when the app exits)
+        """
+        self.autosave.stop()
+        self.action_log.close()
+
+    def metrics(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-function metrics of the game rules (calls, latency histogram,
+        allocations), by 'module.function', most total time first.
+        Empty unless instrumentation is enabled (see utils/instrumentation.py).
+        reset: start counting from zero after taking the snapshot.
+        """
+        snapshot = instrumentation.snapshot()
+        if reset:
+            instrumentation.reset()
+        return snapshot
 
     def switch_screen(self, new_screen: str):
         """
@@ -94,7 +297,7 @@ class GameController:
         """
         # Future: Add logic here if needed before/after screen switch
         self.current_screen = new_screen
-        print(f"Stub: Switching screen to {new_screen}")
+        log.debug("Switching screen to %s", new_screen)
         # Actual screen switching is handled by TUI app's push_screen/pop_screen
 
     def equip_item(self, hero_id: Any, item_id: Any):
@@ -102,19 +305,112 @@ class GameController:
         Coordinates the logic for equipping an item to a hero.
         (Based on architecture.md data flow example)
         """
-        print(f"Controller: Attempting to equip item {item_id} on hero {hero_id}...")
-        # --- Future Logic ---
+        log.debug("Attempting to equip item %s on hero %s...", item_id, hero_id)
         # 1. Get game_state
         state = self.game_state
-        # 2. Call logic module (Placeholder - item_manager not imported yet)
-        # success = item_manager.apply_item(state, hero_id, item_id)
-        success = True # Stub
+        # 2. Call logic module
+        success = item_manager.apply_item(state, hero_id, item_id)
+        self.action_log.append(action_log.EQUIP_ITEM, hero_id, item_id)
         # 3. Handle result
         if success:
-            print(f"Controller: Item {item_id} equipped on hero {hero_id}.")
+            log.debug("Item %s equipped on hero %s.", item_id, hero_id)
         else:
-            print(f"Controller: Failed to equip item {item_id} on hero {hero_id}.")
+            log.debug("Failed to equip item %s on hero %s.", item_id, hero_id)
         # 4. (TUI will be notified via event or state watch - handled by Textual)
-        pass
+        return success
+
+    def preview_equip(self, hero_id: Any, item_id: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        "What-if" comparison: returns the hero's stats before and after
+        equipping item_id, without changing the real game state.
+        Returns ({}, {}) if the hero does not exist.
+        """
+        hero = next((h for h in self.game_state.heroes if h.id == hero_id), None)
+        if hero is None:
+            return {}, {}
+        base_effects = base_manager.get_base_effects(self.game_state)
+        before = hero_manager.calculate_hero_stats(hero, base_effects)
+        branch = self.game_state.snapshot()
+        if not item_manager.apply_item(branch, hero_id, item_id):
+            return before, before
+        return before, hero_manager.calculate_hero_stats(branch.mutable_hero(hero_id), base_effects)
+
+    def upgrade_building(self, building: str) -> bool:
+        """
+        Upgrades a base building. The previous state is kept so the
+        upgrade can be reverted with undo_upgrade().
+        """
+        before = self.game_state.snapshot()
+        success = base_manager.apply_upgrade(self.game_state, building)
+        self.action_log.append(action_log.UPGRADE_BUILDING, building)
+        if not success:
+            return False
+        self._undo_stack.append(before)
+        del self._undo_stack[:-MAX_UNDO_STEPS]
+        return True
+
+    def undo_upgrade(self) -> bool:
+        """
+        Restores the state from before the most recent base upgrade
+        (changes made after that upgrade are discarded as well).
+        Returns False if there is nothing to undo.
+        """
+        self.action_log.append(action_log.UNDO_UPGRADE)
+        if not self._undo_stack:
+            return False
+        self.game_state = self._undo_stack.pop()
+        log.debug("Reverted last base upgrade.")
+        return True
+
+    def start_battle(self, encounter_id: str, preview: bool = False) -> Dict[str, Any]:
+        """
+        Starts a battle against an encounter.
+        With preview=True the battle runs against a snapshot of the game
+        state (battle_state["game_state"]), so its outcome never reaches
+        the real heroes or inventory. Previews are not logged and do not
+        advance the game's RNG.
+        Raises KeyError if the encounter does not exist.
+        """
+        if preview:
+            state = self.game_state.snapshot()
+            battle_state = battle_system.start_battle(state, encounter_id)
+            battle_state["game_state"] = state
+            battle_state["rng"] = random.Random()
+            return battle_state
+
+        battle_state = battle_system.start_battle(self.game_state, encounter_id)
+        battle_state["game_state"] = self.game_state
+        # Each battle gets its own stream, drawn from the game's RNG
+        battle_state["rng"] = random.Random(self.rng.getrandbits(32))
+        self.battle_state = battle_state
+        self.action_log.append(action_log.START_BATTLE, encounter_id)
+        return battle_state
+
+    def battle_turn(self, action_type: str = "attack", target_index: Optional[int] = None,
+                    battle_state: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Plays one turn of the running battle (or of a preview battle passed
+        as battle_state). When the battle is won, its rewards are granted
+        and stored in battle_state["granted_rewards"].
+        Returns the battle_state, or None if there is no battle.
+        """
+        preview = battle_state is not None and battle_state is not self.battle_state
+        battle_state = battle_state if preview else self.battle_state
+        if battle_state is None:
+            log.warning("No battle in progress.")
+            return None
+
+        state = battle_state["game_state"] if preview else self.game_state
+        was_over = battle_state.get("result") is not None
+        player_action = {"type": action_type, "target_index": target_index}
+        battle_system.process_battle_turn(state, battle_state, player_action, battle_state["rng"])
+        if not preview:
+            self.action_log.append(action_log.BATTLE_TURN, action_type, target_index)
+
+        if battle_state["result"] and not was_over:
+            battle_state["granted_rewards"] = battle_system.apply_battle_rewards(state, battle_state)
+            if not preview:
+                self.battle_state = None
+        return battle_state
 
 # This file defines the class. It won't be run directly.
\ No newline at end of file
@@ -6,16 +6,55 @@ This includes hero rosters, inventory, and base progression.
 Also responsible for loading and saving the game state.
 """
 
+import itertools
 import json
-from typing import List, Dict, Any
+import threading
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Set
+
+from core.hero import Hero
+from core.save_engine import LazySave, get_save_engine
+from core.serializers import merge_roster
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Inventory versions are unique across all states (see GameState.inventory_version)
+_inventory_versions = itertools.count(1)
 
 class GameState:
     """
     Represents the complete persistent state of the game.
+
+    After a lazy load (load_state(lazy=True)) the reserve heroes and the
+    inventory are still on disk. They are loaded by a background thread,
+    or on first access of 'heroes' or 'inventory', whichever comes first.
+
+    snapshot() returns a copy-on-write branch of the state: both states
+    share the roster, inventory and base_status until one of them writes.
+    Code that changes the state must therefore get what it modifies
+    through mutable_hero(), mutable_heroes(), mutable_inventory() or
+    mutable_base_status(), which copy a shared part before handing it out.
+    'inventory' and 'base_status' are read-only views to enforce this;
+    assigning a new dict to them is fine. (The 'heroes' list is handed
+    out as is, to keep roster reads cheap.)
+
+    inventory_version changes whenever the inventory may have changed
+    (mutable_inventory(), assignment, the end of a lazy load). Two equal
+    versions, even of different states, mean the same inventory contents,
+    so views can keep derived data until the version changes.
     """
     def __init__(self):
+        # Still-open save while a lazy load is in progress
+        self._lazy_save: Optional[LazySave] = None
+        self._load_lock = threading.Lock()
+
+        # Copy-on-write bookkeeping (see snapshot)
+        self._shared: Set[str] = set() # Sections shared with another state
+        self._cow_token: Optional[object] = None # None: never shared, owns all heroes
+
         # Placeholder for the 5-hero team
-        self.heroes: List[Dict[str, Any]] = []
+        self.heroes: List[Hero] = []
 
         # Placeholder for player's inventory
         self.inventory: Dict[str, int] = {} # e.g., {"health_potion": 5}
@@ -23,55 +62,279 @@ class GameState:
         # Placeholder for base progression
         self.base_status: Dict[str, int] = {} # e.g., {"barracks_level": 1}
 
-        print("GameState initialized.") # Removed (stub)
+        # Effects of the base upgrades, derived from base_status (not saved;
+        # None until first needed, see base_manager.get_base_effects).
+        # Dropped whenever base_status is assigned or handed out by
+        # mutable_base_status(); base_manager.apply_upgrade updates it
+        # incrementally instead. Always replaced as a whole, never changed in place.
+        self.base_effects: Optional[Dict[str, Any]] = None
+
+        # Bookkeeping that is saved with the state but is not game data,
+        # e.g., {"action_checkpoint": <id>} (see GameController.save_game).
+        # Always replaced as a whole, never changed in place.
+        self.meta: Dict[str, Any] = {}
+
+        log.debug("GameState initialized.")
+
+    @property
+    def heroes(self) -> List[Hero]:
+        if self._lazy_save is not None:
+            self.finish_loading()
+        return self._heroes
+
+    @heroes.setter
+    def heroes(self, heroes: List[Hero]):
+        self._heroes = heroes
+        self._shared.discard("heroes")
+
+    @property
+    def inventory(self) -> Mapping[str, int]:
+        if self._lazy_save is not None:
+            self.finish_loading()
+        return MappingProxyType(self._inventory)
+
+    @inventory.setter
+    def inventory(self, inventory: Dict[str, int]):
+        self._inventory = inventory
+        self._shared.discard("inventory")
+        self.inventory_version = next(_inventory_versions)
+
+    @property
+    def base_status(self) -> Mapping[str, int]:
+        return MappingProxyType(self._base_status)
+
+    @base_status.setter
+    def base_status(self, base_status: Dict[str, int]):
+        self._base_status = base_status
+        self._shared.discard("base_status")
+        self.base_effects = None
+
+    @property
+    def active_heroes(self) -> List[Hero]:
+        """
+        The heroes of the active team. Available right after a lazy load
+        without waiting for the reserve roster.
+        """
+        if self._lazy_save is not None:
+            return list(self._active_heroes)
+        return [h for h in self._heroes if h.is_active]
+
+    @property
+    def is_loading(self) -> bool:
+        """
+        True while parts of a lazily loaded save are still on disk.
+        """
+        return self._lazy_save is not None
+
+    def finish_loading(self):
+        """
+        Loads the parts of a lazily loaded save that are still on disk.
+        Safe to call from any thread; does nothing if everything is loaded.
+        """
+        with self._load_lock:
+            lazy_save = self._lazy_save
+            if lazy_save is None:
+                return
+            try:
+                reserve_positions, reserve = lazy_save.heroes(active=False)
+                self._heroes = merge_roster(
+                    self._active_positions, self._active_heroes,
+                    reserve_positions, [Hero.from_dict(h) for h in reserve]
+                )
+                self._inventory = lazy_save.section("inventory")
+                self.inventory_version = next(_inventory_versions)
+            except Exception as e:
+                # Keep what was loaded; the rest of the save is unreadable
+                log.error("Error loading the rest of the game state: %s", e)
+                self._heroes = list(self._active_heroes)
+            finally:
+                lazy_save.close()
+                self._lazy_save = None
+
+    def snapshot(self) -> "GameState":
+        """
+        Returns a copy-on-write branch of this state in O(1).
+        Changes made to either state afterwards (through the mutable_*
+        accessors) are not visible in the other one.
+        Both branches need the whole state, so while a lazy load is in
+        progress this first waits for the rest of the save on the calling
+        thread (for a large save, e.g. the first base upgrade right after
+        loading, the UI waits for it).
+        """
+        self.finish_loading()
+        branch = GameState.__new__(GameState)
+        branch._lazy_save = None
+        branch._load_lock = threading.Lock()
+        branch._heroes = self._heroes
+        branch._inventory = self._inventory
+        branch.inventory_version = self.inventory_version
+        branch._base_status = self._base_status
+        branch.meta = self.meta
+        branch.base_effects = self.base_effects
+
+        # Both sides now share everything and own no hero exclusively
+        self._shared = {"heroes", "inventory", "base_status"}
+        branch._shared = {"heroes", "inventory", "base_status"}
+        self._cow_token = object()
+        branch._cow_token = object()
+        return branch
+
+    def mutable_heroes(self) -> List[Hero]:
+        """
+        Returns the roster list for adding, removing or reordering heroes.
+        """
+        if "heroes" in self._shared:
+            self._heroes = list(self.heroes)
+            self._shared.discard("heroes")
+        return self.heroes
+
+    def mutable_hero(self, hero_id: Any) -> Optional[Hero]:
+        """
+        Returns the hero with hero_id for modification, or None if not found.
+        A hero still shared with a snapshot is copied first.
+        """
+        heroes = self.heroes
+        index = next((i for i, h in enumerate(heroes) if h.id == hero_id), None)
+        if index is None:
+            return None
+        return self._mutable_hero_at(index)
+
+    def mutable_heroes_with_ids(self, hero_ids: Iterable[Any]) -> List[Hero]:
+        """
+        Returns the heroes with the given ids for modification, in roster
+        order, finding them all in one pass over the roster.
+        """
+        wanted = set(hero_ids)
+        return [self._mutable_hero_at(i) for i, h in enumerate(self.heroes) if h.id in wanted]
+
+    def _mutable_hero_at(self, index: int) -> Hero:
+        hero = self.heroes[index]
+        if self._cow_token is None or hero.cow_owner is self._cow_token:
+            return hero
+        hero = hero.copy()
+        hero.cow_owner = self._cow_token
+        self.mutable_heroes()[index] = hero
+        return hero
+
+    def mutable_inventory(self) -> Dict[str, int]:
+        """
+        Returns the inventory for modification.
+        """
+        if self._lazy_save is not None:
+            self.finish_loading()
+        if "inventory" in self._shared:
+            self._inventory = dict(self._inventory)
+            self._shared.discard("inventory")
+        self.inventory_version = next(_inventory_versions)
+        return self._inventory
+
+    def mutable_base_status(self) -> Dict[str, int]:
+        """
+        Returns the base status for modification. The cached base_effects
+        are dropped, as they may no longer match.
+        """
+        self.base_effects = None
+        if "base_status" in self._shared:
+            self._base_status = dict(self._base_status)
+            self._shared.discard("base_status")
+        return self._base_status
 
-    def load_state(self, filepath: str = "savegame.json"):
+    def load_state(self, filepath: str = "savegame.sav", lazy: bool = False) -> bool:
         """
         Loads the game state from a file (e.g., JSON).
+        Changes journaled since the last full write are replayed
+        (see save_engine.py).
+
+        With lazy=True only base_status and the active heroes are decoded
+        before returning (the journal, and a plain JSON save, are still
+        decoded whole); the rest is loaded in the background.
+
+        Returns True if the save was loaded, False if there is none or it
+        could not be read (the state is then left empty).
         """
-        # --- Future Logic ---
+        if lazy:
+            return self._load_state_lazy(filepath)
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                # Basic validation: Check if keys exist before assigning
-                self.heroes = data.get("heroes", [])
-                self.inventory = data.get("inventory", {})
-                self.base_status = data.get("base_status", {})
-            print(f"Game state loaded from {filepath}")
+            data = get_save_engine(filepath).load()
+            # Basic validation: Check if keys exist before assigning
+            self.heroes = [Hero.from_dict(h) for h in data.get("heroes", [])]
+            self.inventory = data.get("inventory", {})
+            self.base_status = data.get("base_status", {})
+            self.meta = data.get("meta", {})
+            log.info("Game state loaded from %s", filepath)
+            return True
         except FileNotFoundError:
-            print(f"No save file found at {filepath}. Starting new game (state remains default).")
+            log.info("No save file found at %s. Starting new game (state remains default).", filepath)
             # Keep default empty state if file not found
         except json.JSONDecodeError:
-            print(f"Error decoding JSON from {filepath}. Starting new game (state remains default).")
+            log.error("Error decoding JSON from %s. Starting new game (state remains default).", filepath)
             # Handle corrupted save file
             self.heroes = []
             self.inventory = {}
             self.base_status = {}
         except Exception as e:
             # Catch other potential errors (permissions, etc.)
-            print(f"An unexpected error occurred loading game state: {e}. Starting new game (state remains default).")
+            log.error("An unexpected error occurred loading game state: %s. Starting new game (state remains default).", e, exc_info=True)
             self.heroes = []
             self.inventory = {}
             self.base_status = {}
         # print(f"Stub: Attempting to load state from {filepath}...")
+        return False
+
+    def _load_state_lazy(self, filepath: str) -> bool:
+        try:
+            lazy_save = get_save_engine(filepath).open_lazy()
+        except FileNotFoundError:
+            log.info("No save file found at %s. Starting new game (state remains default).", filepath)
+            return False
+        except Exception as e:
+            log.error("An unexpected error occurred loading game state: %s. Starting new game (state remains default).", e, exc_info=True)
+            return False
 
-    def save_state(self, filepath: str = "savegame.json"):
+        try:
+            self.base_status = lazy_save.section("base_status")
+            self.meta = lazy_save.section("meta")
+            active_positions, active = lazy_save.heroes(active=True)
+        except Exception as e:
+            lazy_save.close()
+            log.error("An unexpected error occurred loading game state: %s. Starting new game (state remains default).", e, exc_info=True)
+            return False
+
+        with self._load_lock:
+            self._active_positions = active_positions
+            self._active_heroes = [Hero.from_dict(h) for h in active]
+            self._heroes = []
+            self._inventory = {}
+            self._lazy_save = lazy_save
+        log.info("Game state partially loaded from %s, loading the rest in the background.", filepath)
+        threading.Thread(target=self.finish_loading, name="state-loader", daemon=True).start()
+        return True
+
+    def to_sections(self) -> Dict[str, Any]:
         """
-        Saves the current game state to a file (e.g., JSON).
+        Returns a detached copy of the state in save file format
+        (safe to serialize on another thread).
         """
-        # --- Future Logic ---
-        data = {
-            "heroes": self.heroes,
-            "inventory": self.inventory,
-            "base_status": self.base_status
+        return {
+            "heroes": [h.to_dict() for h in self.heroes],
+            "inventory": dict(self.inventory),
+            "base_status": dict(self.base_status),
+            "meta": dict(self.meta)
         }
+
+    def save_state(self, filepath: str = "savegame.sav"):
+        """
+        Saves the current game state to a file (e.g., JSON).
+        Only sections that changed since the last save are written,
+        as an atomic append to the save journal (see save_engine.py).
+        """
+        data = self.to_sections()
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4)
-            print(f"Game state saved to {filepath}")
+            written = get_save_engine(filepath).save(data)
+            log.info("Game state saved to %s", filepath, extra={"changed": written})
         except Exception as e:
             # Catch potential errors like permission issues
-            print(f"Error saving game state to {filepath}: {e}")
+            log.error("Error saving game state to %s: %s", filepath, e, exc_info=True)
         # print(f"Stub: Attempting to save state to {filepath}...")
 
 # This file defines the class. It won't be run directly.
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+hero.py
+
+Defines the Hero record held in GameState.heroes.
+A compact, slotted replacement for the free-form hero dictionaries,
+with lossless conversion to and from the save file format.
+"""
+
+from typing import Dict, Any, Optional
+
+class Hero:
+    """
+    A single hero of the player's roster.
+
+    Attributes map 1:1 to the keys of a saved hero, except 'class'
+    (a Python keyword) which is stored as hero_class. Unknown keys
+    found in a save file are kept in 'extra' and written back unchanged.
+
+    cached_stats holds the derived stats computed by hero_manager and is
+    never saved; it is reset whenever one of their inputs changes.
+    cached_bonus is the base bonus (base_effects["hero_stats"]) they
+    were computed with.
+    cow_owner marks which GameState may modify this hero in place
+    (see GameState.snapshot).
+    """
+    __slots__ = (
+        "id", "name", "hero_class", "level", "current_xp",
+        "base_stats", "equipment", "is_active", "extra", "cached_stats",
+        "cached_bonus", "cow_owner",
+    )
+
+    def __init__(self, id: str, name: str, hero_class: str, level: int = 1,
+                 current_xp: int = 0, base_stats: Optional[Dict[str, int]] = None,
+                 equipment: Optional[Dict[str, str]] = None, is_active: bool = True,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.name = name
+        self.hero_class = hero_class
+        self.level = level
+        self.current_xp = current_xp
+        self.base_stats: Dict[str, int] = base_stats if base_stats is not None else {}
+        self.equipment: Dict[str, str] = equipment if equipment is not None else {} # e.g., {"weapon": "sword_basic"}
+        self.is_active = is_active
+        self.extra: Dict[str, Any] = extra if extra is not None else {}
+        self.cached_stats: Optional[Dict[str, int]] = None
+        self.cached_bonus: Optional[Dict[str, int]] = None
+        self.cow_owner: Optional[object] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Hero":
+        """
+        Creates a Hero from its save file representation.
+        """
+        data = dict(data)
+        return cls(
+            id=data.pop("id"),
+            name=data.pop("name", "Unknown Hero"),
+            hero_class=data.pop("class", ""),
+            level=data.pop("level", 1),
+            current_xp=data.pop("current_xp", 0),
+            base_stats=dict(data.pop("base_stats", {})),
+            equipment=dict(data.pop("equipment", {})),
+            is_active=data.pop("is_active", True),
+            extra=data, # Whatever is left is preserved as-is
+        )
+
+    @classmethod
+    def from_template(cls, id: str, hero_class: str, template: Dict[str, Any]) -> "Hero":
+        """
+        Creates a level 1 hero of a class from its template
+        (see game_logic/content.py); the template is not modified.
+        """
+        return cls(id=id, name=template["name"], hero_class=hero_class,
+                   base_stats=dict(template["base_stats"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the save file representation of this hero.
+        """
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "class": self.hero_class,
+            "level": self.level,
+            "current_xp": self.current_xp,
+            "base_stats": dict(self.base_stats),
+            "equipment": dict(self.equipment),
+            "is_active": self.is_active,
+        }
+        data.update(self.extra)
+        return data
+
+    def copy(self) -> "Hero":
+        """
+        Returns an independent copy of this hero (including its cached stats).
+        """
+        hero = Hero(
+            self.id, self.name, self.hero_class, self.level, self.current_xp,
+            dict(self.base_stats), dict(self.equipment), self.is_active, dict(self.extra)
+        )
+        hero.cached_stats = self.cached_stats
+        hero.cached_bonus = self.cached_bonus
+        return hero
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Hero):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # Heroes compare by value and are mutable, so they are not hashable
+    # (like the hero dicts they replace); key collections by hero.id instead.
+    __hash__ = None # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Hero(id={self.id!r}, name={self.name!r}, class={self.hero_class!r}, level={self.level})"
@@ -0,0 +1,302 @@
+"""
+save_engine.py
+
+Incremental, crash-safe persistence for GameState.
+
+A save consists of two files:
+  - the snapshot ('savegame.sav'): the complete state, only ever
+    replaced atomically (write to a temp file, fsync, rename).
+  - the journal ('savegame.sav.journal'): an append-only log with one
+    JSON line per save, holding only the sections that changed.
+
+The snapshot encoding is pluggable (see serializers.py); journal
+records are always single-line JSON.
+
+Loading reads the snapshot and replays the journal on top of it,
+either all at once (load) or section by section (open_lazy). Even
+open_lazy reads and replays the whole journal up front; only the
+snapshot's sections are decoded on demand, and only for sectioned
+snapshots (a plain '.json' snapshot is decoded whole).
+Once the journal grows past a threshold it is folded back into the
+snapshot (compaction) on a background thread.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.serializers import (
+    Serializer, SnapshotReader, get_serializer_for_path, encode_snapshot, decode_snapshot, dumps_compact,
+    is_plain_json_path, loads_json
+)
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Top-level sections of the save file
+SECTIONS = ("heroes", "inventory", "base_status", "meta")
+
+# Number of journal records after which a compaction is started
+DEFAULT_COMPACT_AFTER = 50
+
+def _write_atomic(filepath: str, content: bytes):
+    """
+    Replaces filepath with content; readers see either the old or the new file.
+    """
+    # A unique temp file, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(filepath) + ".",
+                                    dir=os.path.dirname(os.path.abspath(filepath)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _read_journal(journal_path: str, data: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Applies the records of a journal file to data.
+    Stops at the first incomplete or corrupt record (e.g., a torn write).
+    Returns the number of records applied and the byte length of the valid part.
+    """
+    applied = 0
+    valid_length = 0
+    try:
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = loads_json(line)
+                except json.JSONDecodeError:
+                    break
+                data.update(record)
+                applied += 1
+                valid_length += len(line)
+    except FileNotFoundError:
+        pass
+    return applied, valid_length
+
+class SaveEngine:
+    """
+    Writes the sections of one save file incrementally.
+    Use get_save_engine() to share one engine per file path.
+    """
+
+    def __init__(self, filepath: str, compact_after: int = DEFAULT_COMPACT_AFTER,
+                 serializer: Optional[Serializer] = None):
+        self.filepath = filepath
+        self.journal_path = filepath + ".journal"
+        self.compact_after = compact_after
+        # Backend used for new snapshots; existing ones load with any backend
+        self.serializer = serializer or get_serializer_for_path(filepath)
+        # '.json' saves stay plain JSON documents (see serializers.py)
+        self.plain = is_plain_json_path(filepath) and self.serializer.name == "json"
+
+        # Section name -> JSON text of the version currently on disk
+        self._written: Dict[str, str] = {}
+        self._journal_records = 0
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def save(self, sections: Dict[str, Any]) -> List[str]:
+        """
+        Persists the given sections, writing only those that changed
+        since the last save. Returns the names of the written sections.
+        """
+        encoded = {name: dumps_compact(value) for name, value in sections.items()}
+
+        with self._lock:
+            changed = [name for name, text in encoded.items() if self._written.get(name) != text]
+            if not changed:
+                return []
+
+            if not self._written:
+                # First save of this engine: start from a clean snapshot
+                self._written.update(encoded)
+                self._write_snapshot(dict(self._written))
+                self._reset_journal()
+                return changed
+
+            record = "{" + ",".join(f'"{name}":{encoded[name]}' for name in changed) + "}\n"
+            with open(self.journal_path, 'a') as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            for name in changed:
+                self._written[name] = encoded[name]
+            self._journal_records += 1
+
+            if self._journal_records >= self.compact_after:
+                self._start_compaction()
+        return changed
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Reads the snapshot and replays the journal on top of it.
+        Raises FileNotFoundError if there is no snapshot yet.
+        """
+        self.wait_for_compaction()
+        with self._lock:
+            with open(self.filepath, 'rb') as f:
+                data = decode_snapshot(f.read())
+            # Records of an interrupted compaction come before the current journal
+            records = _read_journal(self.journal_path + ".old", data)[0]
+            records += _read_journal(self.journal_path, data)[0]
+
+            self._written = {name: dumps_compact(data[name]) for name in SECTIONS if name in data}
+            self._journal_records = records
+            has_journal = os.path.exists(self.journal_path) or os.path.exists(self.journal_path + ".old")
+        if has_journal:
+            # Fold replayed records (and any torn tail) into a fresh snapshot
+            self.compact()
+        return data
+
+    def open_lazy(self) -> "LazySave":
+        """
+        Opens the save for section-by-section loading.
+        The journal is read and replayed in full up front; snapshot
+        sections are decoded when they are asked for (a plain JSON
+        snapshot is decoded here, at once). Raises FileNotFoundError if there is no snapshot yet.
+        """
+        self.wait_for_compaction()
+        with self._lock:
+            f = open(self.filepath, 'rb')
+            try:
+                reader = SnapshotReader(f)
+            except Exception:
+                f.close()
+                raise
+            journaled: Dict[str, Any] = {}
+            records = _read_journal(self.journal_path + ".old", journaled)[0]
+            new_records, valid_length = _read_journal(self.journal_path, journaled)
+            if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > valid_length:
+                # Drop a torn tail so later appends are not hidden behind it
+                os.truncate(self.journal_path, valid_length)
+            self._written = {}
+            self._journal_records = records + new_records
+        return LazySave(self, f, reader, journaled)
+
+    def _remember(self, name: str, value: Any):
+        """
+        Records the on-disk version of a section decoded by a LazySave,
+        so an unchanged section is not rewritten on the next save.
+        """
+        text = dumps_compact(value)
+        with self._lock:
+            self._written.setdefault(name, text)
+
+    def compact(self, background: bool = False):
+        """
+        Folds the journal into a new snapshot.
+        """
+        with self._lock:
+            self._start_compaction()
+        if not background:
+            self.wait_for_compaction()
+
+    def wait_for_compaction(self):
+        """
+        Blocks until a running background compaction has finished.
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _start_compaction(self):
+        # Called with self._lock held.
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        # Freeze the current journal; new saves go to a fresh one.
+        old_path = self.journal_path + ".old"
+        if os.path.exists(self.journal_path):
+            if os.path.exists(old_path):
+                # A previous compaction did not finish: keep its records too
+                with open(self.journal_path, 'r') as src, open(old_path, 'a') as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, old_path)
+        self._journal_records = 0
+        sections = dict(self._written)
+
+        self._compactor = threading.Thread(
+            target=self._compact_worker, args=(sections,), name="save-compactor", daemon=True
+        )
+        self._compactor.start()
+
+    def _compact_worker(self, sections: Dict[str, str]):
+        try:
+            self._write_snapshot(sections)
+            if os.path.exists(self.journal_path + ".old"):
+                os.remove(self.journal_path + ".old")
+        except OSError as e:
+            # The old journal stays in place and is replayed on the next load
+            log.error("Error compacting save file %s: %s", self.filepath, e)
+
+    def _write_snapshot(self, sections: Dict[str, str]):
+        data = {name: loads_json(text) for name, text in sections.items()}
+        _write_atomic(self.filepath, encode_snapshot(data, self.serializer, self.plain))
+
+    def _reset_journal(self):
+        for path in (self.journal_path, self.journal_path + ".old"):
+            if os.path.exists(path):
+                os.remove(path)
+        self._journal_records = 0
+
+class LazySave:
+    """
+    An opened save whose sections are decoded on demand.
+    Sections found in the journal take precedence over the snapshot.
+    Not thread-safe: callers serialize access (see GameState).
+    """
+
+    def __init__(self, engine: SaveEngine, f: Any, reader: SnapshotReader, journaled: Dict[str, Any]):
+        self._engine = engine
+        self._file = f
+        self._reader = reader
+        self._journaled = journaled
+
+    def section(self, name: str) -> Any:
+        """
+        Returns the inventory or base_status section.
+        """
+        if name in self._journaled:
+            return self._journaled[name]
+        value = self._reader.read(name)
+        self._engine._remember(name, value)
+        return value
+
+    def heroes(self, active: bool) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Returns the active (or reserve) heroes and their positions in the roster.
+        """
+        if "heroes" in self._journaled:
+            roster = self._journaled["heroes"]
+            positions = [i for i, h in enumerate(roster) if h.get("is_active", True) == active]
+            return positions, [roster[i] for i in positions]
+        return self._reader.heroes(active)
+
+    def close(self):
+        self._file.close()
+
+_engines: Dict[str, SaveEngine] = {}
+_engines_lock = threading.Lock()
+
+def get_save_engine(filepath: str) -> SaveEngine:
+    """
+    Returns the shared SaveEngine for a save file path.
+    """
+    key = os.path.abspath(filepath)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = SaveEngine(filepath)
+        return engine
@@ -0,0 +1,283 @@
+"""
+serializers.py
+
+Pluggable encodings for save file snapshots.
+
+'.json' save files are written in the original save format: one
+plain, indented JSON document without a header, by the stdlib 'json'
+backend (see get_serializer_for_path). Such files can only be decoded
+whole. Save files with any other extension (the game's own
+'savegame.sav') use the first installed backend of PREFERENCE:
+  - 'msgpack': compact binary format
+  - 'orjson':  fast JSON encoder/decoder
+  - 'json':    the stdlib, always available
+
+Their snapshots start with a one-line header naming the backend, so any
+save can be loaded regardless of which backend is currently preferred.
+Files without a header are plain JSON.
+
+Sectioned snapshot layout (written by encode_snapshot):
+    b"TUISAVE <backend> sections\\n"
+    <JSON index line: section name -> [offset, length], plus the
+     roster positions of the active heroes>\\n
+    <section payloads, each encoded separately by the backend>
+
+Because every section is encoded on its own, a reader can decode
+base_status and the active heroes without touching the rest of the
+file (see SnapshotReader). Plain JSON snapshots and older unsectioned
+files are decoded whole.
+"""
+
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Any, BinaryIO, Callable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+HEADER_MAGIC = b"TUISAVE "
+
+class Serializer(ABC):
+    """
+    Encodes a save snapshot (a dict of sections) to bytes and back.
+    """
+    name = ""
+
+    @abstractmethod
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        ...
+
+class JsonSerializer(Serializer):
+    """
+    Plain stdlib JSON with indent=4.
+    """
+    name = "json"
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return orjson.loads(payload)
+
+class MsgpackSerializer(Serializer):
+    name = "msgpack"
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+# Backend name -> (serializer class, is the required package installed?)
+_BACKENDS = {
+    "json": (JsonSerializer, True),
+    "orjson": (OrjsonSerializer, orjson is not None),
+    "msgpack": (MsgpackSerializer, msgpack is not None),
+}
+
+# Preferred backends for new saves, best first
+PREFERENCE = ("msgpack", "orjson", "json")
+
+def available_backends() -> List[str]:
+    """
+    Returns the names of all backends usable in this environment.
+    """
+    return [name for name, (_, installed) in _BACKENDS.items() if installed]
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """
+    Returns the serializer for a backend name, or the preferred
+    installed backend if name is None.
+    Raises ValueError for unknown or not installed backends.
+    """
+    if name is None:
+        name = next(n for n in PREFERENCE if _BACKENDS[n][1])
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown save backend '{name}'.")
+    serializer_cls, installed = _BACKENDS[name]
+    if not installed:
+        raise ValueError(f"Save backend '{name}' is not installed.")
+    return serializer_cls()
+
+# Save files with this extension hold plain JSON documents
+PLAIN_JSON_EXTENSION = ".json"
+
+def is_plain_json_path(filepath: str) -> bool:
+    """
+    True for save files that are written as plain JSON documents.
+    """
+    return os.path.splitext(filepath)[1].lower() == PLAIN_JSON_EXTENSION
+
+def get_serializer_for_path(filepath: str) -> Serializer:
+    """
+    Returns the backend for new snapshots of a save file: json for
+    '.json' files, otherwise the preferred installed backend.
+    """
+    if is_plain_json_path(filepath):
+        return get_serializer("json")
+    return get_serializer()
+
+SECTIONED_FLAG = b"sections"
+
+# Order of the sections in the file: what a screen needs first comes first
+SNAPSHOT_SECTIONS = ("base_status", "active_heroes", "reserve_heroes", "inventory", "meta")
+
+def encode_snapshot(data: Dict[str, Any], serializer: Serializer, plain: bool = False) -> bytes:
+    """
+    Encodes a snapshot (heroes, inventory, base_status, meta) in the
+    sectioned layout, with the roster split into active and reserve heroes.
+    plain: write one plain JSON document instead (json backend only,
+    for '.json' save files).
+    """
+    if plain:
+        if serializer.name != "json":
+            raise ValueError(f"Plain snapshots need the json backend, not '{serializer.name}'.")
+        return serializer.dumps(data)
+    heroes = data.get("heroes", [])
+    active_positions = [i for i, h in enumerate(heroes) if h.get("is_active", True)]
+    reserve_positions = [i for i, h in enumerate(heroes) if not h.get("is_active", True)]
+    sections = {
+        "base_status": data.get("base_status", {}),
+        "active_heroes": [heroes[i] for i in active_positions],
+        "reserve_heroes": [heroes[i] for i in reserve_positions],
+        "inventory": data.get("inventory", {}),
+        "meta": data.get("meta", {}),
+    }
+
+    # Reserve heroes fill the remaining positions, in order
+    index: Dict[str, Any] = {"active_positions": active_positions}
+    payloads = []
+    offset = 0
+    for name in SNAPSHOT_SECTIONS:
+        payload = serializer.dumps(sections[name])
+        index[name] = [offset, len(payload)]
+        offset += len(payload)
+        payloads.append(payload)
+
+    header = HEADER_MAGIC + serializer.name.encode("ascii") + b" " + SECTIONED_FLAG + b"\n"
+    return header + json.dumps(index).encode("utf-8") + b"\n" + b"".join(payloads)
+
+class SnapshotReader:
+    """
+    Reads the sections of a snapshot, decoding each one only when asked for.
+    Sectioned snapshots are read with seeks; older layouts are decoded at once.
+    Raises ValueError for a truncated sectioned snapshot.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._file = f
+        self._index: Optional[Dict[str, Any]] = None
+        self._data: Optional[Dict[str, Any]] = None # Fully decoded (older layouts)
+
+        first_line = f.readline()
+        if not first_line.startswith(HEADER_MAGIC):
+            self._data = get_serializer("json").loads(first_line + f.read())
+            return
+        fields = first_line[len(HEADER_MAGIC):].split()
+        self._serializer = get_serializer(fields[0].decode("ascii"))
+        if SECTIONED_FLAG not in fields[1:]:
+            self._data = self._serializer.loads(f.read())
+            return
+        self._index = json.loads(f.readline())
+        self._payload_start = f.tell()
+        # Catch a truncated file now rather than when a later section is read
+        end = max((offset + length for offset, length in
+                   (self._index[name] for name in SNAPSHOT_SECTIONS if name in self._index)), default=0)
+        if f.seek(0, io.SEEK_END) < self._payload_start + end:
+            raise ValueError("Snapshot is truncated")
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "SnapshotReader":
+        return cls(io.BytesIO(raw))
+
+    def read(self, name: str) -> Any:
+        """
+        Decodes one section ("base_status", "inventory", ...).
+        """
+        if self._data is not None:
+            return self._data.get(name, {})
+        if name not in self._index:
+            return {} # Section added after this file was written
+        offset, length = self._index[name]
+        self._file.seek(self._payload_start + offset)
+        return self._serializer.loads(self._file.read(length))
+
+    def heroes(self, active: bool) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Returns the active (or reserve) heroes and their positions in the roster.
+        """
+        if self._data is not None:
+            roster = self._data.get("heroes", [])
+            positions = [i for i, h in enumerate(roster) if h.get("is_active", True) == active]
+            return positions, [roster[i] for i in positions]
+        active_positions = self._index["active_positions"]
+        if active:
+            return active_positions, self.read("active_heroes")
+        reserve = self.read("reserve_heroes")
+        taken = set(active_positions)
+        positions = [i for i in range(len(active_positions) + len(reserve)) if i not in taken]
+        return positions, reserve
+
+    def read_all(self) -> Dict[str, Any]:
+        """
+        Decodes the whole snapshot into the save file format.
+        """
+        if self._data is not None:
+            return self._data
+        active_positions, active = self.heroes(active=True)
+        reserve_positions, reserve = self.heroes(active=False)
+        return {
+            "heroes": merge_roster(active_positions, active, reserve_positions, reserve),
+            "inventory": self.read("inventory"),
+            "base_status": self.read("base_status"),
+            "meta": self.read("meta"),
+        }
+
+def merge_roster(active_positions: List[int], active: List[Any],
+                 reserve_positions: List[int], reserve: List[Any]) -> List[Any]:
+    """
+    Puts split active and reserve heroes back into their roster order.
+    """
+    roster: List[Any] = [None] * (len(active) + len(reserve))
+    for position, hero in zip(active_positions, active):
+        roster[position] = hero
+    for position, hero in zip(reserve_positions, reserve):
+        roster[position] = hero
+    return roster
+
+def decode_snapshot(raw: bytes) -> Dict[str, Any]:
+    """
+    Decodes a snapshot written by any backend, picked from its header.
+    """
+    return SnapshotReader.from_bytes(raw).read_all()
+
+def _stdlib_dumps_compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+# Compact single-line JSON encoding used for journal records
+dumps_compact: Callable[[Any], str] = (
+    (lambda value: orjson.dumps(value).decode("utf-8")) if orjson is not None else _stdlib_dumps_compact
+)
+loads_json: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
@@ -6,12 +6,21 @@ This module is stateless and operates on the game_state object
 passed to it by the game_controller.
 """
 
-from typing import TYPE_CHECKING
+import bisect
+from typing import TYPE_CHECKING, Dict, Any
+
+from game_logic.item_catalog import get_item_catalog
+from game_logic.upgrade_planner import can_afford, get_upgrade_graph
+from utils.logger import get_logger
 
 if TYPE_CHECKING:
     from core.game_state import GameState
 
+log = get_logger(__name__)
+
 # Define costs or rules for upgrades
+# "requires" (optional) lists building levels that must be built first.
+# See upgrade_planner.py for planning over this table.
 UPGRADE_COSTS = {
     "barracks": {
         1: {"resource": "gold", "amount": 100},
@@ -19,29 +28,45 @@ UPGRADE_COSTS = {
     },
     "forge": {
         1: {"resource": "gold", "amount": 150},
+        2: {"resource": "gold", "amount": 400, "requires": {"barracks": 2}},
     }
 }
 
+# Effects of each building level. A building at level L has the
+# effects of all its levels 1..L (e.g., barracks 2: +25 hp, +1 defense).
+BUILDING_EFFECTS = {
+    "barracks": {
+        1: {"hero_stats": {"hp": 10}},
+        2: {"hero_stats": {"hp": 15, "defense": 1}},
+    },
+    "forge": {
+        1: {"hero_stats": {"attack": 2}},
+        2: {"hero_stats": {"attack": 3}},
+    }
+}
+
+# Check the incrementally maintained effects against a full recompute
+# on every read of get_base_effects (slow; for debugging)
+VERIFY_BASE_EFFECTS = False
+
 def can_upgrade_building(game_state: "GameState", building: str) -> bool:
     """
     Checks if a building can be upgraded (e.g., checks resources, prerequisites).
     """
-    print(f"Stub: Checking if '{building}' can be upgraded...")
-    # --- Future Logic ---
-    # current_level = game_state.base_status.get(building, 0)
-    # next_level = current_level + 1
-    # 
-    # if building not in UPGRADE_COSTS or next_level not in UPGRADE_COSTS[building]:
-    #     print("Stub: Building is max level or does not exist.")
-    #     return False
-    #
-    # cost = UPGRADE_COSTS[building][next_level]
-    # # Check if player has resources in game_state.inventory
-    # if game_state.inventory.get(cost["resource"], 0) >= cost["amount"]:
-    #     return True
-    #
-    # print("Stub: Not enough resources.")
-    return True # Stubbed to always allow
+    log.debug("Checking if '%s' can be upgraded...", building)
+    graph = get_upgrade_graph()
+    node = graph.next_level(building, game_state.base_status)
+    if node is None:
+        log.debug("Building is max level or does not exist.")
+        return False
+    if not graph.is_unlocked(node, game_state.base_status):
+        log.debug("Required buildings are missing.")
+        return False
+    # Check if player has resources in game_state.inventory
+    if not can_afford(graph.costs[node], game_state.inventory):
+        log.debug("Not enough resources.")
+        return False
+    return True
 
 def apply_upgrade(game_state: "GameState", building: str) -> bool:
     """
@@ -49,28 +74,83 @@ def apply_upgrade(game_state: "GameState", building: str) -> bool:
     Modifies game_state directly.
     """
     if not can_upgrade_building(game_state, building):
-        print(f"Stub: Upgrade check failed for '{building}'.")
+        log.debug("Upgrade check failed for '%s'.", building)
         return False
         
-    print(f"Stub: Applying upgrade for '{building}'...")
-    # --- Future Logic ---
+    log.debug("Applying upgrade for '%s'...", building)
+    graph = get_upgrade_graph()
+    node = graph.next_level(building, game_state.base_status)
+
     # 1. Deduct resources from game_state.inventory
-    # 2. Increment level in game_state.base_status
-    # 3. Apply effects (e.g., unlock items)
+    inventory = game_state.mutable_inventory()
+    for resource, amount in graph.costs[node].items():
+        inventory[resource] -= amount
     
-    # game_state.base_status[building] = game_state.base_status.get(building, 0) + 1
+    # 2. Increment level in game_state.base_status
+    # (mutable_base_status drops the cached effects; they are re-seeded below)
+    effects = game_state.base_effects
+    base_status = game_state.mutable_base_status()
+    base_status[building] = node[1]
+
+    # 3. Apply effects (e.g., unlock items, hero stat bonuses)
+    # Only the new level's delta is added. Cached hero stats notice the
+    # changed bonus by themselves (see hero_manager.calculate_hero_stats).
+    if effects is not None:
+        effects = dict(effects)
+        _add_level_effects(effects, building, node[1])
+        game_state.base_effects = effects
     
     return True
 
-def get_base_effects(game_state: "GameState") -> dict:
+def _add_level_effects(effects: Dict[str, Any], building: str, level: int):
     """
-    Calculates the total effects provided by the base upgrades.
-    (e.g., +5% hero HP, unlocks 'Steel Sword')
+    Adds the effects of one building level to effects. Changed entries
+    are replaced by new objects, so holders of the old ones are unaffected.
     """
-    effects = {}
-    # --- Future Logic ---
-    # if game_state.base_status.get("forge", 0) >= 1:
-    #     effects["unlocked_items"] = ["steel_sword"]
-    
-    print("Stub: Calculating base effects...")
+    hero_stats_delta = BUILDING_EFFECTS.get(building, {}).get(level, {}).get("hero_stats", {})
+    if hero_stats_delta:
+        hero_stats = dict(effects["hero_stats"])
+        for stat, value in hero_stats_delta.items():
+            hero_stats[stat] = hero_stats.get(stat, 0) + value
+        effects["hero_stats"] = hero_stats
+
+    new_items = get_item_catalog().unlocked_at(building, level)
+    if new_items:
+        unlocked_items = list(effects["unlocked_items"])
+        for item_id in new_items:
+            bisect.insort(unlocked_items, item_id)
+        effects["unlocked_items"] = unlocked_items
+
+def compute_base_effects(base_status: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Calculates the total effects of a base from scratch by walking every building.
+    """
+    log.debug("Calculating base effects...")
+    hero_stats: Dict[str, int] = {}
+    for building, level in base_status.items():
+        for building_level, effects in BUILDING_EFFECTS.get(building, {}).items():
+            if building_level <= level:
+                for stat, value in effects.get("hero_stats", {}).items():
+                    hero_stats[stat] = hero_stats.get(stat, 0) + value
+    return {
+        "hero_stats": hero_stats,
+        # Item unlocks are declared in data/items.json ("unlock" field)
+        "unlocked_items": sorted(get_item_catalog().unlocked_items(base_status)),
+    }
+
+def get_base_effects(game_state: "GameState", verify: bool = False) -> Dict[str, Any]:
+    """
+    Returns the total effects provided by the base upgrades in O(1):
+        {"hero_stats": {"hp": 10, ...}, "unlocked_items": ["steel_sword", ...]}
+    The result is shared; treat it as read-only.
+    With verify=True (or VERIFY_BASE_EFFECTS) the incrementally kept
+    effects are checked against a full recompute; a mismatch raises RuntimeError.
+    """
+    effects = game_state.base_effects
+    if effects is None:
+        effects = game_state.base_effects = compute_base_effects(game_state.base_status)
+    elif verify or VERIFY_BASE_EFFECTS:
+        expected = compute_base_effects(game_state.base_status)
+        if effects != expected:
+            raise RuntimeError(f"Base effects {effects} differ from a full recompute {expected}.")
     return effects
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+battle_simulator.py
+
+A headless batch battle engine used for encounter balancing
+(see encounter_evaluator.py and simulate.py).
+Runs many independent fights at once with hero and enemy stats held
+in NumPy arrays (one row per fight) instead of per-fight dictionaries.
+
+The fights follow battle_system's rules for an attacking party
+(process_battle_turn with {"type": "attack"}): every living hero strikes
+a random living enemy, then every surviving enemy strikes a random
+living hero, each strike dealing battle_system.compute_damage. The
+combatants are battle_system's own battle records (make_hero_combatant,
+make_enemy_combatants) with its DEFAULT_STATS. Only the random numbers
+are drawn differently, so results match the game's battles in
+distribution, not fight by fight.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for bulk simulation
+    np = None
+
+from game_logic import base_manager, battle_system
+
+if TYPE_CHECKING:
+    from core.game_state import GameState
+
+STAT_KEYS = ("hp", "attack", "defense")
+
+def require_numpy():
+    """
+    Raises ImportError if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("battle_simulator requires NumPy (pip install numpy)")
+
+def make_rng(*keys: int) -> "np.random.Generator":
+    """
+    Returns a NumPy random generator seeded by one or more integers
+    (e.g., a run seed and the index of a batch of fights).
+    """
+    require_numpy()
+    return np.random.default_rng([key % 2**64 for key in keys])
+
+def _stat_matrix(combatants: List[Dict[str, Any]]) -> "np.ndarray":
+    """
+    Packs battle records into a (3, n) int array (hp, attack, defense).
+    """
+    return np.array(
+        [[c.get(stat, battle_system.DEFAULT_STATS[stat]) for c in combatants] for stat in STAT_KEYS],
+        dtype=np.int64
+    ).reshape(len(STAT_KEYS), len(combatants))
+
+def _attack_phase(rng: "np.random.Generator", running: "np.ndarray",
+                  attacker_hp: "np.ndarray", attacker_attack: "np.ndarray",
+                  defender_hp: "np.ndarray", defender_defense: "np.ndarray") -> "np.ndarray":
+    """
+    Lets every living attacker (column) strike a random living defender in
+    each running fight. Attackers act in order, so a defender killed by one
+    attacker is not targeted again. Modifies defender_hp in place and
+    returns the hp the defenders lost per fight.
+    """
+    n_fights, n_defenders = defender_hp.shape
+    rows = np.arange(n_fights)
+    hp_lost = np.zeros(n_fights, dtype=np.int64)
+
+    for a in range(attacker_hp.shape[1]):
+        defender_alive = defender_hp > 0
+        acting = running & (attacker_hp[:, a] > 0) & defender_alive.any(axis=1)
+        if not acting.any():
+            continue
+        # Random living target: highest random key among the living defenders
+        keys = np.where(defender_alive, rng.random((n_fights, n_defenders)), -1.0)
+        target = keys.argmax(axis=1)
+        damage = battle_system.compute_damage(attacker_attack[a], defender_defense[target])
+        before = defender_hp[rows, target]
+        after = np.where(acting, np.maximum(before - damage, 0), before)
+        defender_hp[rows, target] = after
+        hp_lost += before - after
+
+    return hp_lost
+
+def run_fights(heroes: List[Dict[str, Any]], enemies: List[Dict[str, Any]], n_fights: int,
+               rng: "np.random.Generator", max_turns: int = 100) -> Dict[str, "np.ndarray"]:
+    """
+    Plays n_fights fights of heroes against enemies (battle records) at once.
+    Returns one array entry per fight:
+        "won", "lost" - the battle ended in victory / defeat (neither:
+            still running after max_turns)
+        "turns" - turns played
+        "heroes_lost" - dead heroes at the end
+        "damage_dealt", "damage_taken" - hp lost by the enemies / heroes
+    """
+    require_numpy()
+    if not heroes or not enemies:
+        raise ValueError("Both the party and the enemy group need at least one combatant.")
+
+    hero_stats = _stat_matrix(heroes)
+    enemy_stats = _stat_matrix(enemies)
+    hero_hp = np.tile(hero_stats[0], (n_fights, 1))
+    enemy_hp = np.tile(enemy_stats[0], (n_fights, 1))
+
+    running = np.ones(n_fights, dtype=bool)
+    turns = np.zeros(n_fights, dtype=np.int64)
+    damage_dealt = np.zeros(n_fights, dtype=np.int64)
+    damage_taken = np.zeros(n_fights, dtype=np.int64)
+
+    for turn in range(1, max_turns + 1):
+        if not running.any():
+            break
+        # 1. Heroes attack, 2. surviving enemies strike back
+        damage_dealt += _attack_phase(rng, running, hero_hp, hero_stats[1], enemy_hp, enemy_stats[2])
+        damage_taken += _attack_phase(rng, running, enemy_hp, enemy_stats[1], hero_hp, hero_stats[2])
+
+        # 3. Check for battle end
+        turns[running] = turn
+        running &= (hero_hp > 0).any(axis=1) & (enemy_hp > 0).any(axis=1)
+
+    won = (enemy_hp <= 0).all(axis=1)
+    return {
+        "won": won,
+        "lost": (hero_hp <= 0).all(axis=1) & ~won,
+        "turns": turns,
+        "heroes_lost": (hero_hp <= 0).sum(axis=1),
+        "damage_dealt": damage_dealt,
+        "damage_taken": damage_taken,
+    }
+
+def simulate_encounter(party: List[Dict[str, Any]], enemies: List[Dict[str, Any]],
+                       n_fights: int = 100_000, seed: int = 0,
+                       max_turns: int = 100, damage_bins: int = 20) -> Dict[str, Any]:
+    """
+    Simulates n_fights independent, seeded fights between a party and a
+    group of enemies (battle records, see battle_system.make_hero_combatant
+    and make_enemy_combatants) in one process.
+
+    Returns aggregated results: win rate, turn counts and damage histograms.
+    Fights still running after max_turns count as draws.
+    """
+    fights = run_fights(party, enemies, n_fights, make_rng(seed), max_turns)
+    won, lost, turns = fights["won"], fights["lost"], fights["turns"]
+
+    taken_counts, taken_edges = np.histogram(fights["damage_taken"], bins=damage_bins)
+    dealt_counts, dealt_edges = np.histogram(fights["damage_dealt"], bins=damage_bins)
+
+    return {
+        "fights": n_fights,
+        "seed": seed,
+        "wins": int(won.sum()),
+        "losses": int(lost.sum()),
+        "draws": int(n_fights - won.sum() - lost.sum()),
+        "win_rate": float(won.mean()),
+        "mean_turns_to_win": float(turns[won].mean()) if won.any() else None,
+        # Index i holds the number of won fights that took i turns
+        "turns_to_win_histogram": np.bincount(turns[won], minlength=max_turns + 1).tolist(),
+        "heroes_lost_histogram": np.bincount(fights["heroes_lost"], minlength=len(party) + 1).tolist(),
+        "damage_taken_histogram": {"counts": taken_counts.tolist(), "bin_edges": taken_edges.tolist()},
+        "damage_dealt_histogram": {"counts": dealt_counts.tolist(), "bin_edges": dealt_edges.tolist()},
+    }
+
+def simulate_game_state_encounter(game_state: "GameState", encounter_id: str,
+                                  n_fights: int = 100_000, seed: int = 0,
+                                  **kwargs: Any) -> Dict[str, Any]:
+    """
+    Simulates an encounter from data/enemies.json against the active heroes
+    of a game state, set up exactly like battle_system.start_battle
+    (base bonuses included).
+    Raises KeyError if the encounter does not exist.
+    """
+    base_effects = base_manager.get_base_effects(game_state)
+    party = [battle_system.make_hero_combatant(h, base_effects) for h in game_state.active_heroes]
+    enemies = battle_system.make_enemy_combatants(battle_system.load_encounter(encounter_id))
+    result = simulate_encounter(party, enemies, n_fights=n_fights, seed=seed, **kwargs)
+    result["encounter_id"] = encounter_id
+    return result
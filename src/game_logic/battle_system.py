@@ -6,27 +6,84 @@ This module is stateless and calculates the outcome of battle
 actions based on the current game_state.
 """
 
-from typing import TYPE_CHECKING, Dict, Any
+import random
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from game_logic import base_manager, hero_manager
+from game_logic.content import get_content
+from utils.logger import get_logger
 
 if TYPE_CHECKING:
     from core.game_state import GameState
+    from core.hero import Hero
+
+log = get_logger(__name__)
+
+# Stats of a combatant whose record lacks them (see calculate_attack_outcome)
+DEFAULT_STATS = {"hp": 50, "attack": 5, "defense": 1}
+
+def load_encounter(encounter_id: str) -> Dict[str, Any]:
+    """
+    Returns the definition of an encounter from data/enemies.json
+    (a shared template, see content.py).
+    Raises KeyError if the encounter does not exist.
+    """
+    return get_content().encounters[encounter_id]
+
+def list_encounters() -> List[str]:
+    """
+    Returns the ids of all encounters in data/enemies.json.
+    """
+    return list(get_content().encounters)
+
+def compute_damage(attack: Any, defense: Any) -> Any:
+    """
+    The core damage rule: attack minus defense, never below zero.
+    Works on ints, and elementwise on NumPy arrays (see battle_simulator.py).
+    """
+    damage = attack - defense
+    return damage * (damage > 0)
+
+def make_hero_combatant(hero: "Hero", base_effects: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Creates the battle record of a hero from its derived stats
+    (including the base bonuses in base_effects, see base_manager.get_base_effects).
+    Battles work on these copies, never on the heroes themselves.
+    """
+    stats = hero_manager.calculate_hero_stats(hero, base_effects)
+    combatant = {"id": hero.id, "name": hero.name, "max_hp": stats.get("hp", 0)}
+    combatant.update(stats)
+    return combatant
+
+def make_enemy_combatants(encounter: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Creates the battle records of an encounter's enemies (copies of the templates).
+    """
+    return [dict(e, max_hp=e.get("hp", 0)) for e in encounter["enemies"]]
 
 def start_battle(game_state: "GameState", enemy_encounter_id: str) -> Dict[str, Any]:
     """
     Initializes a battle state (but doesn't store it here).
     Returns the initial state of the battle participants.
+    The heroes are copied into battle records, so a battle (or a preview
+    on a game_state.snapshot()) never changes the heroes in game_state.
+    Raises KeyError if the encounter does not exist.
     """
-    print(f"Stub: Initializing battle with encounter '{enemy_encounter_id}'.")
+    log.debug("Initializing battle with encounter '%s'.", enemy_encounter_id)
     
-    # --- Future Logic ---
     # 1. Load enemy data from data/enemies.json
+    encounter = load_encounter(enemy_encounter_id)
     # 2. Get hero data from game_state.heroes
+    base_effects = base_manager.get_base_effects(game_state)
     # 3. Create a temporary 'battle_state' dictionary
-    
     battle_state = {
-        "heroes": [h for h in game_state.heroes if h.get("is_active", True)],
-        "enemies": [{"id": "enemy_1", "hp": 50}, {"id": "enemy_2", "hp": 50}],
-        "turn": 0
+        "encounter_id": enemy_encounter_id,
+        "heroes": [make_hero_combatant(h, base_effects) for h in game_state.active_heroes],
+        "enemies": make_enemy_combatants(encounter),
+        "rewards": dict(encounter.get("rewards", {})),
+        "turn": 0,
+        "result": None, # "victory", "defeat" or "fled" once the battle is over
+        "events": [] # Attack results of the last turn
     }
     return battle_state
 
@@ -34,50 +91,97 @@ def calculate_attack_outcome(attacker: Dict[str, Any], defender: Dict[str, Any])
     """
     Calculates the result of one entity attacking another.
     """
-    print(f"Stub: Calculating attack: {attacker.get('id')} vs {defender.get('id')}")
-    
-    # --- Future Logic ---
-    # damage = attacker.get("attack", 5) - defender.get("defense", 1)
-    # if damage < 0:
-    #     damage = 0
-    # defender_hp = defender.get("hp", 100) - damage
+    log.debug("Calculating attack: %s vs %s", attacker.get('id'), defender.get('id'))
     
+    damage = compute_damage(attacker.get("attack", DEFAULT_STATS["attack"]),
+                            defender.get("defense", DEFAULT_STATS["defense"]))
+
     result = {
         "attacker_id": attacker.get("id"),
         "defender_id": defender.get("id"),
-        "damage_dealt": 5, # Stub
-        "defender_hp_remaining": defender.get("hp", 50) - 5
+        "damage_dealt": damage,
+        "defender_hp_remaining": max(defender.get("hp", DEFAULT_STATS["hp"]) - damage, 0)
     }
     return result
 
-def process_battle_turn(game_state: "GameState", battle_state: Dict[str, Any], player_action: Dict[str, Any]) -> Dict[str, Any]:
+def _living(combatants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [c for c in combatants if c["hp"] > 0]
+
+def _strike(attacker: Dict[str, Any], defender: Dict[str, Any], events: List[Dict[str, Any]]):
+    attack_result = calculate_attack_outcome(attacker, defender)
+    defender["hp"] = attack_result["defender_hp_remaining"]
+    events.append(attack_result)
+
+def process_battle_turn(game_state: "GameState", battle_state: Dict[str, Any], player_action: Dict[str, Any],
+                        rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Processes one full turn of battle (player action + enemy actions)
     and modifies the battle_state.
+
+    player_action:
+        {"type": "attack", "target_index": 0} - every living hero attacks; the
+            target enemy if it is alive, otherwise (or without target_index)
+            a random living enemy.
+        {"type": "flee"} - ends the battle.
+    Random choices use rng (pass a seeded random.Random for reproducible battles).
     
     Note: This modifies the passed 'battle_state' dictionary, not the
     persistent 'game_state' (until the battle is over).
     """
-    print(f"Stub: Processing turn {battle_state.get('turn')}.")
-    
+    log.debug("Processing turn %s.", battle_state.get('turn'))
+    rng = rng or random.Random()
+    events: List[Dict[str, Any]] = []
+    battle_state["events"] = events
+    if battle_state.get("result"):
+        return battle_state # Battle is already over
+
+    heroes = battle_state["heroes"]
+    enemies = battle_state["enemies"]
+
     # 1. Process Player Action
+    if player_action.get("type") == "flee":
+        battle_state["result"] = "fled"
+        return battle_state
+
     if player_action.get("type") == "attack":
-        # player_hero = battle_state["heroes"][player_action.get("actor_index", 0)]
-        # target_enemy = battle_state["enemies"][player_action.get("target_index", 0)]
-        # attack_result = calculate_attack_outcome(player_hero, target_enemy)
-        # target_enemy["hp"] = attack_result["defender_hp_remaining"]
-        print("Stub: Player attacks.")
+        target_index = player_action.get("target_index")
+        for hero in _living(heroes):
+            living_enemies = _living(enemies)
+            if not living_enemies:
+                break
+            target = enemies[target_index] if target_index is not None and target_index < len(enemies) else None
+            if target is None or target["hp"] <= 0:
+                target = rng.choice(living_enemies)
+            _strike(hero, target, events)
 
     # 2. Process Enemy Actions
-    # for enemy in battle_state["enemies"]:
-    #     if enemy["hp"] > 0:
-    #         # target_hero = ... (e.g., random hero)
-    #         # enemy_attack_result = calculate_attack_outcome(enemy, target_hero)
-    #         # target_hero["hp"] = enemy_attack_result["defender_hp_remaining"]
-    #         print(f"Stub: {enemy['id']} attacks.")
+    for enemy in _living(enemies):
+        living_heroes = _living(heroes)
+        if not living_heroes:
+            break
+        _strike(enemy, rng.choice(living_heroes), events)
 
     # 3. Check for battle end
-    # ...
+    if not _living(enemies):
+        battle_state["result"] = "victory"
+    elif not _living(heroes):
+        battle_state["result"] = "defeat"
     
     battle_state["turn"] += 1
-    return battle_state
\ No newline at end of file
+    return battle_state
+
+def apply_battle_rewards(game_state: "GameState", battle_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Grants the rewards of a won battle: XP to every hero that fought,
+    gold to the inventory. Modifies game_state directly.
+    Returns the granted rewards ({} if the battle was not won).
+    """
+    if battle_state.get("result") != "victory":
+        return {}
+    rewards = battle_state.get("rewards", {})
+    if rewards.get("xp"):
+        hero_manager.add_experience_to_roster(game_state, rewards["xp"], [c["id"] for c in battle_state["heroes"]])
+    if rewards.get("gold"):
+        inventory = game_state.mutable_inventory()
+        inventory["gold"] = inventory.get("gold", 0) + rewards["gold"]
+    return rewards
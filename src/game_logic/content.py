@@ -0,0 +1,204 @@
+"""
+content.py
+
+Game content defined in data files: hero classes (data/heroes.json)
+and battle encounters (data/enemies.json).
+
+The JSON files are the source. They are validated once and compiled
+into a versioned binary bundle (data/content.cache, in marshal format)
+next to them; later startups load the bundle instead, without parsing
+or validating any JSON. The bundle is rebuilt whenever one of the
+source files changes (mtime and size) or BUNDLE_VERSION is bumped.
+Nothing is read before the content is first needed (get_content()).
+
+The templates are shared: callers copy what they modify
+(Hero.from_template, battle_system.start_battle).
+
+To validate the data files and rebuild the bundle (e.g. after editing them):
+    python -m game_logic.content
+"""
+
+import json
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+HEROES_PATH = os.path.join(DATA_DIR, "heroes.json")
+ENEMIES_PATH = os.path.join(DATA_DIR, "enemies.json")
+BUNDLE_PATH = os.path.join(DATA_DIR, "content.cache")
+
+# Bump when the schema or the bundle layout changes so stale bundles are rebuilt
+BUNDLE_VERSION = 1
+
+# Bundle header: magic, BUNDLE_VERSION, marshal format version
+MAGIC = b"TGCB"
+HEADER = struct.Struct("<4sII")
+
+class ContentError(ValueError):
+    """
+    A data file does not match the content schema.
+    """
+
+# --- Validation ---
+
+def _check(condition: bool, where: str, message: str):
+    if not condition:
+        raise ContentError(f"{where}: {message}")
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def _check_counts(value: Any, where: str):
+    _check(isinstance(value, dict), where, "expected an object")
+    for key, count in value.items():
+        _check(_is_count(count), f"{where}.{key}", f"expected a non-negative integer, got {count!r}")
+
+def validate_heroes(heroes: Any, source: str = "heroes.json") -> Dict[str, Dict[str, Any]]:
+    """
+    Checks the hero class definitions of heroes.json, e.g.
+        {"warrior": {"name": "Warrior", "base_stats": {"hp": 120, "attack": 12, "defense": 8},
+                     "level_up_gains": {"hp": 12}}}    # 'level_up_gains' is optional
+    Returns them unchanged. Raises ContentError for the first problem found.
+    """
+    _check(isinstance(heroes, dict) and bool(heroes), source, "expected a non-empty object of hero classes")
+    for hero_class, template in heroes.items():
+        where = f"{source}: {hero_class}"
+        _check(isinstance(template, dict), where, "expected an object")
+        _check(isinstance(template.get("name"), str), where, "missing 'name'")
+        _check_counts(template.get("base_stats"), f"{where}.base_stats")
+        _check(template["base_stats"].get("hp", 0) > 0, f"{where}.base_stats", "'hp' must be positive")
+        if "level_up_gains" in template:
+            _check_counts(template["level_up_gains"], f"{where}.level_up_gains")
+    return heroes
+
+def validate_encounters(encounters: Any, source: str = "enemies.json") -> Dict[str, Dict[str, Any]]:
+    """
+    Checks the encounter definitions of enemies.json, e.g.
+        {"goblin_encounter": {"name": "Goblin Encounter",
+                              "enemies": [{"id": "goblin_1", "name": "Goblin", "hp": 30, "attack": 5, "defense": 2}],
+                              "rewards": {"xp": 50, "gold": 25}}}    # 'rewards' is optional
+    Returns them unchanged. Raises ContentError for the first problem found.
+    """
+    _check(isinstance(encounters, dict) and bool(encounters), source, "expected a non-empty object of encounters")
+    for encounter_id, encounter in encounters.items():
+        where = f"{source}: {encounter_id}"
+        _check(isinstance(encounter, dict), where, "expected an object")
+        _check(isinstance(encounter.get("name"), str), where, "missing 'name'")
+        enemies = encounter.get("enemies")
+        _check(isinstance(enemies, list) and bool(enemies), where, "expected a non-empty list of 'enemies'")
+        seen = set()
+        for index, enemy in enumerate(enemies):
+            enemy_where = f"{where}.enemies[{index}]"
+            _check(isinstance(enemy, dict), enemy_where, "expected an object")
+            for key in ("id", "name"):
+                _check(isinstance(enemy.get(key), str), enemy_where, f"missing '{key}'")
+            _check(enemy["id"] not in seen, enemy_where, f"duplicate id '{enemy['id']}'")
+            seen.add(enemy["id"])
+            for stat in ("hp", "attack", "defense"):
+                _check(_is_count(enemy.get(stat)), enemy_where, f"'{stat}' must be a non-negative integer")
+            _check(enemy["hp"] > 0, enemy_where, "'hp' must be positive")
+        if "rewards" in encounter:
+            _check_counts(encounter["rewards"], f"{where}.rewards")
+    return encounters
+
+# --- Loading ---
+
+class Content:
+    """
+    The validated hero class and encounter templates.
+    """
+
+    def __init__(self, heroes: Dict[str, Dict[str, Any]], encounters: Dict[str, Dict[str, Any]]):
+        self.heroes = heroes
+        self.encounters = encounters
+
+    @classmethod
+    def compile(cls, heroes_path: str = HEROES_PATH, enemies_path: str = ENEMIES_PATH) -> "Content":
+        """
+        Parses and validates the JSON source files.
+        Raises ContentError if they do not match the schema.
+        """
+        with open(heroes_path, 'r') as f:
+            heroes = validate_heroes(json.load(f), os.path.basename(heroes_path))
+        with open(enemies_path, 'r') as f:
+            encounters = validate_encounters(json.load(f), os.path.basename(enemies_path))
+        return cls(heroes, encounters)
+
+    @classmethod
+    def load(cls, heroes_path: str = HEROES_PATH, enemies_path: str = ENEMIES_PATH,
+             bundle_path: str = BUNDLE_PATH) -> "Content":
+        """
+        Loads the content from the bundle if it was compiled from the
+        current source files, otherwise compiles them and rewrites the bundle.
+        """
+        sources = _source_key(heroes_path, enemies_path)
+        try:
+            with open(bundle_path, 'rb') as f:
+                data = f.read()
+            if HEADER.unpack_from(data) == (MAGIC, BUNDLE_VERSION, marshal.version):
+                bundle = marshal.loads(memoryview(data)[HEADER.size:])
+                if bundle["sources"] == sources:
+                    return cls(bundle["heroes"], bundle["encounters"])
+        except (OSError, struct.error, ValueError, EOFError, TypeError, KeyError):
+            pass # Missing, stale or unreadable bundle: rebuild it below
+
+        content = cls.compile(heroes_path, enemies_path)
+        try:
+            content.write_bundle(bundle_path, sources)
+        except OSError as e:
+            # The bundle is an optimization only (e.g., read-only install)
+            log.warning("Could not write content bundle %s: %s", bundle_path, e)
+        return content
+
+    def write_bundle(self, bundle_path: str, sources: Tuple[Tuple[str, int, int], ...]):
+        payload = marshal.dumps({"sources": sources, "heroes": self.heroes, "encounters": self.encounters})
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(bundle_path) + ".", dir=os.path.dirname(bundle_path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, BUNDLE_VERSION, marshal.version))
+                f.write(payload)
+            os.replace(tmp_path, bundle_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def _source_key(*paths: str) -> Tuple[Tuple[str, int, int], ...]:
+    key = []
+    for path in paths:
+        stat = os.stat(path)
+        key.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+_content: Optional[Content] = None
+
+def get_content() -> Content:
+    """
+    Returns the shared game content, loading it on first use.
+    """
+    global _content
+    if _content is None:
+        _content = Content.load()
+    return _content
+
+def main():
+    """
+    Validates the data files and rebuilds the bundle.
+    """
+    try:
+        content = Content.compile()
+        content.write_bundle(BUNDLE_PATH, _source_key(HEROES_PATH, ENEMIES_PATH))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{len(content.heroes)} hero classes, {len(content.encounters)} encounters -> {BUNDLE_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+encounter_evaluator.py
+
+Monte Carlo evaluation of encounters for balancing, spread over all
+CPU cores with a process pool.
+
+The fights of an encounter are split into chunks of a fixed size, and
+every chunk is played as one batch by battle_simulator (with
+battle_system's rules, so evaluated win rates match the game). Each
+chunk has its own RNG seeded from the run seed and the chunk's first
+fight, so results depend only on the seed and the chunk size, never on
+the number of workers.
+
+Results are aggregated per encounter and reported after every finished
+chunk (see evaluate_encounters), so long runs show converging numbers
+while they are still going.
+"""
+
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from game_logic import battle_simulator, battle_system
+
+# Fights per chunk: large enough for NumPy to pay off, small enough that
+# a run over many cores is split into many chunks and reports early.
+CHUNK_SIZE = 2_000
+
+class EncounterStats:
+    """
+    Aggregated outcome of many fights against one encounter.
+    """
+
+    def __init__(self, encounter_id: str):
+        self.encounter_id = encounter_id
+        self.fights = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0 # No result within max_turns
+        self.turns: Counter = Counter() # turns -> fights
+        self.turns_to_win: Counter = Counter() # turns -> won fights
+        self.heroes_lost: Counter = Counter() # dead heroes -> fights
+        self.damage_dealt: Counter = Counter() # hp lost by the enemies -> fights
+        self.damage_taken: Counter = Counter() # hp lost by the heroes -> fights
+
+    def add_fights(self, fights: Dict[str, Any]):
+        """
+        Adds a batch of fights (the arrays of battle_simulator.run_fights).
+        """
+        won, lost, turns = fights["won"], fights["lost"], fights["turns"]
+        wins, losses = int(won.sum()), int(lost.sum())
+        self.fights += len(won)
+        self.wins += wins
+        self.losses += losses
+        self.draws += len(won) - wins - losses
+        self.turns.update(turns.tolist())
+        self.turns_to_win.update(turns[won].tolist())
+        self.heroes_lost.update(fights["heroes_lost"].tolist())
+        self.damage_dealt.update(fights["damage_dealt"].tolist())
+        self.damage_taken.update(fights["damage_taken"].tolist())
+
+    def merge(self, other: "EncounterStats"):
+        self.fights += other.fights
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.turns.update(other.turns)
+        self.turns_to_win.update(other.turns_to_win)
+        self.heroes_lost.update(other.heroes_lost)
+        self.damage_dealt.update(other.damage_dealt)
+        self.damage_taken.update(other.damage_taken)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    def win_rate_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """
+        Wilson score interval of the win rate (z=1.96: 95% confidence).
+        """
+        if not self.fights:
+            return 0.0, 1.0
+        n = self.fights
+        p = self.wins / n
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(center - margin, 0.0), min(center + margin, 1.0)
+
+    @property
+    def mean_turns_to_win(self) -> Optional[float]:
+        if not self.wins:
+            return None
+        return sum(turns * count for turns, count in self.turns_to_win.items()) / self.wins
+
+    def to_dict(self) -> Dict[str, Any]:
+        low, high = self.win_rate_interval()
+        return {
+            "encounter_id": self.encounter_id,
+            "fights": self.fights,
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "win_rate": self.win_rate,
+            "win_rate_ci95": [low, high],
+            "mean_turns_to_win": self.mean_turns_to_win,
+            "turns": dict(sorted(self.turns.items())),
+            "heroes_lost": dict(sorted(self.heroes_lost.items())),
+            "damage_dealt": dict(sorted(self.damage_dealt.items())),
+            "damage_taken": dict(sorted(self.damage_taken.items())),
+        }
+
+def simulate_fights(encounter_id: str, heroes: List[Dict[str, Any]], enemies: List[Dict[str, Any]],
+                    seed: int, first_fight: int, n_fights: int, max_turns: int = 100) -> EncounterStats:
+    """
+    Runs fights first_fight .. first_fight + n_fights - 1 of a run as one
+    battle_simulator batch and returns their aggregated stats.
+    heroes and enemies are battle records (see battle_system.make_hero_combatant
+    and make_enemy_combatants).
+    """
+    rng = battle_simulator.make_rng(seed, first_fight)
+    stats = EncounterStats(encounter_id)
+    stats.add_fights(battle_simulator.run_fights(heroes, enemies, n_fights, rng, max_turns))
+    return stats
+
+def evaluate_encounters(party: List[Dict[str, Any]], encounter_ids: List[str], n_fights: int = 10_000,
+                        seed: int = 0, workers: Optional[int] = None, max_turns: int = 100,
+                        chunk_size: int = CHUNK_SIZE) -> Iterator[EncounterStats]:
+    """
+    Simulates n_fights fights of party (battle records, see
+    battle_system.make_hero_combatant) against each encounter on a pool
+    of worker processes (default: one per CPU).
+
+    Yields the running totals of an encounter every time one of its
+    chunks completes; the last yield of each encounter covers all its fights.
+    Raises KeyError if an encounter does not exist, ImportError without NumPy.
+    """
+    battle_simulator.require_numpy()
+    workers = workers or os.cpu_count() or 1
+
+    totals = {encounter_id: EncounterStats(encounter_id) for encounter_id in encounter_ids}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for encounter_id in encounter_ids:
+            encounter = battle_system.load_encounter(encounter_id)
+            enemies = battle_system.make_enemy_combatants(encounter)
+            for first_fight in range(0, n_fights, chunk_size):
+                futures.append(pool.submit(
+                    simulate_fights, encounter_id, party, enemies, seed,
+                    first_fight, min(chunk_size, n_fights - first_fight), max_turns
+                ))
+        for future in as_completed(futures):
+            chunk = future.result()
+            total = totals[chunk.encounter_id]
+            total.merge(chunk)
+            yield total
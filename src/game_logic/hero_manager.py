@@ -4,12 +4,30 @@ hero_manager.py
 Contains the game logic for managing heroes, including stats,
 leveling, and status effects.
 This module is stateless and operates on the game_state object.
+
+Derived stats are memoized on each Hero (hero.cached_stats) and
+only recomputed after one of their inputs changed: experience and
+level-ups (here) or equipment (item_manager.apply_item). The cache
+also remembers the base bonus it was computed with, so a base upgrade
+that changes the bonus makes it stale without touching any hero.
+
+Leveling uses a precomputed table of the total XP needed to reach each
+level (CUMULATIVE_XP), so any XP grant, however large, resolves to its
+final level with one binary search.
 """
 
-from typing import TYPE_CHECKING, Dict, Any
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
+
+from game_logic import item_manager
+from game_logic.content import get_content
+from utils.logger import get_logger
 
 if TYPE_CHECKING:
     from core.game_state import GameState
+    from core.hero import Hero
+
+log = get_logger(__name__)
 
 # Experience points required for next level (example)
 XP_PER_LEVEL = {
@@ -18,73 +36,155 @@ XP_PER_LEVEL = {
     3: 700,
 }
 
-def calculate_hero_stats(hero: Dict[str, Any]) -> Dict[str, Any]:
+# Highest reachable level
+MAX_LEVEL = 100
+
+# Base stat increases per level gained, for hero classes that define
+# no 'level_up_gains' of their own in data/heroes.json
+LEVEL_UP_GAINS = {"hp": 10, "attack": 2, "defense": 1}
+
+def xp_for_next_level(level: int) -> int:
+    """
+    Experience points required to go from level to level + 1.
+    Levels missing from XP_PER_LEVEL follow the curve of the listed ones:
+    100 * (2^level - 1).
+    """
+    required = XP_PER_LEVEL.get(level)
+    if required is not None:
+        return required
+    return 100 * (2 ** level - 1)
+
+def _build_cumulative_xp(max_level: int) -> List[int]:
+    # table[level] = total XP needed to reach level from level 1 (table[0] is unused)
+    table = [0, 0]
+    for level in range(1, max_level):
+        table.append(table[-1] + xp_for_next_level(level))
+    return table
+
+CUMULATIVE_XP = _build_cumulative_xp(MAX_LEVEL)
+
+# Hit/miss counters of the derived-stat cache (see get_stats_cache_info)
+_stats_cache_info = {"hits": 0, "misses": 0}
+
+def calculate_hero_stats(hero: "Hero", base_effects: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculates the final derived stats of a hero based on
-    base stats, level, and equipped items.
+    base stats, level, equipped items and the hero stat bonuses
+    of the base (base_effects["hero_stats"]).
+    Pass base_manager.get_base_effects(game_state): it returns the same
+    objects until the base changes, which is what keeps the cache valid.
     
     This function *returns* the calculated stats, it does not
     modify the hero directly unless intended.
+    Results are cached on the hero until invalidate_hero_stats is called
+    or a different base bonus is passed.
     """
-    print(f"Stub: Calculating stats for {hero.get('name', 'Unknown Hero')}")
-    
-    # --- Future Logic ---
+    bonus = base_effects["hero_stats"]
+    if hero.cached_stats is not None and hero.cached_bonus is bonus:
+        _stats_cache_info["hits"] += 1
+        return dict(hero.cached_stats)
+
+    _stats_cache_info["misses"] += 1
+    log.debug("Calculating stats for %s", hero.name)
+
     # 1. Start with base stats
-    # final_stats = hero.get("base_stats", {}).copy()
-    #
+    final_stats = dict(hero.base_stats)
+
     # 2. Add stats from level
-    # level = hero.get("level", 1)
-    # final_stats["hp"] += level * 10
-    #
+    final_stats["hp"] = final_stats.get("hp", 0) + hero.level * 10
+
     # 3. Add stats from equipment
-    # (This logic might be in item_manager.py, or looped here)
-    # for item_id in hero.get("equipment", {}).values():
-    #     item_stats = item_manager.get_item_stats(item_id)
-    #     for stat, value in item_stats.items():
-    #         final_stats[stat] = final_stats.get(stat, 0) + value
-            
-    # For now, just return a stub
-    final_stats = {
-        "hp": 100,
-        "attack": 10,
-        "defense": 5
-    }
-    
-    return final_stats
+    for item_id in hero.equipment.values():
+        for stat, value in item_manager.get_item_stats(item_id).items():
+            final_stats[stat] = final_stats.get(stat, 0) + value
+
+    # 4. Add bonuses from base upgrades
+    if bonus:
+        for stat, value in bonus.items():
+            final_stats[stat] = final_stats.get(stat, 0) + value
 
+    hero.cached_stats = final_stats
+    hero.cached_bonus = bonus
+    return dict(final_stats)
 
-def add_experience(hero: Dict[str, Any], xp_amount: int) -> bool:
+def invalidate_hero_stats(hero: "Hero"):
     """
-    Adds experience to a hero and checks for level-up.
-    Modifies the hero dictionary directly.
-    Returns True if the hero leveled up, False otherwise.
+    Marks the cached derived stats of a hero as dirty.
+    Must be called whenever base stats, level or equipment change.
     """
-    print(f"Stub: Adding {xp_amount} XP to {hero.get('name')}")
-    
-    # --- Future Logic ---
-    # hero["current_xp"] = hero.get("current_xp", 0) + xp_amount
-    # current_level = hero.get("level", 1)
-    # 
-    # required_xp = XP_PER_LEVEL.get(current_level)
-    # 
-    # if required_xp and hero["current_xp"] >= required_xp:
-    #     # Level up!
-    #     hero["level"] += 1
-    #     hero["current_xp"] -= required_xp
-    #     apply_level_up_stats(hero)
-    #     print(f"Stub: {hero.get('name')} leveled up to {hero['level']}!")
-    #     return True
-        
-    return False
-
-def apply_level_up_stats(hero: Dict[str, Any]):
-    """
-    Applies the base stat increases for a hero leveling up.
-    Modifies the hero dictionary directly.
-    """
-    print(f"Stub: Applying level-up stats to {hero.get('name')}")
-    # --- Future Logic ---
-    # hero["base_stats"]["hp"] += 10
-    # hero["base_stats"]["attack"] += 2
-    # hero["base_stats"]["defense"] += 1
-    pass
\ No newline at end of file
+    hero.cached_stats = None
+
+def get_stats_cache_info() -> Dict[str, int]:
+    """
+    Returns the hit/miss counters of the derived-stat cache.
+    """
+    return dict(_stats_cache_info)
+
+def reset_stats_cache_info():
+    """
+    Resets the hit/miss counters of the derived-stat cache.
+    """
+    _stats_cache_info["hits"] = 0
+    _stats_cache_info["misses"] = 0
+
+
+def resolve_experience(level: int, current_xp: int, xp_amount: int) -> Tuple[int, int]:
+    """
+    Returns the (level, current_xp) a hero ends up with after gaining
+    xp_amount, across any number of level-ups. At MAX_LEVEL further
+    XP is kept in current_xp.
+    """
+    if level >= MAX_LEVEL:
+        return level, current_xp + xp_amount
+    level = max(level, 1)
+    total_xp = CUMULATIVE_XP[level] + current_xp + xp_amount
+    new_level = max(bisect_right(CUMULATIVE_XP, total_xp) - 1, level)
+    return new_level, total_xp - CUMULATIVE_XP[new_level]
+
+def add_experience(hero: "Hero", xp_amount: int) -> int:
+    """
+    Adds experience to a hero and applies every level-up it is enough for.
+    Modifies the hero directly (get it via game_state.mutable_hero).
+    Returns the number of levels gained (0 if the hero did not level up).
+    """
+    log.debug("Adding %d XP to %s", xp_amount, hero.name)
+
+    new_level, hero.current_xp = resolve_experience(hero.level, hero.current_xp, xp_amount)
+    levels_gained = new_level - hero.level
+    if levels_gained > 0:
+        # Level up!
+        hero.level = new_level
+        apply_level_up_stats(hero, levels_gained)
+        log.debug("%s leveled up to %d!", hero.name, hero.level)
+    return levels_gained
+
+def add_experience_to_roster(game_state: "GameState", xp_amount: int,
+                             hero_ids: Optional[Iterable[Any]] = None) -> Dict[Any, int]:
+    """
+    Grants xp_amount to the heroes with hero_ids (default: the active team).
+    Returns the levels gained per hero id.
+    """
+    if hero_ids is None:
+        hero_ids = [h.id for h in game_state.active_heroes]
+    return {hero.id: add_experience(hero, xp_amount) for hero in game_state.mutable_heroes_with_ids(hero_ids)}
+
+def level_up_gains(hero_class: str) -> Dict[str, int]:
+    """
+    Returns the base stat increases per level of a hero class: its
+    'level_up_gains' in data/heroes.json, or LEVEL_UP_GAINS if the class
+    defines none (or is not in the data files).
+    """
+    template = get_content().heroes.get(hero_class)
+    gains = template.get("level_up_gains") if template is not None else None
+    return LEVEL_UP_GAINS if gains is None else gains
+
+def apply_level_up_stats(hero: "Hero", levels: int = 1):
+    """
+    Applies the base stat increases of the hero's class (see
+    level_up_gains) for a hero gaining levels.
+    Modifies the hero directly.
+    """
+    log.debug("Applying level-up stats to %s", hero.name)
+    for stat, gain in level_up_gains(hero.hero_class).items():
+        hero.base_stats[stat] = hero.base_stats.get(stat, 0) + gain * levels
+    invalidate_hero_stats(hero)
@@ -0,0 +1,100 @@
+"""
+inventory_index.py
+
+A sorted, filterable index over an inventory (item id -> count) for
+views that list it, e.g. the HeroScreen inventory.
+
+The name order of all items is built once; counts that change later
+(e.g., after equipping an item) are applied item by item. Query
+results are cached until the index changes, so scrolling or
+re-rendering a list does no sorting at all.
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from game_logic.item_catalog import ItemCatalog, get_item_catalog
+
+# Orders a query can return
+SORT_KEYS = ("name", "count", "slot")
+
+class InventoryIndex:
+    """
+    Item ids of an inventory in name order, with per-query caches.
+    Items with a count of 0 or less are left out.
+    """
+
+    def __init__(self, inventory: Dict[str, int], catalog: Optional[ItemCatalog] = None):
+        self.catalog = catalog or get_item_catalog()
+        self.counts: Dict[str, int] = {i: c for i, c in inventory.items() if c > 0}
+        # (lowercase display name, id) of every listed item, sorted
+        self._by_name: List[Tuple[str, str]] = sorted((self._sort_name(i), i) for i in self.counts)
+        self._queries: Dict[Tuple[str, Optional[str], str], List[str]] = {}
+
+    def _sort_name(self, item_id: str) -> str:
+        return self.display_name(item_id).lower()
+
+    def display_name(self, item_id: str) -> str:
+        item_def = self.catalog.get(item_id)
+        return item_def.get("name", item_id) if item_def else item_id
+
+    def slot(self, item_id: str) -> str:
+        item_def = self.catalog.get(item_id)
+        return item_def.get("slot", "") if item_def else ""
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def set_count(self, item_id: str, count: int):
+        """
+        Updates the count of one item (0 removes it from the index).
+        """
+        old_count = self.counts.get(item_id, 0)
+        if count == old_count:
+            return
+        entry = (self._sort_name(item_id), item_id)
+        if count > 0 and old_count <= 0:
+            bisect.insort(self._by_name, entry)
+        elif count <= 0 and old_count > 0:
+            del self._by_name[bisect.bisect_left(self._by_name, entry)]
+        if count > 0:
+            self.counts[item_id] = count
+        else:
+            self.counts.pop(item_id, None)
+        self._queries.clear()
+
+    def sync(self, inventory: Dict[str, int], item_ids: Iterable[str]):
+        """
+        Takes the counts of item_ids from inventory (the items a change touched).
+        """
+        for item_id in item_ids:
+            self.set_count(item_id, inventory.get(item_id, 0))
+
+    def query(self, sort: str = "name", slot: Optional[str] = None, text: str = "") -> List[str]:
+        """
+        Returns the ids of the listed items, optionally only those of
+        one slot and/or whose name contains text, ordered by sort
+        (see SORT_KEYS; ties are broken by name).
+        The returned list is shared; do not modify it.
+        Raises ValueError for an unknown sort key.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'.")
+        key = (sort, slot, text.lower())
+        result = self._queries.get(key)
+        if result is not None:
+            return result
+
+        needle = text.lower()
+        slot_ids = set(self.catalog.by_slot(slot)) if slot is not None else None
+        result = [
+            item_id for name, item_id in self._by_name
+            if (slot_ids is None or item_id in slot_ids) and needle in name
+        ]
+        # Python's sort is stable: the name order breaks ties
+        if sort == "count":
+            result.sort(key=self.counts.__getitem__, reverse=True)
+        elif sort == "slot":
+            result.sort(key=self.slot)
+        self._queries[key] = result
+        return result
@@ -0,0 +1,173 @@
+"""
+item_catalog.py
+
+Loads the item definitions from data/items.json once and keeps
+secondary indexes (by slot, by stat value and by unlocking building)
+so item queries do not have to scan the whole catalog.
+
+The parsed catalog and its indexes are stored in a binary cache file
+(marshal format, which only holds plain data and never runs code on
+load) next to items.json, keyed by the file's mtime and size, so later
+startups skip JSON parsing and index building entirely.
+"""
+
+import bisect
+import json
+import marshal
+import os
+import tempfile
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+ITEMS_PATH = os.path.join(DATA_DIR, "items.json")
+
+# Bump when the cached layout changes so stale caches are rebuilt
+CACHE_VERSION = 2
+
+class ItemCatalog:
+    """
+    Read-only collection of item definitions with secondary indexes.
+
+    An item definition looks like:
+        {"name": "Steel Sword", "slot": "weapon", "stats": {"attack": 6},
+         "unlock": {"building": "forge", "level": 1}}   # 'unlock' is optional
+    """
+
+    def __init__(self, items: Dict[str, Dict[str, Any]]):
+        self.items = items
+
+        # slot -> item ids
+        self._by_slot: Dict[str, Set[str]] = {}
+        # stat -> (sorted values, item ids in the same order)
+        self._by_stat: Dict[str, Tuple[List[int], List[str]]] = {}
+        # building -> (sorted unlock levels, item ids in the same order)
+        self._by_unlock: Dict[str, Tuple[List[int], List[str]]] = {}
+        self._build_indexes()
+
+    def _build_indexes(self):
+        stat_entries: Dict[str, List[Tuple[int, str]]] = {}
+        unlock_entries: Dict[str, List[Tuple[int, str]]] = {}
+
+        for item_id, item in self.items.items():
+            self._by_slot.setdefault(item.get("slot", ""), set()).add(item_id)
+            for stat, value in item.get("stats", {}).items():
+                stat_entries.setdefault(stat, []).append((value, item_id))
+            unlock = item.get("unlock")
+            if unlock:
+                unlock_entries.setdefault(unlock["building"], []).append((unlock.get("level", 1), item_id))
+
+        for index, entries in ((self._by_stat, stat_entries), (self._by_unlock, unlock_entries)):
+            for key, pairs in entries.items():
+                pairs.sort()
+                index[key] = ([v for v, _ in pairs], [i for _, i in pairs])
+
+    # --- Loading ---
+
+    @classmethod
+    def load(cls, path: str = ITEMS_PATH, cache_path: Optional[str] = None) -> "ItemCatalog":
+        """
+        Loads the catalog from the binary cache if it matches the
+        source file, otherwise parses the JSON and refreshes the cache.
+        """
+        cache_path = cache_path or os.path.splitext(path)[0] + ".cache"
+        stat = os.stat(path)
+        cache_key = (CACHE_VERSION, marshal.version, stat.st_mtime_ns, stat.st_size)
+
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = marshal.loads(f.read())
+            if cached.get("key") == cache_key:
+                catalog = cls.__new__(cls)
+                catalog.__dict__.update(cached["catalog"])
+                return catalog
+        except (OSError, ValueError, EOFError, AttributeError, KeyError, TypeError):
+            pass # Missing or unreadable cache: rebuild it below
+
+        with open(path, 'r') as f:
+            catalog = cls(json.load(f))
+
+        try:
+            # A unique temp file: several processes may rebuild the cache at once
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(cache_path) + ".", dir=os.path.dirname(cache_path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(marshal.dumps({"key": cache_key, "catalog": catalog.__dict__}))
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            # The cache is an optimization only (e.g., read-only install)
+            log.warning("Could not write item cache %s: %s", cache_path, e)
+        return catalog
+
+    # --- Queries ---
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the definition of an item, or None if it does not exist.
+        """
+        return self.items.get(item_id)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def by_slot(self, slot: str) -> List[str]:
+        """
+        Returns the ids of all items that fit the given slot (e.g., "weapon").
+        """
+        return sorted(self._by_slot.get(slot, ()))
+
+    def with_stat_above(self, stat: str, threshold: int, slot: Optional[str] = None) -> List[str]:
+        """
+        Returns the ids of all items whose 'stat' bonus is greater than threshold,
+        ordered by that bonus. Optionally restricted to one slot.
+        (e.g., with_stat_above("attack", 5, slot="weapon"))
+        """
+        values, item_ids = self._by_stat.get(stat, ((), ()))
+        matches = item_ids[bisect.bisect_right(values, threshold):]
+        if slot is not None:
+            slot_ids = self._by_slot.get(slot, set())
+            matches = [i for i in matches if i in slot_ids]
+        return list(matches)
+
+    def unlocked_by(self, building: str, level: int) -> List[str]:
+        """
+        Returns the ids of all items a building unlocks up to (and including) level.
+        """
+        levels, item_ids = self._by_unlock.get(building, ((), ()))
+        return list(item_ids[:bisect.bisect_right(levels, level)])
+
+    def unlocked_at(self, building: str, level: int) -> List[str]:
+        """
+        Returns the ids of the items a building unlocks at exactly level.
+        """
+        levels, item_ids = self._by_unlock.get(building, ((), ()))
+        return list(item_ids[bisect.bisect_left(levels, level):bisect.bisect_right(levels, level)])
+
+    def unlocked_items(self, base_status: Dict[str, int]) -> List[str]:
+        """
+        Returns the ids of all items unlocked by the given base_status.
+        """
+        unlocked: List[str] = []
+        for building, level in base_status.items():
+            unlocked.extend(self.unlocked_by(building, level))
+        return unlocked
+
+_catalog: Optional[ItemCatalog] = None
+
+def get_item_catalog() -> ItemCatalog:
+    """
+    Returns the shared item catalog, loading it on first use.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = ItemCatalog.load()
+    return _catalog
@@ -7,36 +7,44 @@ This module is stateless and operates on the game_state object.
 
 from typing import TYPE_CHECKING, Dict, Any
 
+from game_logic import hero_manager
+from game_logic.item_catalog import get_item_catalog
+from utils.logger import get_logger
+
 if TYPE_CHECKING:
     from core.game_state import GameState
+    from core.hero import Hero
+
+log = get_logger(__name__)
 
-# This data would eventually be loaded from data/items.json
-ITEM_DEFINITIONS = {
-    "sword": {"name": "Sword", "slot": "weapon", "stats": {"attack": 5}},
-    "leather_armor": {"name": "Leather Armor", "slot": "armor", "stats": {"defense": 3}},
-}
+# Item definitions are loaded from data/items.json (see item_catalog.py)
 
 def get_item_stats(item_id: str) -> Dict[str, Any]:
     """
     Retrieves the stat bonuses for a given item_id.
     """
-    item = ITEM_DEFINITIONS.get(item_id)
+    item = get_item_catalog().get(item_id)
     if item:
         return item.get("stats", {})
     return {}
 
-def can_equip_item(game_state: "GameState", hero: Dict[str, Any], item_id: str) -> bool:
+def can_equip_item(game_state: "GameState", hero: "Hero", item_id: str) -> bool:
     """
     Checks if a hero can equip a specific item.
-    (e.g., checks class requirements, level requirements)
+    Items with an "unlock" requirement (data/items.json) need that
+    building at the given level or higher.
     """
-    print(f"Stub: Checking if hero can equip {item_id}...")
+    log.debug("Checking if hero can equip %s...", item_id)
     
-    if item_id not in ITEM_DEFINITIONS:
-        print(f"Stub: Item {item_id} does not exist.")
+    item = get_item_catalog().get(item_id)
+    if item is None:
+        log.debug("Item %s does not exist.", item_id)
+        return False
+
+    unlock = item.get("unlock")
+    if unlock and game_state.base_status.get(unlock["building"], 0) < unlock.get("level", 1):
+        log.debug("Item %s is locked (needs %s level %s).", item_id, unlock["building"], unlock.get("level", 1))
         return False
-        
-    # Stub: For now, all heroes can equip all items
     return True
 
 def apply_item(game_state: "GameState", hero_id: Any, item_id: Any) -> bool:
@@ -47,37 +55,41 @@ def apply_item(game_state: "GameState", hero_id: Any, item_id: Any) -> bool:
     
     Modifies game_state directly.
     """
-    print(f"Stub: 'apply_item' called for Hero {hero_id} and Item {item_id}.")
+    log.debug("'apply_item' called for Hero %s and Item %s.", hero_id, item_id)
     
-    # --- Future Logic ---
     # 1. Find the hero in game_state.heroes
-    # hero = next((h for h in game_state.heroes if h["id"] == hero_id), None)
-    # if not hero:
-    #     print(f"Stub: Hero {hero_id} not found.")
-    #     return False
-    #
+    hero = next((h for h in game_state.heroes if h.id == hero_id), None)
+    if hero is None:
+        log.debug("Hero %s not found.", hero_id)
+        return False
+
     # 2. Check if item is in game_state.inventory
-    # if game_state.inventory.get(item_id, 0) <= 0:
-    #     print(f"Stub: Item {item_id} not in inventory.")
-    #     return False
-    #
+    if game_state.inventory.get(item_id, 0) <= 0:
+        log.debug("Item %s not in inventory.", item_id)
+        return False
+
     # 3. Check if hero can equip it
-    # if not can_equip_item(game_state, hero, item_id):
-    #     print(f"Stub: Hero {hero_id} cannot equip {item_id}.")
-    #     return False
-    #
+    if not can_equip_item(game_state, hero, item_id):
+        log.debug("Hero %s cannot equip %s.", hero_id, item_id)
+        return False
+
     # 4. Perform the swap
-    # item_def = ITEM_DEFINITIONS[item_id]
-    # slot = item_def["slot"]
-    #
-    # # Unequip old item (if any)
-    # old_item_id = hero.get("equipment", {}).get(slot)
-    # if old_item_id:
-    #     game_state.inventory[old_item_id] = game_state.inventory.get(old_item_id, 0) + 1
-    #
-    # # Equip new item
-    # hero.get("equipment", {})[slot] = item_id
-    # game_state.inventory[item_id] -= 1
-    #
-    # print(f"Stub: Hero {hero_id} equipped {item_id}.")
-    return True
\ No newline at end of file
+    item_def = get_item_catalog().get(item_id)
+    slot = item_def["slot"]
+
+    # (Copy-on-write: only touch what this game_state owns)
+    hero = game_state.mutable_hero(hero_id)
+    inventory = game_state.mutable_inventory()
+
+    # Unequip old item (if any)
+    old_item_id = hero.equipment.get(slot)
+    if old_item_id:
+        inventory[old_item_id] = inventory.get(old_item_id, 0) + 1
+
+    # Equip new item
+    hero.equipment[slot] = item_id
+    inventory[item_id] -= 1
+    hero_manager.invalidate_hero_stats(hero)
+
+    log.debug("Hero %s equipped %s.", hero_id, item_id)
+    return True
@@ -0,0 +1,194 @@
+"""
+upgrade_planner.py
+
+Plans base upgrades over the cost data in base_manager.UPGRADE_COSTS.
+
+Every (building, level) is a node of a dependency graph. A level
+depends on the previous level of the same building and on the levels
+named in its optional "requires" field, e.g.
+    "forge": {2: {"resource": "gold", "amount": 400, "requires": {"barracks": 2}}}
+
+The graph and a dependency order of its nodes are built once
+(get_upgrade_graph). Because all prerequisites of a node are mandatory,
+the cheapest way to unlock it is exactly its missing prerequisites: a
+walk that stops at already built levels, with no search over
+alternatives. Query results are cached for repeated calls with the
+same base status and inventory (e.g., on every screen refresh), keyed
+only on what the graph looks at: the levels of its buildings and the
+amounts of the resources its upgrades cost, in the graph's fixed order.
+Building a key is one lookup per building and resource, with no sort
+of the whole inventory.
+"""
+
+import functools
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
+
+Node = Tuple[str, int] # (building, level)
+Cost = Dict[str, int] # resource -> amount
+
+class UpgradeGraph:
+    """
+    Dependency and cost graph of all base upgrades.
+    """
+
+    def __init__(self, upgrade_costs: Dict[str, Dict[int, Dict[str, Any]]]):
+        self.costs: Dict[Node, Cost] = {}
+        self.requires: Dict[Node, List[Node]] = {}
+        self.dependents: Dict[Node, List[Node]] = {} # node -> nodes that directly require it
+        for building, levels in upgrade_costs.items():
+            for level, cost in levels.items():
+                node = (building, level)
+                self.costs[node] = {cost["resource"]: cost["amount"]} if "resource" in cost else {}
+                prerequisites = [(building, level - 1)] if level > 1 else []
+                prerequisites += [(b, l) for b, l in cost.get("requires", {}).items() if l > 0]
+                self.requires[node] = prerequisites
+        # Fixed orders of the buildings and resources the graph uses (cache keys)
+        self.buildings: Tuple[str, ...] = tuple(sorted({b for b, _ in self.costs}))
+        self.resources: Tuple[str, ...] = tuple(sorted({r for cost in self.costs.values() for r in cost}))
+
+        for node, prerequisites in self.requires.items():
+            for prerequisite in prerequisites:
+                if prerequisite not in self.costs:
+                    raise ValueError(f"Unknown upgrade required: {prerequisite[0]} level {prerequisite[1]}.")
+                self.dependents.setdefault(prerequisite, []).append(node)
+
+        # Position of each node in a dependency order (prerequisites first)
+        self.order: Dict[Node, int] = {}
+        waiting = {node: len(prerequisites) for node, prerequisites in self.requires.items()}
+        ready = [node for node, count in waiting.items() if count == 0]
+        while ready:
+            node = ready.pop()
+            self.order[node] = len(self.order)
+            for dependent in self.dependents.get(node, []):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if len(self.order) < len(self.costs):
+            cyclic = next(node for node in self.costs if node not in self.order)
+            raise ValueError(f"Upgrade requirements form a cycle at {cyclic[0]} level {cyclic[1]}.")
+
+    def next_level(self, building: str, base_status: Dict[str, int]) -> Optional[Node]:
+        """
+        The next upgrade of a building, or None at its max level.
+        """
+        node = (building, base_status.get(building, 0) + 1)
+        return node if node in self.costs else None
+
+    def is_unlocked(self, node: Node, base_status: Dict[str, int]) -> bool:
+        """
+        True if every direct prerequisite of node has been built.
+        """
+        return all(base_status.get(b, 0) >= l for b, l in self.requires[node])
+
+    def missing(self, node: Node, base_status: Dict[str, int]) -> List[Node]:
+        """
+        The upgrades still needed to build node (node included),
+        in an order that satisfies all prerequisites.
+        """
+        todo = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current in todo or base_status.get(current[0], 0) >= current[1]:
+                continue # Built levels imply their prerequisites are built too
+            todo.add(current)
+            stack.extend(self.requires[current])
+        return sorted(todo, key=self.order.__getitem__)
+
+def total_cost(graph: UpgradeGraph, nodes: List[Node]) -> Cost:
+    """
+    Sums the costs of several upgrades per resource.
+    """
+    total: Cost = {}
+    for node in nodes:
+        for resource, amount in graph.costs[node].items():
+            total[resource] = total.get(resource, 0) + amount
+    return total
+
+def can_afford(cost: Cost, inventory: Dict[str, int]) -> bool:
+    return all(inventory.get(resource, 0) >= amount for resource, amount in cost.items())
+
+_graph: Optional[UpgradeGraph] = None
+
+def get_upgrade_graph() -> UpgradeGraph:
+    """
+    Returns the graph of base_manager.UPGRADE_COSTS, built on first use.
+    """
+    global _graph
+    if _graph is None:
+        from game_logic.base_manager import UPGRADE_COSTS
+        _graph = UpgradeGraph(UPGRADE_COSTS)
+    return _graph
+
+def reset_upgrade_graph():
+    """
+    Drops the cached graph and query results (e.g., after UPGRADE_COSTS changed).
+    """
+    global _graph
+    _graph = None
+    _cheapest_path.cache_clear()
+    _affordable_upgrades.cache_clear()
+
+def _levels(graph: UpgradeGraph, base_status: Dict[str, int]) -> Tuple[int, ...]:
+    return tuple(base_status.get(building, 0) for building in graph.buildings)
+
+def _amounts(graph: UpgradeGraph, inventory: Dict[str, int]) -> Tuple[int, ...]:
+    return tuple(inventory.get(resource, 0) for resource in graph.resources)
+
+@functools.lru_cache(maxsize=1024)
+def _cheapest_path(levels: Tuple[int, ...], building: str,
+                   level: int) -> Optional[Tuple[List[Node], Cost]]:
+    graph = get_upgrade_graph()
+    if (building, level) not in graph.costs:
+        return None
+    path = graph.missing((building, level), dict(zip(graph.buildings, levels)))
+    return path, total_cost(graph, path)
+
+def cheapest_path(base_status: Dict[str, int], building: str, level: int) -> Optional[Tuple[List[Node], Cost]]:
+    """
+    Returns the cheapest sequence of upgrades that reaches the given
+    building level, with its total cost. ([], {}) if it is already built,
+    None if that level does not exist.
+    """
+    result = _cheapest_path(_levels(get_upgrade_graph(), base_status), building, level)
+    return None if result is None else (list(result[0]), dict(result[1]))
+
+def affordable_upgrades(base_status: Dict[str, int], inventory: Dict[str, int]) -> List[Node]:
+    """
+    Returns a sequence of upgrades that can be bought together with the
+    current inventory. Repeatedly picks the cheapest upgrade whose
+    prerequisites are met and that still fits the remaining resources,
+    so as many upgrades as possible are bought.
+    """
+    graph = get_upgrade_graph()
+    return list(_affordable_upgrades(_levels(graph, base_status), _amounts(graph, inventory)))
+
+@functools.lru_cache(maxsize=256)
+def _affordable_upgrades(levels: Tuple[int, ...], amounts: Tuple[int, ...]) -> Tuple[Node, ...]:
+    graph = get_upgrade_graph()
+    status = dict(zip(graph.buildings, levels))
+    remaining = dict(zip(graph.resources, amounts))
+    plan: List[Node] = []
+
+    def push_if_available(node: Optional[Node]):
+        if node is not None and status.get(node[0], 0) == node[1] - 1 and graph.is_unlocked(node, status):
+            heapq.heappush(candidates, (sum(graph.costs[node].values()), graph.order[node], node))
+
+    candidates: List[Tuple[int, int, Node]] = []
+    for building in graph.buildings:
+        push_if_available(graph.next_level(building, status))
+
+    while candidates:
+        _, _, node = heapq.heappop(candidates)
+        cost = graph.costs[node]
+        if not can_afford(cost, remaining):
+            continue # Resources only shrink: it will not fit later either
+        for resource, amount in cost.items():
+            remaining[resource] -= amount
+        status[node[0]] = node[1]
+        plan.append(node)
+        # Buying node may have unlocked the upgrades that depend on it
+        for dependent in graph.dependents.get(node, []):
+            push_if_available(dependent)
+    return tuple(plan)
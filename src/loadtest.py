@@ -0,0 +1,66 @@
+"""
+loadtest.py
+
+Entry point for load tests of the rules engine.
+Plays many independent headless game sessions (core/driver.py) on all
+CPU cores, with random or scripted actions, and reports the throughput
+and the latency distribution per action type.
+
+Usage (from the 'src' directory):
+    python loadtest.py --sessions 64 --actions 5000
+    python loadtest.py --sessions 8 --script scripts/battle.json --workers 4
+    python loadtest.py --json                 # the report as one JSON object
+
+A script is a JSON list of [method, arg...] GameController calls,
+repeated until each session has played --actions actions.
+"""
+
+import argparse
+import json
+
+from core.driver import ACTIONS, PERCENTILES, load_script, run_sessions
+
+def format_latency(name: str, summary: dict) -> str:
+    if not summary["count"]:
+        return f"{name:<20}{0:>10}"
+    tail = "".join(f"{summary[f'p{p:g}_us']:>11.1f}" for p in PERCENTILES)
+    return f"{name:<20}{summary['count']:>10,}{summary['mean_us']:>11.1f}{tail}{summary['max_us']:>11.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the rules engine with headless sessions.")
+    parser.add_argument("--sessions", type=int, default=16, help="independent game sessions")
+    parser.add_argument("--actions", type=int, default=2000, help="actions per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU; more adds scheduling delays to the latencies)")
+    parser.add_argument("--script", help=f"JSON script of [method, arg...] calls ({', '.join(ACTIONS)})")
+    parser.add_argument("--save-dir", help="keep the sessions' saves in this directory")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    if args.sessions < 1 or args.actions < 1:
+        parser.error("--sessions and --actions must be at least 1")
+
+    script = None
+    if args.script:
+        try:
+            script = load_script(args.script)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    report = run_sessions(args.sessions, args.actions, args.seed, args.workers, script, args.save_dir)
+    if args.json:
+        print(json.dumps(report))
+        return
+
+    print(f"{report['actions']:,} actions in {report['sessions']} sessions on {report['workers']} workers: "
+          f"{report['seconds']:.2f}s ({report['actions_per_second']:,.0f} actions/s)")
+    if report["failed"] or report["errors"]:
+        print(f"{report['failed']:,} refused by the rules, {report['errors']:,} raised")
+    header = "".join(f"{f'p{p:g} us':>11}" for p in PERCENTILES)
+    print(f"\n{'action':<20}{'count':>10}{'mean us':>11}{header}{'max us':>11}")
+    for method, summary in report["by_action"].items():
+        print(format_latency(method, summary))
+    print(format_latency("all", report["latency"]))
+
+if __name__ == "__main__":
+    main()
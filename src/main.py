@@ -3,23 +3,84 @@ main.py
 
 Main entry point for the TUI game.
 Initializes and runs the Textual TUI application.
+
+Usage (from the 'src' directory):
+    python main.py [--trace-startup REPORT.json] [--exit-after-startup] [--metrics]
+
+--trace-startup writes the timings of the startup phases (imports,
+GameController and GameState construction, first main menu frame) as
+JSON; see utils/startup_trace.py. With --exit-after-startup the game
+runs headless and quits as soon as the main menu is on screen, which is
+what 'python -m benchmarks.startup' uses to check the startup budget.
+
+Diagnostics are logged to game.log (see utils/logger.py; set
+TUI_GAME_LOG_LEVEL=DEBUG for the details of every game action).
+--metrics (or TUI_GAME_METRICS=1) records per-function metrics of the
+game rules, shown in-game by F12 (see utils/instrumentation.py).
 """
 
-# Import the main application class
-from tui.app import GameApp
+import argparse
+from typing import Optional
 
-def run_game():
+# Only the standard library: the timings below include every game import
+from utils import startup_trace
+
+def run_game(trace_path: Optional[str] = None, exit_after_startup: bool = False, metrics: bool = False):
     """
     Initializes and runs the main TUI application.
+    trace_path: write a startup trace report to this file.
+    metrics: instrument the game rules from the start.
     """
-    # This will be implemented fully once the tui.app module exists.
-    app = GameApp()
-    app.run()
-    
-    # print("TUI Game Entry Point")
-    # print("====================")
-    # print("App is not yet implemented. Running main.py stub.")
+    trace = startup_trace.begin() if trace_path else None
+
+    with startup_trace.phase("imports"):
+        with startup_trace.phase("import textual"):
+            import textual.app
+        with startup_trace.phase("import game_logic"):
+            import game_logic.base_manager
+            import game_logic.battle_system
+            import game_logic.hero_manager
+            import game_logic.item_manager
+        with startup_trace.phase("import core"):
+            from core.game_controller import GameController
+        with startup_trace.phase("import tui"):
+            from tui.app import GameApp
+        from utils import instrumentation
+        from utils.logger import setup_logger
+
+    # Diagnostics go to a log file (see utils/logger.py), never to the terminal
+    with startup_trace.phase("logging setup"):
+        setup_logger()
+    if metrics:
+        instrumentation.enable()
+    else:
+        instrumentation.enable_from_env()
+
+    with startup_trace.phase("GameController init"):
+        controller = GameController(persist_actions=True)
+    with startup_trace.phase("GameApp init"):
+        app = GameApp(controller=controller)
+    if exit_after_startup:
+        startup_trace.on_ready(app.exit)
+
+    try:
+        app.run(headless=exit_after_startup)
+    finally:
+        # Don't lose a save that is still queued on the autosave worker
+        app.controller.shutdown()
+        if trace is not None:
+            startup_trace.end()
+            trace.write(trace_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TUI game.")
+    parser.add_argument("--trace-startup", metavar="REPORT", help="write startup timings to this JSON file")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="run headless and quit once the main menu is shown")
+    parser.add_argument("--metrics", action="store_true", help="record per-function metrics of the game rules")
+    args = parser.parse_args()
+    run_game(args.trace_startup, args.exit_after_startup, args.metrics)
 
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    main()
@@ -0,0 +1,163 @@
+"""
+simulate.py
+
+Entry point for encounter balancing.
+Simulates many seeded battles of a party against one encounter (or all
+encounters in data/enemies.json) on all CPU cores and prints the
+aggregated results while they come in: win rate with a 95% confidence
+interval, and the distributions of battle length, heroes lost and
+damage dealt and taken. The fights are played in NumPy batches (see
+game_logic/battle_simulator.py), so NumPy must be installed.
+
+Usage (from the 'src' directory):
+    python simulate.py goblin_encounter --party warrior:3 mage:2
+    python simulate.py --all --save savegame.sav --fights 100000 --workers 32
+    python simulate.py orc_scout --json      # one JSON object per update
+
+A party member is 'class[:level]' (classes from data/heroes.json);
+--save uses the active heroes of a save file instead.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, Any, List
+
+from core.game_state import GameState
+from core.hero import Hero
+from game_logic import base_manager, battle_system, hero_manager
+from game_logic.content import get_content
+from game_logic.encounter_evaluator import EncounterStats, evaluate_encounters
+from utils.logger import setup_logger
+
+# Bins of the damage histograms
+DAMAGE_BINS = 10
+
+def party_from_specs(specs: List[str]) -> List[Hero]:
+    """
+    Builds heroes from 'class[:level]' specs, e.g. ["warrior:5", "mage"].
+    Raises ValueError for unknown classes or malformed levels.
+    """
+    templates = get_content().heroes
+    heroes = []
+    for index, spec in enumerate(specs):
+        hero_class, _, level = spec.partition(":")
+        if hero_class not in templates:
+            raise ValueError(f"Unknown hero class '{hero_class}' (known: {', '.join(templates)}).")
+        hero = Hero.from_template(f"hero_{index}", hero_class, templates[hero_class])
+        levels = int(level or 1) - 1
+        if levels > 0:
+            hero.level += levels
+            hero_manager.apply_level_up_stats(hero, levels)
+        heroes.append(hero)
+    return heroes
+
+def party_from_save(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Returns the battle records of the active heroes of a save file,
+    with the bonuses of its base.
+    """
+    game_state = GameState()
+    game_state.load_state(filepath)
+    base_effects = base_manager.get_base_effects(game_state)
+    return [battle_system.make_hero_combatant(h, base_effects) for h in game_state.active_heroes]
+
+def format_update(stats: EncounterStats, n_fights: int) -> str:
+    low, high = stats.win_rate_interval()
+    return (f"{stats.encounter_id:<24}{stats.fights:>9}/{n_fights:<9}"
+            f"win {stats.win_rate:7.2%}  [{low:.2%}, {high:.2%}]")
+
+def format_distribution(title: str, counts: Dict[int, int], total: int) -> str:
+    lines = [f"  {title}:"]
+    for value, count in sorted(counts.items()):
+        lines.append(f"    {value:>4}  {count / total:7.2%}  {'#' * round(40 * count / total)}")
+    return "\n".join(lines)
+
+def format_histogram(title: str, counts: Dict[int, int], total: int, bins: int = DAMAGE_BINS) -> str:
+    """
+    Like format_distribution, with the values grouped into equal-width bins.
+    """
+    low, high = min(counts), max(counts)
+    width = max(-(-(high - low + 1) // bins), 1)
+    grouped: Dict[int, int] = {}
+    for value, count in counts.items():
+        start = low + (value - low) // width * width
+        grouped[start] = grouped.get(start, 0) + count
+    lines = [f"  {title}:"]
+    for start, count in sorted(grouped.items()):
+        label = f"{start}-{start + width - 1}" if width > 1 else f"{start}"
+        lines.append(f"    {label:>9}  {count / total:7.2%}  {'#' * round(40 * count / total)}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo encounter evaluation.")
+    parser.add_argument("encounter", nargs="?", help="encounter id from data/enemies.json")
+    parser.add_argument("--all", action="store_true", help="evaluate every encounter")
+    parser.add_argument("--party", nargs="+", default=["warrior", "mage"], metavar="CLASS[:LEVEL]")
+    parser.add_argument("--save", help="use the active heroes of this save file as the party")
+    parser.add_argument("--fights", type=int, default=10_000, help="fights per encounter")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--max-turns", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="print updates as JSON lines")
+    args = parser.parse_args()
+
+    # Diagnostics (e.g., from loading --save) go to the log file, not the report
+    setup_logger()
+
+    if args.fights < 1:
+        parser.error("--fights must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.all:
+        encounter_ids = battle_system.list_encounters()
+    elif args.encounter:
+        encounter_ids = [args.encounter]
+    else:
+        parser.error("give an encounter id or --all")
+    unknown = [e for e in encounter_ids if e not in battle_system.list_encounters()]
+    if unknown:
+        parser.error(f"unknown encounter '{unknown[0]}'")
+
+    try:
+        if args.save:
+            party = party_from_save(args.save)
+        else:
+            # A party without a base: no base bonuses
+            base_effects = base_manager.compute_base_effects({})
+            party = [battle_system.make_hero_combatant(h, base_effects) for h in party_from_specs(args.party)]
+    except ValueError as e:
+        parser.error(str(e))
+    if not party:
+        parser.error("the party is empty")
+
+    start = time.perf_counter()
+    final: Dict[str, EncounterStats] = {}
+    for stats in evaluate_encounters(party, encounter_ids, args.fights, args.seed,
+                                     args.workers, args.max_turns):
+        final[stats.encounter_id] = stats
+        if args.json:
+            print(json.dumps(stats.to_dict()), flush=True)
+        else:
+            print(format_update(stats, args.fights), flush=True)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        return
+    print(f"\n{args.fights * len(encounter_ids):,} fights in {elapsed:.2f}s "
+          f"({args.fights * len(encounter_ids) / elapsed:,.0f} fights/s)")
+    for encounter_id in encounter_ids:
+        stats = final[encounter_id]
+        low, high = stats.win_rate_interval()
+        mean_turns = stats.mean_turns_to_win
+        print(f"\n{encounter_id}: win rate {stats.win_rate:.2%} (95% CI {low:.2%} - {high:.2%}), "
+              f"{stats.losses} losses, {stats.draws} draws, "
+              f"mean turns to win {'-' if mean_turns is None else f'{mean_turns:.2f}'}")
+        print(format_distribution("turns", stats.turns, stats.fights))
+        print(format_distribution("heroes lost", stats.heroes_lost, stats.fights))
+        print(format_histogram("damage dealt", stats.damage_dealt, stats.fights))
+        print(format_histogram("damage taken", stats.damage_taken, stats.fights))
+
+if __name__ == "__main__":
+    main()
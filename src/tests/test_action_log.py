@@ -0,0 +1,40 @@
+"""
+Deterministic replay of the action log.
+"""
+
+import os
+import random
+
+from core import action_log
+from core.action_log import decode_records
+from core.driver import random_actions
+from core.game_controller import ACTION_LOG_SUFFIX, GameController
+
+def test_replay_rebuilds_the_same_state():
+    recorded = GameController()
+    recorded.new_game(seed=7)
+    actions = random_actions(recorded, random.Random(7))
+    for _ in range(500):
+        method, args = next(actions)
+        getattr(recorded, method)(*args)
+
+    replayed = GameController()
+    assert replayed.replay(recorded.action_log.to_bytes()) == len(recorded.action_log)
+    assert replayed.game_state.to_sections() == recorded.game_state.to_sections()
+    assert replayed.action_log.to_bytes() == recorded.action_log.to_bytes()
+
+def test_saving_discards_the_logged_actions_before_it(tmp_path):
+    save_path = str(tmp_path / "savegame.sav")
+    controller = GameController(save_path, persist_actions=True)
+    controller.new_game(seed=1)
+    controller.upgrade_building("barracks")
+    controller.save_game(wait=True)
+    controller.equip_item("hero_0", "sword_basic")
+    controller.shutdown()
+
+    with open(save_path + ACTION_LOG_SUFFIX, 'rb') as f:
+        records = list(decode_records(f.read()))
+    assert [opcode for opcode, _ in records] == [action_log.CHECKPOINT, action_log.EQUIP_ITEM]
+    assert records == list(decode_records(controller.action_log.to_bytes()))
+    # No temp file of the rewrite is left behind
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("savegame.sav" + ACTION_LOG_SUFFIX + ".")]
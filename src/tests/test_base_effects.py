@@ -0,0 +1,54 @@
+"""
+The base effects kept on the game state, and their verify mode.
+"""
+
+import pytest
+
+from core.game_controller import GameController
+from game_logic import base_manager
+
+@pytest.fixture
+def state():
+    controller = GameController()
+    controller.new_game(seed=2)
+    controller.game_state.mutable_inventory()["gold"] = 10_000
+    return controller.game_state
+
+def test_upgrades_keep_the_effects_in_sync(state):
+    effects = base_manager.get_base_effects(state)
+    for building in ("barracks", "forge", "barracks", "forge"):
+        assert base_manager.apply_upgrade(state, building)
+        updated = base_manager.get_base_effects(state, verify=True)
+        assert updated is not effects # Replaced, never changed in place
+        effects = updated
+    assert effects == base_manager.compute_base_effects(dict(state.base_status))
+    assert not base_manager.apply_upgrade(state, "barracks") # Max level
+
+def test_direct_changes_drop_the_effects(state):
+    base_manager.get_base_effects(state)
+    state.mutable_base_status()["forge"] = 1
+    assert base_manager.get_base_effects(state, verify=True)["hero_stats"] == {"attack": 2}
+
+    state.base_status = {"barracks": 2}
+    assert base_manager.get_base_effects(state, verify=True)["hero_stats"] == {"hp": 25, "defense": 1}
+
+def test_verify_detects_stale_effects(state):
+    base_manager.get_base_effects(state)
+    state.base_effects = base_manager.compute_base_effects({"barracks": 1})
+    assert base_manager.get_base_effects(state) is state.base_effects # Trusted without verify
+    with pytest.raises(RuntimeError):
+        base_manager.get_base_effects(state, verify=True)
+
+def test_verify_mode_setting(state, monkeypatch):
+    base_manager.get_base_effects(state)
+    state.base_effects = base_manager.compute_base_effects({"forge": 2})
+    monkeypatch.setattr(base_manager, "VERIFY_BASE_EFFECTS", True)
+    with pytest.raises(RuntimeError):
+        base_manager.get_base_effects(state)
+
+def test_snapshot_keeps_its_own_effects(state):
+    before = base_manager.get_base_effects(state)
+    branch = state.snapshot()
+    assert base_manager.apply_upgrade(state, "barracks")
+    assert base_manager.get_base_effects(branch, verify=True) is before
+    assert base_manager.get_base_effects(state, verify=True) != before
@@ -0,0 +1,79 @@
+"""
+The NumPy batch battle engine and the encounter evaluator built on it.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from game_logic import battle_simulator, battle_system
+from game_logic.encounter_evaluator import evaluate_encounters, simulate_fights
+
+# A party that wins about half of its fights
+HEROES = [
+    {"id": "hero_0", "hp": 40, "attack": 9, "defense": 1},
+    {"id": "hero_1", "hp": 25, "attack": 6, "defense": 0},
+]
+ENEMIES = [
+    {"id": "enemy_0", "hp": 30, "attack": 7, "defense": 2},
+    {"id": "enemy_1", "hp": 20, "attack": 6, "defense": 1},
+    {"id": "enemy_2", "hp": 15, "attack": 5, "defense": 0},
+]
+
+def play_battles(n_fights: int, seed: int):
+    """
+    Plays n_fights battles with battle_system.process_battle_turn;
+    returns the win rate and the mean number of turns.
+    """
+    rng = random.Random(seed)
+    wins = turns = 0
+    for _ in range(n_fights):
+        battle_state = {"heroes": [dict(h) for h in HEROES], "enemies": [dict(e) for e in ENEMIES],
+                        "turn": 0, "result": None, "events": []}
+        while battle_state["result"] is None:
+            battle_system.process_battle_turn(None, battle_state, {"type": "attack"}, rng)
+        wins += battle_state["result"] == "victory"
+        turns += battle_state["turn"]
+    return wins / n_fights, turns / n_fights
+
+def test_batch_matches_battle_system():
+    fights = battle_simulator.run_fights(HEROES, ENEMIES, 20_000, battle_simulator.make_rng(0))
+    win_rate, mean_turns = play_battles(5_000, seed=0)
+    assert fights["won"].mean() == pytest.approx(win_rate, abs=0.03)
+    assert fights["turns"].mean() == pytest.approx(mean_turns, abs=0.1)
+    assert not (fights["won"] & fights["lost"]).any()
+
+def test_damage_is_capped_by_hp():
+    fights = battle_simulator.run_fights(HEROES, ENEMIES, 1_000, battle_simulator.make_rng(0))
+    assert fights["damage_dealt"].max() <= sum(e["hp"] for e in ENEMIES)
+    assert (fights["damage_dealt"][fights["won"]] == sum(e["hp"] for e in ENEMIES)).all()
+    assert fights["damage_taken"].max() <= sum(h["hp"] for h in HEROES)
+
+def test_unbeatable_enemies_draw_after_max_turns():
+    enemies = [{"id": "wall", "hp": 10, "attack": 0, "defense": 100}]
+    result = battle_simulator.simulate_encounter(HEROES, enemies, n_fights=100, max_turns=7)
+    assert result["draws"] == 100
+    assert result["mean_turns_to_win"] is None
+
+def test_simulate_encounter_is_seeded():
+    first = battle_simulator.simulate_encounter(HEROES, ENEMIES, n_fights=2_000, seed=3)
+    assert first == battle_simulator.simulate_encounter(HEROES, ENEMIES, n_fights=2_000, seed=3)
+    assert sum(first["damage_taken_histogram"]["counts"]) == 2_000
+    assert sum(first["turns_to_win_histogram"]) == first["wins"]
+
+def test_chunks_merge_into_the_whole_run():
+    whole = simulate_fights("test", HEROES, ENEMIES, seed=1, first_fight=0, n_fights=500)
+    assert whole.fights == 500
+    assert whole.wins + whole.losses + whole.draws == 500
+    assert sum(whole.damage_taken.values()) == 500
+
+def test_evaluation_does_not_depend_on_the_number_of_workers():
+    runs = [
+        [s.to_dict() for s in evaluate_encounters(HEROES, ["goblin_encounter"], n_fights=3_000,
+                                                  workers=workers, chunk_size=1_000)][-1]
+        for workers in (1, 2)
+    ]
+    assert runs[0] == runs[1]
+    assert runs[0]["fights"] == 3_000
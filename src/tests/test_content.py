@@ -0,0 +1,128 @@
+"""
+Validation and bundling of the content data files, and heroes created
+from their templates.
+"""
+
+import json
+import os
+
+import pytest
+
+from core.hero import Hero
+from game_logic import content, hero_manager
+from game_logic.content import Content, ContentError, validate_encounters, validate_heroes
+
+HEROES = {
+    "knight": {"name": "Knight", "base_stats": {"hp": 100, "attack": 9, "defense": 7},
+               "level_up_gains": {"hp": 15, "attack": 1, "defense": 3}},
+}
+ENCOUNTERS = {
+    "rats": {"name": "Rats", "enemies": [{"id": "rat_1", "name": "Rat", "hp": 5, "attack": 1, "defense": 0}],
+             "rewards": {"xp": 5}},
+}
+
+def with_change(data: dict, path: tuple, value) -> dict:
+    """
+    A deep copy of data with the value at path replaced (None: deleted).
+    """
+    data = json.loads(json.dumps(data))
+    parent = data
+    for key in path[:-1]:
+        parent = parent[key]
+    if value is None:
+        del parent[path[-1]]
+    else:
+        parent[path[-1]] = value
+    return data
+
+def test_valid_content_is_returned_unchanged():
+    assert validate_heroes(HEROES) == HEROES
+    assert validate_encounters(ENCOUNTERS) == ENCOUNTERS
+    assert content.get_content().heroes["warrior"]["name"] == "Warrior"
+
+@pytest.mark.parametrize("path, value, message", [
+    (("knight", "name"), None, "missing 'name'"),
+    (("knight", "base_stats", "attack"), -1, "knight.base_stats.attack"),
+    (("knight", "base_stats", "hp"), 0, "'hp' must be positive"),
+    (("knight", "level_up_gains", "hp"), "15", "knight.level_up_gains.hp"),
+    (("knight",), [], "expected an object"),
+])
+def test_invalid_heroes(path, value, message):
+    with pytest.raises(ContentError, match=message):
+        validate_heroes(with_change(HEROES, path, value))
+
+@pytest.mark.parametrize("path, value, message", [
+    (("rats", "enemies"), [], "non-empty list of 'enemies'"),
+    (("rats", "enemies", 0, "attack"), None, "'attack' must be a non-negative integer"),
+    (("rats", "enemies", 0, "hp"), 0, "'hp' must be positive"),
+    (("rats", "rewards", "gold"), 1.5, "rats.rewards.gold"),
+])
+def test_invalid_encounters(path, value, message):
+    with pytest.raises(ContentError, match=message):
+        validate_encounters(with_change(ENCOUNTERS, path, value))
+
+def test_duplicate_enemy_ids():
+    encounters = with_change(ENCOUNTERS, ("rats", "enemies"), ENCOUNTERS["rats"]["enemies"] * 2)
+    with pytest.raises(ContentError, match="duplicate id 'rat_1'"):
+        validate_encounters(encounters)
+
+def test_empty_files():
+    with pytest.raises(ContentError):
+        validate_heroes({})
+    with pytest.raises(ContentError):
+        validate_encounters([])
+
+@pytest.fixture
+def data_files(tmp_path):
+    paths = {"heroes_path": str(tmp_path / "heroes.json"), "enemies_path": str(tmp_path / "enemies.json"),
+             "bundle_path": str(tmp_path / "content.cache")}
+    with open(paths["heroes_path"], 'w') as f:
+        json.dump(HEROES, f)
+    with open(paths["enemies_path"], 'w') as f:
+        json.dump(ENCOUNTERS, f)
+    return paths
+
+def test_bundle_is_used_until_a_source_changes(data_files, monkeypatch):
+    loaded = Content.load(**data_files)
+    assert os.path.exists(data_files["bundle_path"])
+    assert [name for name in os.listdir(os.path.dirname(data_files["bundle_path"]))
+            if name.startswith("content.cache.")] == [] # No temp file left behind
+
+    # The bundle is read without parsing the JSON files again
+    def no_compile(*args):
+        raise AssertionError("compiled although the bundle is current")
+    monkeypatch.setattr(Content, "compile", classmethod(no_compile))
+    cached = Content.load(**data_files)
+    assert (cached.heroes, cached.encounters) == (loaded.heroes, loaded.encounters)
+
+    monkeypatch.undo()
+    with open(data_files["heroes_path"], 'w') as f:
+        json.dump(with_change(HEROES, ("knight", "name"), "Sir"), f)
+    assert Content.load(**data_files).heroes["knight"]["name"] == "Sir"
+
+def test_invalid_source_is_not_bundled(data_files):
+    with open(data_files["enemies_path"], 'w') as f:
+        json.dump({"rats": {"name": "Rats", "enemies": []}}, f)
+    with pytest.raises(ContentError):
+        Content.load(**data_files)
+    assert not os.path.exists(data_files["bundle_path"])
+
+def test_hero_from_template_copies_the_template():
+    template = content.get_content().heroes["warrior"]
+    hero = Hero.from_template("hero_0", "warrior", template)
+    hero.base_stats["hp"] += 1
+    assert template["base_stats"]["hp"] == hero.base_stats["hp"] - 1
+    assert (hero.level, hero.hero_class, hero.name) == (1, "warrior", "Warrior")
+
+def test_level_ups_use_the_gains_of_the_class():
+    template = content.get_content().heroes["warrior"]
+    hero = Hero.from_template("hero_0", "warrior", template)
+    hero_manager.apply_level_up_stats(hero, 2)
+    for stat, gain in template["level_up_gains"].items():
+        assert hero.base_stats[stat] == template["base_stats"][stat] + 2 * gain
+
+def test_level_ups_of_classes_without_gains():
+    hero = Hero("hero_0", "Stranger", "unknown_class", base_stats={"hp": 10})
+    hero_manager.apply_level_up_stats(hero)
+    for stat, gain in hero_manager.LEVEL_UP_GAINS.items():
+        assert hero.base_stats[stat] == (10 if stat == "hp" else 0) + gain
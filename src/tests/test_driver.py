@@ -0,0 +1,33 @@
+"""
+Headless sessions for load tests (core/driver.py).
+"""
+
+import os
+
+import pytest
+
+from core.driver import Session, load_script, run_sessions
+from core.game_controller import GameController
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "scripts", "battle.json")
+
+def test_example_script_plays_without_errors():
+    report = run_sessions(2, 50, seed=3, workers=1, script=load_script(SCRIPT_PATH))
+    assert report["errors"] == 0
+    assert report["by_action"]["start_battle"]["count"] > 0
+
+def test_scripted_new_game_uses_the_session_seed(tmp_path):
+    session = Session(7, str(tmp_path / "session.sav"), [("upgrade_building", ("barracks",)), ("new_game", ())])
+    session.step()
+    session.step()
+
+    expected = GameController(str(tmp_path / "expected.sav"), persist_actions=False)
+    expected.new_game(seed=7)
+    assert session.controller.rng.getstate() == expected.rng.getstate()
+    assert session.controller.game_state.to_sections() == expected.game_state.to_sections()
+
+def test_invalid_script_entries_are_rejected(tmp_path):
+    path = tmp_path / "script.json"
+    path.write_text('[["start_battle", "goblin_encounter"], ["quit"]]')
+    with pytest.raises(ValueError, match="quit"):
+        load_script(str(path))
@@ -0,0 +1,49 @@
+"""
+Experience grants and level-ups.
+"""
+
+from core.game_controller import GameController
+from game_logic import hero_manager
+from game_logic.hero_manager import CUMULATIVE_XP, MAX_LEVEL, resolve_experience, xp_for_next_level
+
+def level_by_level(level: int, current_xp: int, xp_amount: int):
+    # The loop the cumulative table replaces
+    current_xp += xp_amount
+    while level < MAX_LEVEL and current_xp >= xp_for_next_level(level):
+        current_xp -= xp_for_next_level(level)
+        level += 1
+    return level, current_xp
+
+def test_cumulative_table():
+    assert CUMULATIVE_XP[1] == 0
+    assert CUMULATIVE_XP[2] == 100
+    assert CUMULATIVE_XP[4] == 100 + 300 + 700
+    assert len(CUMULATIVE_XP) == MAX_LEVEL + 1
+
+def test_matches_level_by_level_resolution():
+    for level, current_xp in ((1, 0), (1, 99), (2, 50), (3, 699), (7, 1234), (60, 10)):
+        for xp_amount in (0, 1, 99, 100, 1_000, 12_345, 10**6, 10**15):
+            assert resolve_experience(level, current_xp, xp_amount) == \
+                level_by_level(level, current_xp, xp_amount)
+
+def test_exact_thresholds():
+    assert resolve_experience(1, 0, 99) == (1, 99)
+    assert resolve_experience(1, 0, 100) == (2, 0)
+    assert resolve_experience(1, 0, 100 + 300 + 700) == (4, 0)
+    assert resolve_experience(1, 0, 100 + 300 + 699) == (3, 699)
+
+def test_max_level_keeps_the_rest():
+    assert resolve_experience(1, 0, CUMULATIVE_XP[MAX_LEVEL] + 5) == (MAX_LEVEL, 5)
+    assert resolve_experience(MAX_LEVEL, 5, 10) == (MAX_LEVEL, 15)
+
+def test_add_experience_applies_every_level_gained():
+    controller = GameController()
+    controller.new_game(seed=6)
+    hero = controller.game_state.mutable_hero("hero_0")
+    base_stats = dict(hero.base_stats)
+    gains = hero_manager.level_up_gains(hero.hero_class)
+
+    assert hero_manager.add_experience(hero, 100 + 300 + 700 + 50) == 3
+    assert (hero.level, hero.current_xp) == (4, 50)
+    for stat, gain in gains.items():
+        assert hero.base_stats[stat] == base_stats.get(stat, 0) + 3 * gain
@@ -0,0 +1,87 @@
+"""
+Copy-on-write snapshots of the game state and undo of base upgrades.
+"""
+
+import pytest
+
+from core.game_controller import GameController
+
+@pytest.fixture
+def controller():
+    controller = GameController()
+    controller.new_game(seed=3)
+    return controller
+
+def test_snapshot_is_isolated(controller):
+    state = controller.game_state
+    before = state.to_sections()
+    branch = state.snapshot()
+
+    branch.mutable_inventory()["gold"] = 0
+    branch.mutable_base_status()["forge"] = 5
+    branch.mutable_hero("hero_0").level += 1
+    assert state.to_sections() == before
+
+    state.mutable_inventory()["health_potion"] = 99
+    assert branch.inventory["health_potion"] == before["inventory"]["health_potion"]
+
+def test_inventory_is_read_only(controller):
+    with pytest.raises(TypeError):
+        controller.game_state.inventory["gold"] = 0
+    with pytest.raises(TypeError):
+        controller.game_state.base_status["forge"] = 1
+
+def test_undo_restores_the_state_before_the_upgrade(controller):
+    before = controller.game_state.to_sections()
+    assert controller.upgrade_building("barracks")
+    upgraded = controller.game_state.to_sections()
+    assert upgraded["base_status"]["barracks"] == 1
+    assert upgraded["inventory"]["gold"] < before["inventory"]["gold"]
+
+    assert controller.undo_upgrade()
+    assert controller.game_state.to_sections() == before
+    assert not controller.undo_upgrade()
+
+def test_undo_is_not_affected_by_later_changes(controller):
+    before = controller.game_state.to_sections()
+    assert controller.upgrade_building("barracks")
+    controller.equip_item("hero_0", "sword_basic")
+    controller.game_state.mutable_inventory()["gold"] = 0
+
+    assert controller.undo_upgrade()
+    assert controller.game_state.to_sections() == before
+
+def test_snapshot_shares_until_written(controller):
+    state = controller.game_state
+    branch = state.snapshot()
+    assert branch.heroes is state.heroes
+    assert branch.inventory_version == state.inventory_version
+
+    hero = branch.mutable_hero("hero_0")
+    assert hero is not state.heroes[0]
+    assert branch.mutable_hero("hero_0") is hero # Copied once, then owned
+    assert all(a is b for a, b in zip(branch.heroes[1:], state.heroes[1:]))
+
+    branch.mutable_inventory()
+    assert branch.inventory_version != state.inventory_version
+
+def test_snapshot_of_a_snapshot(controller):
+    state = controller.game_state
+    first = state.snapshot()
+    second = first.snapshot()
+    second.mutable_hero("hero_0").name = "Changed"
+    assert state.heroes[0].name == first.heroes[0].name != "Changed"
+
+def test_previews_leave_the_state_alone(controller):
+    before = controller.game_state.to_sections()
+    rng_state = controller.rng.getstate()
+
+    stats, equipped = controller.preview_equip("hero_0", "sword_basic")
+    assert equipped["attack"] > stats["attack"]
+
+    battle = controller.start_battle("goblin_encounter", preview=True)
+    while battle["result"] is None:
+        controller.battle_turn("attack", battle_state=battle)
+    assert controller.battle_state is None
+    assert controller.game_state.to_sections() == before
+    assert controller.rng.getstate() == rng_state
@@ -0,0 +1,50 @@
+"""
+Derived hero stats and their cache.
+"""
+
+import pytest
+
+from core.game_controller import GameController
+from game_logic import base_manager, hero_manager, item_manager
+
+@pytest.fixture
+def state():
+    controller = GameController()
+    controller.new_game(seed=4)
+    controller.game_state.mutable_inventory()["gold"] = 10_000
+    hero_manager.reset_stats_cache_info()
+    return controller.game_state
+
+def stats_of(state, hero_id="hero_0"):
+    hero = next(h for h in state.heroes if h.id == hero_id)
+    return hero_manager.calculate_hero_stats(hero, base_manager.get_base_effects(state))
+
+def test_repeated_calls_hit_the_cache(state):
+    first = stats_of(state)
+    assert stats_of(state) == first
+    assert hero_manager.get_stats_cache_info() == {"hits": 1, "misses": 1}
+
+def test_results_are_copies(state):
+    stats_of(state)["attack"] = -1
+    assert stats_of(state)["attack"] != -1
+
+def test_equipping_invalidates(state):
+    before = stats_of(state)
+    sword = item_manager.get_item_stats("sword_basic")
+    assert item_manager.apply_item(state, "hero_0", "sword_basic")
+    after = stats_of(state)
+    assert after["attack"] == before["attack"] + sword["attack"]
+    assert hero_manager.get_stats_cache_info()["misses"] == 2
+
+def test_base_upgrades_invalidate(state):
+    before = stats_of(state)
+    assert base_manager.apply_upgrade(state, "forge")
+    assert stats_of(state)["attack"] == before["attack"] + 2
+
+def test_level_ups_invalidate(state):
+    before = stats_of(state)
+    hero = state.mutable_hero("hero_0")
+    assert hero_manager.add_experience(hero, hero_manager.xp_for_next_level(hero.level)) == 1
+    after = stats_of(state)
+    assert after["hp"] > before["hp"]
+    assert after == hero_manager.calculate_hero_stats(hero.copy(), base_manager.compute_base_effects(dict(state.base_status)))
@@ -0,0 +1,66 @@
+"""
+The sorted inventory index behind the HeroScreen list, and the
+inventory versions that tell the screen when to rebuild it.
+"""
+
+import pytest
+
+from core.game_controller import GameController
+from game_logic.inventory_index import InventoryIndex
+from game_logic.item_catalog import ItemCatalog
+
+CATALOG = ItemCatalog({
+    "axe": {"name": "Axe", "slot": "weapon", "stats": {"attack": 7}},
+    "mail": {"name": "Chain Mail", "slot": "armor", "stats": {"defense": 4}},
+    "dagger": {"name": "Dagger", "slot": "weapon", "stats": {"attack": 2}},
+})
+
+@pytest.fixture
+def index():
+    return InventoryIndex({"dagger": 1, "mail": 3, "axe": 2, "gold": 50, "rope": 0}, CATALOG)
+
+def test_queries(index):
+    assert index.query() == ["axe", "mail", "dagger", "gold"]
+    assert index.query("count") == ["gold", "mail", "axe", "dagger"]
+    assert index.query("slot") == ["gold", "mail", "axe", "dagger"]
+    assert index.query(slot="weapon") == ["axe", "dagger"]
+    assert index.query(text="MAIL") == ["mail"]
+    with pytest.raises(ValueError):
+        index.query("price")
+
+def test_query_results_are_cached_until_a_change(index):
+    result = index.query("count")
+    assert index.query("count") is result
+    index.set_count("dagger", 1) # Unchanged
+    assert index.query("count") is result
+    index.set_count("dagger", 9)
+    assert index.query("count") == ["gold", "dagger", "mail", "axe"]
+
+def test_set_count_adds_and_removes_items(index):
+    index.set_count("axe", 0)
+    index.set_count("rope", 4)
+    assert index.query() == ["mail", "dagger", "gold", "rope"]
+    assert len(index) == 4
+
+def test_sync_matches_a_rebuilt_index(index):
+    inventory = {"dagger": 0, "mail": 3, "axe": 3, "gold": 50, "rope": 1}
+    index.sync(inventory, ["dagger", "axe", "rope"])
+    rebuilt = InventoryIndex(inventory, CATALOG)
+    assert index.counts == rebuilt.counts
+    for sort in ("name", "count", "slot"):
+        assert index.query(sort) == rebuilt.query(sort)
+
+def test_inventory_versions_mark_changes():
+    controller = GameController()
+    controller.new_game(seed=8)
+    seen = {controller.game_state.inventory_version}
+
+    controller.upgrade_building("barracks") # Pays gold
+    assert controller.game_state.inventory_version not in seen
+    seen.add(controller.game_state.inventory_version)
+
+    controller.undo_upgrade() # Back to the earlier inventory and its version
+    assert controller.game_state.inventory_version in seen
+
+    controller.new_game(seed=8)
+    assert controller.game_state.inventory_version not in seen
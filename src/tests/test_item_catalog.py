@@ -0,0 +1,67 @@
+"""
+The item catalog, its indexes and its binary cache.
+"""
+
+import json
+import os
+
+import pytest
+
+from core.game_controller import GameController
+from game_logic import item_manager
+from game_logic.item_catalog import ItemCatalog
+
+ITEMS = {
+    "dagger": {"name": "Dagger", "slot": "weapon", "stats": {"attack": 2}},
+    "axe": {"name": "Axe", "slot": "weapon", "stats": {"attack": 7},
+            "unlock": {"building": "forge", "level": 2}},
+    "mail": {"name": "Mail", "slot": "armor", "stats": {"defense": 4, "attack": 1},
+             "unlock": {"building": "forge", "level": 1}},
+}
+
+@pytest.fixture
+def items_path(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(ITEMS))
+    return str(path)
+
+def test_indexes():
+    catalog = ItemCatalog(ITEMS)
+    assert catalog.by_slot("weapon") == ["axe", "dagger"]
+    assert catalog.with_stat_above("attack", 1) == ["dagger", "axe"]
+    assert catalog.with_stat_above("attack", 0, slot="armor") == ["mail"]
+    assert catalog.unlocked_by("forge", 1) == ["mail"]
+    assert catalog.unlocked_at("forge", 2) == ["axe"]
+    assert sorted(catalog.unlocked_items({"forge": 2, "barracks": 1})) == ["axe", "mail"]
+
+def test_cache_is_written_and_reused(items_path, tmp_path, monkeypatch):
+    first = ItemCatalog.load(items_path)
+    assert sorted(os.listdir(tmp_path)) == ["items.cache", "items.json"]
+
+    def no_json(*args, **kwargs):
+        raise AssertionError("items.json parsed despite a valid cache")
+    monkeypatch.setattr(json, "load", no_json)
+    cached = ItemCatalog.load(items_path)
+    assert cached.items == first.items
+    assert cached.with_stat_above("attack", 1) == first.with_stat_above("attack", 1)
+
+def test_cache_is_rebuilt_when_the_items_change(items_path):
+    ItemCatalog.load(items_path)
+    with open(items_path, 'w') as f:
+        json.dump(dict(ITEMS, ring={"name": "Ring", "slot": "accessory", "stats": {}}), f)
+    assert "ring" in ItemCatalog.load(items_path)
+
+def test_corrupt_cache_is_ignored(items_path, tmp_path):
+    (tmp_path / "items.cache").write_bytes(b"not marshal data")
+    assert len(ItemCatalog.load(items_path)) == len(ITEMS)
+
+def test_unlock_requirement_blocks_equipping():
+    controller = GameController()
+    controller.new_game(seed=5)
+    state = controller.game_state
+    state.mutable_inventory()["steel_sword"] = 1
+    hero = state.heroes[0]
+    assert not item_manager.can_equip_item(state, hero, "steel_sword")
+    state.mutable_base_status()["forge"] = 1
+    assert item_manager.can_equip_item(state, hero, "steel_sword")
+    assert not item_manager.can_equip_item(state, hero, "no_such_item")
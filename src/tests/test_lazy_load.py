@@ -0,0 +1,82 @@
+"""
+Lazy loading of sectioned saves, and the conversion of plain JSON
+saves of older versions.
+"""
+
+import json
+import os
+
+import pytest
+
+from core import serializers
+from core.game_controller import SAVE_PATH, GameController
+from core.save_engine import SaveEngine
+
+def make_save(save_path: str) -> dict:
+    controller = GameController(save_path, persist_actions=True)
+    controller.new_game(seed=5)
+    controller.upgrade_building("forge")
+    controller.save_game(wait=True)
+    controller.shutdown()
+    return controller.game_state.to_sections()
+
+def game_data(sections: dict) -> dict:
+    # Everything but the bookkeeping (a conversion saves at a new checkpoint)
+    return {name: value for name, value in sections.items() if name != "meta"}
+
+def test_default_save_is_sectioned():
+    assert not serializers.is_plain_json_path(SAVE_PATH)
+
+@pytest.mark.parametrize("backend", serializers.available_backends())
+def test_sav_snapshots_are_sectioned_with_every_backend(tmp_path, backend):
+    filepath = str(tmp_path / "savegame.sav")
+    data = {"heroes": [{"id": "hero_0", "is_active": True}, {"id": "hero_1", "is_active": False}],
+            "inventory": {"gold": 5}, "base_status": {"forge": 1}, "meta": {}}
+    engine = SaveEngine(filepath, serializer=serializers.get_serializer(backend))
+    engine.save(data)
+    with open(filepath, 'rb') as f:
+        assert f.readline() == f"TUISAVE {backend} sections\n".encode("ascii")
+    assert SaveEngine(filepath).load() == data
+
+def test_json_saves_stay_plain_json(tmp_path):
+    save_path = str(tmp_path / "savegame.json")
+    saved = make_save(save_path)
+    with open(save_path) as f:
+        assert json.load(f) == saved
+
+def test_load_decodes_the_rest_in_the_background(tmp_path):
+    save_path = str(tmp_path / "savegame.sav")
+    saved = make_save(save_path)
+
+    controller = GameController(save_path)
+    assert controller.load_game()
+    assert controller.game_state.base_status == saved["base_status"]
+    assert [h.id for h in controller.game_state.active_heroes] == [h["id"] for h in saved["heroes"]]
+    controller.game_state.finish_loading()
+    assert not controller.game_state.is_loading
+    assert controller.game_state.to_sections() == saved
+    controller.shutdown()
+
+def test_json_save_of_an_older_version_is_converted(tmp_path):
+    legacy_path = str(tmp_path / "savegame.json")
+    saved = make_save(legacy_path)
+    with open(legacy_path, 'rb') as f:
+        legacy = f.read()
+
+    save_path = str(tmp_path / "savegame.sav")
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    controller.shutdown()
+    assert game_data(controller.game_state.to_sections()) == game_data(saved)
+
+    with open(save_path, 'rb') as f:
+        assert f.read().startswith(b"TUISAVE ")
+    with open(legacy_path, 'rb') as f:
+        assert f.read() == legacy
+
+    # From now on the converted save is loaded
+    os.remove(legacy_path)
+    controller = GameController(save_path)
+    assert controller.load_game()
+    assert game_data(controller.game_state.to_sections()) == game_data(saved)
+    controller.shutdown()
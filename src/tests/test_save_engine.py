@@ -0,0 +1,65 @@
+"""
+The incremental save engine: journal records, compaction and
+recovery from torn writes.
+"""
+
+import os
+
+import pytest
+
+from core.save_engine import SaveEngine
+
+SECTIONS = {
+    "heroes": [{"id": "hero_0", "level": 1}],
+    "inventory": {"sword_basic": 1},
+    "base_status": {"barracks": 0},
+    "meta": {"version": 1},
+}
+
+@pytest.fixture
+def save_path(tmp_path):
+    return str(tmp_path / "savegame.sav")
+
+def test_only_changed_sections_are_journaled(save_path):
+    engine = SaveEngine(save_path)
+    assert engine.save(SECTIONS) == list(SECTIONS)
+    assert not os.path.exists(engine.journal_path)
+
+    assert engine.save(dict(SECTIONS, base_status={"barracks": 1})) == ["base_status"]
+    assert engine.save(dict(SECTIONS, base_status={"barracks": 1})) == []
+    with open(engine.journal_path, 'rb') as f:
+        assert f.read().count(b"\n") == 1
+
+    assert SaveEngine(save_path).load()["base_status"] == {"barracks": 1}
+
+def test_compaction_folds_the_journal_into_the_snapshot(save_path):
+    engine = SaveEngine(save_path, compact_after=3)
+    engine.save(SECTIONS)
+    for level in range(1, 4):
+        engine.save(dict(SECTIONS, base_status={"barracks": level}))
+    engine.wait_for_compaction()
+
+    assert not os.path.exists(engine.journal_path + ".old")
+    assert SaveEngine(save_path).load()["base_status"] == {"barracks": 3}
+
+def test_torn_journal_record_is_dropped(save_path):
+    engine = SaveEngine(save_path)
+    engine.save(SECTIONS)
+    engine.save(dict(SECTIONS, inventory={"sword_basic": 2}))
+    with open(engine.journal_path, 'ab') as f:
+        f.write(b'{"inventory": {"sword_ba')
+
+    data = SaveEngine(save_path).load()
+    assert data["inventory"] == {"sword_basic": 2}
+    assert not os.path.exists(engine.journal_path)
+
+def test_snapshot_writes_leave_no_temp_files(save_path, tmp_path):
+    engine = SaveEngine(save_path, compact_after=1)
+    engine.save(SECTIONS)
+    engine.save(dict(SECTIONS, meta={"version": 2}))
+    engine.wait_for_compaction()
+    assert sorted(os.listdir(tmp_path)) == ["savegame.sav"]
+
+def test_missing_snapshot(save_path):
+    with pytest.raises(FileNotFoundError):
+        SaveEngine(save_path).load()
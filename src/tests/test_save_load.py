@@ -0,0 +1,101 @@
+"""
+Round trips of the game state through save files, and loading of
+saves that cannot be read.
+"""
+
+import pytest
+
+from core.game_controller import ACTION_LOG_SUFFIX, GameController
+from game_logic.content import get_content
+
+@pytest.fixture(params=["savegame.json", "savegame.sav"])
+def save_path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+def play_and_save(save_path: str) -> GameController:
+    controller = GameController(save_path, persist_actions=True)
+    controller.new_game(seed=1)
+    controller.upgrade_building("barracks")
+    controller.equip_item("hero_0", "sword_basic")
+    controller.save_game(wait=True)
+    controller.shutdown()
+    return controller
+
+def test_round_trip(save_path):
+    saved = play_and_save(save_path).game_state.to_sections()
+
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    assert controller.game_state.to_sections() == saved
+    controller.shutdown()
+
+def test_unsaved_actions_are_recovered(save_path):
+    controller = play_and_save(save_path)
+    # Crash after an action that was logged but never saved
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    controller.upgrade_building("forge")
+    expected = controller.game_state.to_sections()
+    controller.action_log.close()
+
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    assert controller.game_state.base_status == expected["base_status"]
+    controller.shutdown()
+
+def test_missing_save(save_path):
+    controller = GameController(save_path, persist_actions=True)
+    assert not controller.load_game()
+    controller.shutdown()
+
+def test_corrupt_save_is_left_unchanged(save_path):
+    play_and_save(save_path)
+    with open(save_path, 'rb') as f:
+        data = f.read()
+    with open(save_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with open(save_path, 'rb') as f:
+        corrupt = f.read()
+    with open(save_path + ACTION_LOG_SUFFIX, 'rb') as f:
+        actions = f.read()
+
+    controller = GameController(save_path, persist_actions=True)
+    assert not controller.load_game()
+    assert controller.game_state.to_sections()["heroes"] == []
+    controller.shutdown()
+
+    with open(save_path, 'rb') as f:
+        assert f.read() == corrupt
+    with open(save_path + ACTION_LOG_SUFFIX, 'rb') as f:
+        assert f.read() == actions
+
+def test_failed_replay_keeps_the_unsaved_actions(save_path, monkeypatch):
+    play_and_save(save_path)
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    battle_state = controller.start_battle("goblin_encounter")
+    while battle_state["result"] is None:
+        controller.battle_turn("attack")
+    assert battle_state["granted_rewards"]
+    expected = controller.game_state.to_sections()
+    controller.action_log.close() # Crash
+    with open(save_path + ACTION_LOG_SUFFIX, 'rb') as f:
+        actions = f.read()
+
+    # The encounter of the unsaved battle is gone from the content
+    encounters = dict(get_content().encounters)
+    del encounters["goblin_encounter"]
+    monkeypatch.setattr(get_content(), "encounters", encounters)
+    controller = GameController(save_path, persist_actions=True)
+    assert not controller.load_game()
+    controller.shutdown()
+    with open(save_path + ACTION_LOG_SUFFIX, 'rb') as f:
+        assert f.read() == actions
+
+    # With the encounter back, the next attempt recovers them
+    monkeypatch.undo()
+    controller = GameController(save_path, persist_actions=True)
+    assert controller.load_game()
+    assert controller.game_state.to_sections()["heroes"] == expected["heroes"]
+    assert controller.game_state.inventory["gold"] == expected["inventory"]["gold"]
+    controller.shutdown()
@@ -0,0 +1,49 @@
+"""
+Upgrade planning over base_manager.UPGRADE_COSTS.
+"""
+
+import pytest
+
+from game_logic import upgrade_planner
+from game_logic.upgrade_planner import UpgradeGraph, affordable_upgrades, cheapest_path
+
+@pytest.fixture(autouse=True)
+def fresh_planner():
+    upgrade_planner.reset_upgrade_graph()
+    yield
+    upgrade_planner.reset_upgrade_graph()
+
+def test_cheapest_path_includes_missing_prerequisites():
+    path, cost = cheapest_path({}, "forge", 2)
+    assert path.index(("barracks", 1)) < path.index(("barracks", 2)) < path.index(("forge", 2))
+    assert path.index(("forge", 1)) < path.index(("forge", 2))
+    assert cost == {"gold": 100 + 500 + 150 + 400}
+
+def test_cheapest_path_skips_built_levels():
+    assert cheapest_path({"barracks": 2, "forge": 1}, "forge", 2) == ([("forge", 2)], {"gold": 400})
+    assert cheapest_path({"forge": 2}, "forge", 2) == ([], {})
+    assert cheapest_path({}, "forge", 3) is None
+
+def test_affordable_upgrades_buys_the_cheapest_first():
+    assert affordable_upgrades({}, {"gold": 300}) == [("barracks", 1), ("forge", 1)]
+    assert affordable_upgrades({}, {"gold": 750}) == [("barracks", 1), ("forge", 1), ("barracks", 2)]
+    assert affordable_upgrades({"barracks": 2, "forge": 1}, {"gold": 399}) == []
+
+def test_queries_ignore_unrelated_inventory():
+    affordable_upgrades({}, {"gold": 300})
+    result = affordable_upgrades({"tavern": 4}, {"gold": 300, "sword_basic": 2})
+    assert result == [("barracks", 1), ("forge", 1)]
+    assert upgrade_planner._affordable_upgrades.cache_info().hits == 1
+
+def test_results_are_copies():
+    cheapest_path({}, "barracks", 2)[0].append(("forge", 1))
+    assert cheapest_path({}, "barracks", 2)[0] == [("barracks", 1), ("barracks", 2)]
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="Unknown upgrade"):
+        UpgradeGraph({"forge": {1: {"requires": {"barracks": 1}}}})
+    with pytest.raises(ValueError, match="cycle"):
+        UpgradeGraph({
+            "forge": {1: {"requires": {"barracks": 1}}},
+            "barracks": {1: {"requires": {"forge": 1}}},
+        })
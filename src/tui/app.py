@@ -4,19 +4,42 @@ app.py
 The main Textual App class for the TUI game.
 This class is the entry point for the Textual framework and manages
 the different screens.
+
+Screens are registered by name (SCREENS). A screen module is imported
+when its screen is first shown, and the screen instance stays installed
+after it is popped, so switching back to it neither re-imports nor
+recomposes anything. Screens refresh their data in on_screen_resume.
 """
 
-from textual.app import App, ComposeResult
+import importlib
+from typing import Callable, Optional
 
-# Import screens
-from tui.screens.main_menu import MainMenuScreen
-# from tui.screens.hero_screen import HeroScreen
-# from tui.screens.base_screen import BaseScreen
-# from tui.screens.battle_screen import BattleScreen
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.screen import Screen
 
 # Import the core logic
 from core.game_controller import GameController
 
+# Screen name -> (module, class) of the screens the app can show
+SCREEN_MODULES = {
+    "main_menu": ("tui.screens.main_menu", "MainMenuScreen"),
+    "base": ("tui.screens.base_screen", "BaseScreen"),
+    "heroes": ("tui.screens.hero_screen", "HeroScreen"),
+    "battle": ("tui.screens.battle_screen", "BattleScreen"),
+    "metrics": ("tui.screens.metrics_screen", "MetricsScreen"),
+}
+
+def _lazy_screen(module_name: str, class_name: str) -> Callable[[], Screen]:
+    """
+    A screen factory that imports the screen's module on first call.
+    Textual calls it once and keeps the instance installed.
+    """
+    def create() -> Screen:
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)()
+    return create
+
 class GameApp(App):
     """
     The main TUI application class.
@@ -24,9 +47,14 @@ class GameApp(App):
 
     # CSS_PATH = "main.tcss" # Future styling
 
-    def __init__(self, *args, **kwargs):
+    SCREENS = {name: _lazy_screen(*target) for name, target in SCREEN_MODULES.items()}
+
+    # Hidden debug overlay with the game rule metrics
+    BINDINGS = [Binding("f12", "show_metrics", "Metrics", show=False)]
+
+    def __init__(self, *args, controller: Optional[GameController] = None, **kwargs):
         super().__init__(*args, **kwargs)
-        self.controller = GameController() # Initialize the game controller
+        self.controller = controller or GameController() # Initialize the game controller
         # print("GameApp initialized (stub).")
 
     def compose(self) -> ComposeResult:
@@ -43,8 +71,12 @@ class GameApp(App):
         Called by Textual when the app is first mounted.
         This is the correct place to push the initial screen.
         """
-        self.push_screen(MainMenuScreen())
+        self.push_screen("main_menu")
         # print("Stub: App mounted. Pushing initial screen (e.g., MainMenuScreen).")
 
+    def action_show_metrics(self) -> None:
+        if self.screen is not self.get_screen("metrics"):
+            self.push_screen("metrics")
+
 # This file is not run directly.
-# It is imported by main.py which then calls .run()
\ No newline at end of file
+# It is imported by main.py which then calls .run()
@@ -0,0 +1,71 @@
+"""
+battle_feed.py
+
+Buffers battle events between screen repaints.
+
+Battle turns can be played much faster than a terminal repaints
+(auto-battle, skip-to-end). BattleFeed collects the results of any
+number of turns and hands them to the screen once per frame:
+  - HP updates are coalesced per combatant (only the latest value counts)
+  - log lines are kept up to a limit; older ones are dropped and counted
+so the work of one repaint does not grow with the number of turns played.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+# Log lines kept between two flushes (a full screen of log is enough)
+MAX_PENDING_LINES = 200
+
+class BattleFeed:
+    """
+    Pending display changes of one battle.
+    """
+
+    def __init__(self, max_pending_lines: int = MAX_PENDING_LINES):
+        self._hp: Dict[Any, int] = {} # combatant id -> latest hp
+        self._lines: Deque[str] = deque(maxlen=max_pending_lines)
+        self._dropped = 0
+        self._names: Dict[Any, str] = {}
+
+    def start(self, battle_state: Dict[str, Any]):
+        """
+        Learns the names of the combatants of a battle.
+        """
+        for combatant in battle_state["heroes"] + battle_state["enemies"]:
+            self._names[combatant["id"]] = combatant.get("name", str(combatant["id"]))
+
+    def push_turn(self, battle_state: Dict[str, Any]):
+        """
+        Records the events of the turn just played (battle_state["events"]).
+        """
+        for event in battle_state.get("events", []):
+            defender_id = event["defender_id"]
+            self._hp[defender_id] = event["defender_hp_remaining"]
+            self.push_line(
+                f"{self._names.get(event['attacker_id'], event['attacker_id'])} hits "
+                f"{self._names.get(defender_id, defender_id)} for {event['damage_dealt']} "
+                f"({event['defender_hp_remaining']} HP left)"
+            )
+        if battle_state.get("result"):
+            self.push_line(f"Battle over: {battle_state['result']}!")
+
+    def push_line(self, line: str):
+        if len(self._lines) == self._lines.maxlen:
+            self._dropped += 1
+        self._lines.append(line)
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._hp or self._lines)
+
+    def drain(self) -> Tuple[Dict[Any, int], List[str], int]:
+        """
+        Returns and clears the pending changes:
+        (combatant id -> hp, log lines, number of log lines dropped before them).
+        """
+        hp, self._hp = self._hp, {}
+        lines = list(self._lines)
+        self._lines.clear()
+        dropped, self._dropped = self._dropped, 0
+        return hp, lines, dropped
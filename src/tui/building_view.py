@@ -0,0 +1,169 @@
+"""
+building_view.py
+
+A virtualized list of the base's buildings for the TUI.
+
+Like InventoryView, it is a single line-API widget that renders only
+the rows visible in its window (render_line), so mounting it costs the
+same for 2 buildings or 2000. It keeps the levels it shows and diffs
+them against the base status: an upgrade repaints one line.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from game_logic.upgrade_planner import get_upgrade_graph
+
+class BuildingView(ScrollView, can_focus=True):
+    """
+    Shows one line per building: its level and the cost of the next level.
+    Click a line (or press Enter on the cursor's line) to upgrade it.
+    """
+    DEFAULT_CSS = """
+    BuildingView {
+        height: 1fr;
+    }
+    """
+
+    BINDINGS = [
+        Binding("enter", "upgrade", "Upgrade"),
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+    ]
+
+    cursor = reactive(0, always_update=True)
+
+    # Line width of the virtual canvas
+    LINE_WIDTH = 80
+
+    class UpgradeRequested(Message):
+        """
+        Posted when the player asks to upgrade a building.
+        """
+        def __init__(self, building: str):
+            super().__init__()
+            self.building = building
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._buildings: List[str] = []
+        self._lines: Dict[str, int] = {} # building -> line
+        self._levels: Dict[str, int] = {} # building -> level shown
+
+    def __len__(self) -> int:
+        return len(self._buildings)
+
+    def show(self, base_status: Mapping[str, int], changed: Optional[Iterable[str]] = None):
+        """
+        Brings the lines in line with base_status.
+        changed: the buildings known to have changed (e.g., after an
+        upgrade); only their lines are checked. By default every building
+        is compared, but still only lines that differ are repainted.
+        """
+        if changed is not None and all(b in self._lines and b in base_status for b in changed):
+            self._update_levels(base_status, changed)
+            return
+        buildings = list(base_status)
+        if buildings == self._buildings:
+            self._update_levels(base_status, buildings)
+            return
+
+        # Buildings were added or removed: new lines, same selected building
+        selected = self.selected_building
+        self._buildings = buildings
+        self._lines = {building: line for line, building in enumerate(buildings)}
+        self._levels = dict(base_status)
+        self.virtual_size = Size(self.LINE_WIDTH, len(buildings))
+        cursor = self._lines.get(selected, 0) if selected is not None else 0
+        self.cursor = min(cursor, max(len(buildings) - 1, 0))
+        self.refresh()
+
+    def _update_levels(self, base_status: Mapping[str, int], buildings: Iterable[str]):
+        for building in buildings:
+            level = base_status[building]
+            if self._levels[building] != level:
+                self._levels[building] = level
+                self.refresh_lines(self._lines[building])
+
+    @property
+    def selected_building(self) -> Optional[str]:
+        if 0 <= self.cursor < len(self._buildings):
+            return self._buildings[self.cursor]
+        return None
+
+    def select(self, building: str):
+        """
+        Moves the cursor to a building's line (if it is listed).
+        """
+        if building in self._lines:
+            self.cursor = self._lines[building]
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line = scroll_y + y
+        width = self.size.width
+        if line >= len(self._buildings):
+            return Strip.blank(width, self.rich_style)
+
+        building = self._buildings[line]
+        level = self._levels[building]
+        text = f"[{building.capitalize()} - Lvl {level}]"
+        graph = get_upgrade_graph()
+        node = graph.next_level(building, {building: level})
+        if node is None:
+            text += " (max level)"
+        else:
+            cost = ", ".join(f"{amount} {resource}" for resource, amount in graph.costs[node].items())
+            text += f" (next: {cost or 'free'})  <Upgrade>"
+        style = self.rich_style
+        if line == self.cursor and self.has_focus:
+            style += Style(reverse=True)
+        strip = Strip([Segment(text, style)])
+        return strip.crop_extend(scroll_x, scroll_x + width, style)
+
+    def watch_cursor(self, old_cursor: int, cursor: int) -> None:
+        if not self._buildings:
+            return
+        # Repaint just the two affected lines and keep the cursor in view
+        self.refresh_lines(old_cursor)
+        self.refresh_lines(cursor)
+        self.scroll_to_region(Region(0, cursor, 1, 1), animate=False, immediate=True)
+
+    def on_focus(self) -> None:
+        self.refresh_lines(self.cursor)
+
+    def on_blur(self) -> None:
+        self.refresh_lines(self.cursor)
+
+    def action_upgrade(self) -> None:
+        building = self.selected_building
+        if building is not None:
+            self.post_message(self.UpgradeRequested(building))
+
+    def action_cursor_up(self) -> None:
+        self.cursor = max(self.cursor - 1, 0)
+
+    def action_cursor_down(self) -> None:
+        self.cursor = min(self.cursor + 1, max(len(self._buildings) - 1, 0))
+
+    def action_page_up(self) -> None:
+        self.cursor = max(self.cursor - max(self.size.height - 1, 1), 0)
+
+    def action_page_down(self) -> None:
+        self.cursor = min(self.cursor + max(self.size.height - 1, 1), max(len(self._buildings) - 1, 0))
+
+    def on_click(self, event) -> None:
+        line = self.scroll_offset.y + event.y
+        if 0 <= line < len(self._buildings):
+            self.cursor = line
+            self.action_upgrade()
@@ -0,0 +1,125 @@
+"""
+inventory_view.py
+
+A virtualized list of inventory items for the TUI.
+
+The view is a single line-API widget: it renders only the rows that
+are visible in its window (render_line), never one widget per item, so
+mounting it and scrolling it cost the same for 10 items or 100k.
+Sorting and filtering are done by game_logic.inventory_index.
+"""
+
+from typing import List, Optional
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from game_logic.inventory_index import InventoryIndex
+
+class InventoryView(ScrollView, can_focus=True):
+    """
+    Shows the items of an InventoryIndex query, one line each, with a
+    cursor (up/down/page keys or click) selecting an item.
+    """
+    DEFAULT_CSS = """
+    InventoryView {
+        height: 1fr;
+    }
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+    ]
+
+    cursor = reactive(0, always_update=True)
+
+    # Name column width
+    NAME_WIDTH = 28
+
+    class Selected(Message):
+        """
+        Posted when the cursor moves to another item.
+        """
+        def __init__(self, item_id: Optional[str]):
+            super().__init__()
+            self.item_id = item_id
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index: Optional[InventoryIndex] = None
+        self._item_ids: List[str] = []
+
+    def show(self, index: InventoryIndex, item_ids: List[str]):
+        """
+        Displays item_ids (e.g., index.query(...)), keeping the selected
+        item under the cursor if it is still listed.
+        """
+        selected = self.selected_item
+        self._index = index
+        self._item_ids = item_ids
+        self.virtual_size = Size(self.NAME_WIDTH + 12, len(item_ids))
+        cursor = 0
+        if selected is not None and selected in index.counts:
+            try:
+                cursor = item_ids.index(selected)
+            except ValueError:
+                pass
+        self.cursor = min(cursor, max(len(item_ids) - 1, 0))
+        self.refresh()
+
+    @property
+    def selected_item(self) -> Optional[str]:
+        if 0 <= self.cursor < len(self._item_ids):
+            return self._item_ids[self.cursor]
+        return None
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        row = scroll_y + y
+        width = self.size.width
+        if self._index is None or row >= len(self._item_ids):
+            return Strip.blank(width, self.rich_style)
+
+        item_id = self._item_ids[row]
+        name = self._index.display_name(item_id)[:self.NAME_WIDTH]
+        text = f"{name:<{self.NAME_WIDTH}} x{self._index.counts.get(item_id, 0)}"
+        style = self.rich_style
+        if row == self.cursor:
+            style += Style(reverse=True)
+        strip = Strip([Segment(text, style)])
+        return strip.crop_extend(scroll_x, scroll_x + width, style)
+
+    def watch_cursor(self, old_cursor: int, cursor: int) -> None:
+        if not self._item_ids:
+            return
+        # Repaint just the two affected lines and keep the cursor in view
+        self.refresh_lines(old_cursor)
+        self.refresh_lines(cursor)
+        self.scroll_to_region(Region(0, cursor, 1, 1), animate=False, immediate=True)
+        self.post_message(self.Selected(self.selected_item))
+
+    def action_cursor_up(self) -> None:
+        self.cursor = max(self.cursor - 1, 0)
+
+    def action_cursor_down(self) -> None:
+        self.cursor = min(self.cursor + 1, max(len(self._item_ids) - 1, 0))
+
+    def action_page_up(self) -> None:
+        self.cursor = max(self.cursor - max(self.size.height - 1, 1), 0)
+
+    def action_page_down(self) -> None:
+        self.cursor = min(self.cursor + max(self.size.height - 1, 1), max(len(self._item_ids) - 1, 0))
+
+    def on_click(self, event) -> None:
+        row = self.scroll_offset.y + event.y
+        if 0 <= row < len(self._item_ids):
+            self.cursor = row
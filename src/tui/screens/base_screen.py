@@ -4,18 +4,36 @@ base_screen.py
 Implements the Textual Screen for the base management view.
 This UI allows the player to see their base status and interact
 with upgrades.
+
+The buildings are listed by a virtualized BuildingView (see
+tui/building_view.py): mounting the screen costs the same for any size
+of base, and refreshing it diffs the base status against the levels
+shown, so an upgrade repaints a single line.
+
+Right after a lazy load the inventory is still being read in the
+background; the gold is shown once it is there, so opening the screen
+never waits for the rest of the save.
 """
 
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button
-from textual.containers import VerticalScroll
+from textual.containers import Vertical
 from textual.app import ComposeResult
+from textual.timer import Timer
 # Import TYPE_CHECKING for type hinting GameApp
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from tui.building_view import BuildingView
+from utils.logger import get_logger
 
 if TYPE_CHECKING:
     from tui.app import GameApp
 
+log = get_logger(__name__)
+
+# Seconds between checks whether a lazy load has finished
+LOAD_POLL_INTERVAL = 0.1
+
 class BaseScreen(Screen):
     """
     The screen for managing the player's base.
@@ -25,6 +43,17 @@ class BaseScreen(Screen):
     """
     app: "GameApp"
 
+    DEFAULT_CSS = """
+    #base_layout {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Polls for the end of a lazy load while the gold is not shown yet
+        self._load_timer: Optional[Timer] = None
+
     def compose(self) -> ComposeResult:
         """
         Create the child widgets for the base screen.
@@ -32,79 +61,78 @@ class BaseScreen(Screen):
         """
         yield Header(name="My Base")
 
-        with VerticalScroll(id="base_layout"):
+        with Vertical(id="base_layout"):
             yield Static("Base Management Screen")
+            yield Static("", id="base_resources")
             yield Static("Current Upgrades:", id="upgrades_header")
-            # --- Upgrade list will be mounted here dynamically ---
+            yield Static("No buildings yet.", id="no_buildings")
+            yield BuildingView(id="upgrade_list")
 
-            yield Button("Upgrade Barracks (Stub)", id="btn_upgrade_barracks")
             yield Button("Return to Main Menu", id="btn_main_menu")
 
         yield Footer()
 
     def on_mount(self) -> None:
         """
-        Called when the screen is mounted. Loads the current base status
-        and dynamically creates widgets to display it.
+        Called when the screen is mounted. Shows the current base status.
         """
-        print("BaseScreen mounted.")
-        # Access the base_status from the game state via the controller
-        base_status = self.app.controller.game_state.base_status
-        base_layout = self.query_one("#base_layout", VerticalScroll)
+        log.debug("BaseScreen mounted.")
+        self.refresh_base_display()
 
-        print(f"Loading base status: {base_status}") # Debug print
+    def on_screen_resume(self) -> None:
+        """
+        The base may have changed while another screen was shown.
+        """
+        self.refresh_base_display()
 
-        if not base_status:
-             base_layout.mount(Static("No buildings yet.", classes="upgrade_item"))
-        else:
-            # Dynamically mount Static widgets for each building
-            # Mount them after the header
-            for building, level in base_status.items():
-                upgrade_widget = Static(
-                    f"[{building.capitalize()} - Lvl {level}]",
-                    classes="upgrade_item"
-                )
-                base_layout.mount(upgrade_widget, after="#upgrades_header")
+    def refresh_base_display(self, changed: Optional[Iterable[str]] = None) -> None:
+        """
+        Brings the building list in line with the current base status.
+        changed: the buildings known to have changed (e.g., after an
+        upgrade); only their lines are checked. By default every building
+        is compared, but still only lines that differ are repainted.
+        """
+        game_state = self.app.controller.game_state
+        buildings = self.query_one("#upgrade_list", BuildingView)
+        buildings.show(game_state.base_status, changed)
+        self.query_one("#no_buildings", Static).display = not len(buildings)
+        self.refresh_resources()
 
-        # Future: Potentially update button text/state based on game_state
+    def refresh_resources(self) -> None:
+        """
+        Shows the gold, or a placeholder while the inventory of a lazily
+        loaded save is still on its way (checked again every
+        LOAD_POLL_INTERVAL seconds until it is there).
+        """
+        game_state = self.app.controller.game_state
+        resources = self.query_one("#base_resources", Static)
+        if game_state.is_loading:
+            resources.update("Gold: loading...")
+            if self._load_timer is None:
+                self._load_timer = self.set_interval(LOAD_POLL_INTERVAL, self.refresh_resources)
+            return
+        if self._load_timer is not None:
+            self._load_timer.stop()
+            self._load_timer = None
+        resources.update(f"Gold: {game_state.inventory.get('gold', 0)}")
+
+    def on_building_view_upgrade_requested(self, event: BuildingView.UpgradeRequested) -> None:
+        """
+        Upgrades a building through the controller.
+        """
+        success = self.app.controller.upgrade_building(event.building)
+        if success:
+            # Refresh the specific line (and the resources)
+            self.refresh_base_display(changed=[event.building])
+        else:
+            # Show feedback (e.g., notification)
+            self.notify(f"Cannot upgrade {event.building} yet.", severity="warning")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
         Handle button press events.
         """
-        if event.button.id == "btn_upgrade_barracks":
-            print("Stub: 'Upgrade Barracks' button pressed.")
-            # Future: Call controller to handle logic
-            # building_id = "barracks" # Or determine dynamically
-            # success = self.app.controller.upgrade_building(building_id)
-            # if success:
-            #     # Refresh the screen or update the specific widget
-            #     self.refresh_base_display() # Needs implementation
-            # else:
-            #     # Show feedback (e.g., notification)
-            #     pass
-
-        elif event.button.id == "btn_main_menu":
+        if event.button.id == "btn_main_menu":
             # print("Stub: 'Return to Main Menu' button pressed.")
             # Pop screen to return to the previous one (MainMenuScreen)
             self.app.pop_screen()
-
-    # Helper method example (for future use when upgrades happen)
-    # def refresh_base_display(self) -> None:
-    #     """
-    #     Clears and re-populates the base upgrade list.
-    #     """
-    #     base_layout = self.query_one("#base_layout", VerticalScroll)
-    #     # Remove old upgrade items
-    #     for widget in base_layout.query(".upgrade_item"):
-    #         widget.remove()
-    #
-    #     # Re-mount current status (similar to on_mount logic)
-    #     base_status = self.app.controller.game_state.base_status
-    #     if not base_status:
-    #          base_layout.mount(Static("No buildings yet.", classes="upgrade_item"))
-    #     else:
-    #         for building, level in base_status.items():
-    #              upgrade_widget = Static(f"[{building.capitalize()} - Lvl {level}]", classes="upgrade_item")
-    #              base_layout.mount(upgrade_widget, after="#upgrades_header")
-    #     print("Base display refreshed.")
\ No newline at end of file
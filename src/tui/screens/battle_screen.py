@@ -4,70 +4,240 @@ battle_screen.py
 Implements the Textual Screen for the combat view.
 This UI displays the hero team, the enemies, and the actions
 that can be taken during a battle.
+
+Turns are played through the GameController; their results go into a
+BattleFeed (see tui/battle_feed.py) that is flushed to the widgets at
+most FRAME_RATE times per second. Auto-battle and skip-to-end
+therefore run at simulation speed, not at repaint speed; both play
+their turns in a worker that yields to the UI every frame.
 """
 
+import asyncio
+import time
+
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button
+from textual.widgets import Header, Footer, Static, Button, RichLog
 from textual.containers import Vertical, Horizontal
 from textual.app import ComposeResult
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from tui.battle_feed import BattleFeed
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from tui.app import GameApp
+
+log = get_logger(__name__)
 
-# from core.game_controller import GameController
+# Encounter fought when the screen is opened without one
+DEFAULT_ENCOUNTER = "goblin_encounter"
+
+# Repaints per second while a battle produces events
+FRAME_RATE = 30
+
+# Share of a frame auto-battle spends playing turns before yielding to the UI
+AUTO_TURN_BUDGET = 0.8 / FRAME_RATE
+
+# Turns after which skip-to-end gives up on a battle that does not end
+MAX_SKIP_TURNS = 10_000
 
 class BattleScreen(Screen):
     """
     The screen for handling combat.
     """
+    app: "GameApp"
+
+    DEFAULT_CSS = """
+    #battle_layout {
+        height: auto;
+    }
+    #hero_pane, #enemy_pane {
+        height: auto;
+    }
+    #battle_log {
+        height: 1fr;
+    }
+    #action_bar {
+        height: auto;
+    }
+    #action_bar Button {
+        min-width: 10;
+    }
+    """
+
+    def __init__(self, encounter_id: str = DEFAULT_ENCOUNTER, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.encounter_id = encounter_id
+        self.battle_state: Optional[Dict[str, Any]] = None
+        self.feed = BattleFeed()
+        # combatant id -> its HP line
+        self._rows: Dict[Any, Static] = {}
+        self._auto = False
     
     def compose(self) -> ComposeResult:
         """
         Create the child widgets for the battle screen.
+        Combatant rows are created in on_mount.
         """
         yield Header(name="Battle!")
         
         with Horizontal(id="battle_layout"):
             # Left side: Hero team
             with Vertical(id="hero_pane"):
-                yield Static("Hero Team (Stub)")
-                yield Static("Hero 1: 100/100 HP")
-                yield Static("Hero 2: 100/100 HP")
-                yield Static("Hero 3: 100/100 HP")
-                yield Static("Hero 4: 100/100 HP")
-                yield Static("Hero 5: 100/100 HP")
+                yield Static("Hero Team")
 
             # Right side: Enemy team
             with Vertical(id="enemy_pane"):
-                yield Static("Enemies (Stub)")
-                yield Static("Enemy 1: 50/50 HP")
-                yield Static("Enemy 2: 50/50 HP")
+                yield Static("Enemies")
+
+        yield RichLog(id="battle_log", max_lines=500)
         
         with Horizontal(id="action_bar"):
             yield Button("Attack", id="btn_attack")
             yield Button("Ability", id="btn_ability")
             yield Button("Item", id="btn_item")
+            yield Button("Auto", id="btn_auto")
+            yield Button("Skip to End", id="btn_skip")
             yield Button("Flee", id="btn_flee")
             
         yield Footer()
 
     def on_mount(self) -> None:
         """
-        Called when the screen is mounted.
+        Called when the screen is mounted. Shows the running battle (or
+        starts one) and the repaint timer.
+        """
+        log.debug("BattleScreen mounted.")
+        self.show_battle()
+        self.set_interval(1 / FRAME_RATE, self.flush_feed)
+
+    def on_screen_resume(self) -> None:
+        """
+        The screen is reused between battles: once the battle shown is
+        over (or another one was started elsewhere), show the current one.
+        """
+        running = self.app.controller.battle_state
+        if self.battle_state.get("result") or (running is not None and running is not self.battle_state):
+            self.show_battle()
+
+    def show_battle(self) -> None:
+        """
+        Shows the controller's running battle, starting a new one of
+        self.encounter_id if there is none.
         """
-        print("BattleScreen mounted (stub).")
-        # Future: Load battle participants from controller/game_state
-        # self.app.controller.start_battle()
+        controller = self.app.controller
+        if controller.battle_state is not None:
+            self.battle_state = controller.battle_state
+        else:
+            self.battle_state = controller.start_battle(self.encounter_id)
+        self._auto = False
+        self.feed = BattleFeed()
+        self.feed.start(self.battle_state)
+
+        for row in self._rows.values():
+            row.remove()
+        self._rows.clear()
+        self.query_one("#battle_log", RichLog).clear()
+        for pane_id, combatants in (("#hero_pane", self.battle_state["heroes"]),
+                                    ("#enemy_pane", self.battle_state["enemies"])):
+            rows = []
+            for combatant in combatants:
+                row = Static(self._hp_text(combatant, combatant["hp"]), markup=False)
+                self._rows[combatant["id"]] = row
+                rows.append(row)
+            self.query_one(pane_id, Vertical).mount_all(rows)
+        self._update_buttons()
+
+    def _hp_text(self, combatant: Dict[str, Any], hp: int) -> str:
+        status = "" if hp > 0 else " (down)"
+        return f"{combatant.get('name', combatant['id'])}: {hp}/{combatant.get('max_hp', hp)} HP{status}"
+
+    def flush_feed(self) -> None:
+        """
+        Applies the buffered battle events to the widgets (one frame).
+        """
+        if not self.feed.is_dirty:
+            return
+        hp_updates, lines, dropped = self.feed.drain()
+        combatants = {c["id"]: c for c in self.battle_state["heroes"] + self.battle_state["enemies"]}
+        for combatant_id, hp in hp_updates.items():
+            row = self._rows.get(combatant_id)
+            if row is not None:
+                row.update(self._hp_text(combatants[combatant_id], hp))
+        log = self.query_one("#battle_log", RichLog)
+        if dropped:
+            log.write(f"... {dropped} more events ...")
+        for line in lines:
+            log.write(line)
+
+    def play_turn(self, action_type: str = "attack") -> bool:
+        """
+        Plays one turn and buffers its events.
+        Returns False once the battle is over.
+        """
+        if self.battle_state is None or self.battle_state.get("result"):
+            return False
+        self.app.controller.battle_turn(action_type, battle_state=self.battle_state)
+        self.feed.push_turn(self.battle_state)
+        if self.battle_state.get("result"):
+            self._on_battle_over()
+            return False
+        return True
+
+    def skip_to_end(self) -> None:
+        """
+        Plays the rest of the battle (at most MAX_SKIP_TURNS turns) in the
+        auto-battle worker, so a long fight never blocks the UI; it can be
+        stopped like auto mode.
+        """
+        self._auto = True
+        self.run_worker(self._auto_battle(MAX_SKIP_TURNS), exclusive=True)
+        self._update_buttons()
+
+    async def _auto_battle(self, max_turns: Optional[int] = None) -> None:
+        # Play turns for most of each frame, then let the UI repaint.
+        # Runs while auto mode is on, or until max_turns turns were played.
+        played = 0
+        while self._auto:
+            deadline = time.perf_counter() + AUTO_TURN_BUDGET
+            while self._auto and time.perf_counter() < deadline:
+                played += 1
+                if not self.play_turn() or played == max_turns:
+                    self._auto = False
+            await asyncio.sleep(0)
+        self.flush_feed()
+        self._update_buttons()
+
+    def _on_battle_over(self) -> None:
+        rewards = self.battle_state.get("granted_rewards") or {}
+        if rewards:
+            self.feed.push_line(", ".join(f"+{amount} {name}" for name, amount in rewards.items()))
+        self._update_buttons()
+
+    def _update_buttons(self) -> None:
+        over = self.battle_state is None or bool(self.battle_state.get("result"))
+        for button_id in ("#btn_attack", "#btn_auto", "#btn_skip"):
+            self.query_one(button_id, Button).disabled = over
+        self.query_one("#btn_auto", Button).label = "Stop" if self._auto else "Auto"
+        self.query_one("#btn_flee", Button).label = "Leave" if over else "Flee"
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
         Handle button press events for battle actions.
         """
         if event.button.id == "btn_attack":
-            print("Stub: 'Attack' button pressed.")
-            # Future: Call controller
-            # self.app.controller.execute_battle_turn("attack")
-            
+            self.play_turn("attack")
+
+        elif event.button.id == "btn_auto":
+            self._auto = not self._auto
+            if self._auto:
+                self.run_worker(self._auto_battle(), exclusive=True)
+            self._update_buttons()
+
+        elif event.button.id == "btn_skip":
+            self.skip_to_end()
+
         elif event.button.id == "btn_flee":
-            print("Stub: 'Flee' button pressed.")
-            # Future: Call controller
-            # self.app.controller.execute_battle_turn("flee")
-            # self.app.pop_screen()
-            pass
\ No newline at end of file
+            self._auto = False
+            self.play_turn("flee")
+            self.app.pop_screen()
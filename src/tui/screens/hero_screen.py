@@ -4,19 +4,39 @@ hero_screen.py
 Implements the Textual Screen for the hero management view.
 This UI displays the 5-hero team, allows viewing stats, 
 and equipping items.
+
+The inventory pane is virtualized (see tui/inventory_view.py) and
+sorted/filtered through an InventoryIndex, so it opens equally fast
+for a handful of items or a hoard of 100k.
 """
 
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button
+from textual.widgets import Header, Footer, Static, Button, Input
 from textual.containers import Vertical, Horizontal
 from textual.app import ComposeResult
+from typing import TYPE_CHECKING, Any, Optional
+
+from game_logic.inventory_index import SORT_KEYS, InventoryIndex
+from tui.inventory_view import InventoryView
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from tui.app import GameApp
 
-# from core.game_controller import GameController
+log = get_logger(__name__)
 
 class HeroScreen(Screen):
     """
     The screen for managing the player's 5-hero team.
     """
+    app: "GameApp"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index: Optional[InventoryIndex] = None
+        self._indexed_version = 0 # GameState.inventory_version the index reflects
+        self._sort = SORT_KEYS[0]
+        self._filter = ""
     
     def compose(self) -> ComposeResult:
         """
@@ -45,9 +65,10 @@ class HeroScreen(Screen):
             
             # Right: Inventory for equipping
             with Vertical(id="hero_inventory"):
-                yield Static("Inventory (Stub)")
-                yield Static("[Sword]")
-                yield Static("[Leather Armor]")
+                yield Static("Inventory", id="inventory_title")
+                yield Input(placeholder="Filter items...", id="inventory_filter")
+                yield Button(f"Sort: {self._sort}", id="btn_sort")
+                yield InventoryView(id="inventory_list")
                 yield Button("Equip Selected Item", id="btn_equip")
 
         yield Button("Return to Main Menu", id="btn_main_menu")
@@ -57,22 +78,65 @@ class HeroScreen(Screen):
         """
         Called when the screen is mounted.
         """
-        print("HeroScreen mounted (stub).")
+        log.debug("HeroScreen mounted.")
         # Future: Load hero data from controller/game_state
         # self.heroes = self.app.controller.game_state.heroes
+        self.refresh_inventory()
+
+    def on_screen_resume(self) -> None:
+        self.refresh_inventory()
+
+    def refresh_inventory(self) -> None:
+        """
+        Shows the inventory with the current sort order and filter.
+        The index is rebuilt whenever the inventory changed elsewhere
+        (battle rewards, upgrade costs, undo, a new game or load);
+        equipping here updates it item by item.
+        """
+        game_state = self.app.controller.game_state
+        if self._index is None or self._indexed_version != game_state.inventory_version:
+            self._index = InventoryIndex(game_state.inventory)
+            self._indexed_version = game_state.inventory_version
+        view = self.query_one("#inventory_list", InventoryView)
+        view.show(self._index, self._index.query(self._sort, text=self._filter))
+        self.query_one("#inventory_title", Static).update(f"Inventory ({len(self._index)} items)")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "inventory_filter":
+            self._filter = event.value
+            self.refresh_inventory()
+
+    def _selected_hero_id(self) -> Optional[Any]:
+        # Future: selection in the team row; for now the first active hero
+        heroes = self.app.controller.game_state.active_heroes
+        return heroes[0].id if heroes else None
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
         Handle button press events.
         """
         if event.button.id == "btn_equip":
-            print("Stub: 'Equip' button pressed.")
-            # Future: Call controller (as per data flow example)
-            # hero_id = ...
-            # item_id = ...
-            # self.app.controller.equip_item(hero_id, item_id)
+            hero_id = self._selected_hero_id()
+            item_id = self.query_one("#inventory_list", InventoryView).selected_item
+            if hero_id is None or item_id is None:
+                return
+            game_state = self.app.controller.game_state
+            unequipped = list(next(h for h in game_state.heroes if h.id == hero_id).equipment.values())
+            was_current = self._indexed_version == game_state.inventory_version
+            if self.app.controller.equip_item(hero_id, item_id):
+                if was_current:
+                    # Only the equipped item and a swapped-out one changed
+                    self._index.sync(game_state.inventory, [item_id] + unequipped)
+                    self._indexed_version = game_state.inventory_version
+                self.refresh_inventory()
+            else:
+                self.notify(f"Cannot equip {item_id}.", severity="warning")
+
+        elif event.button.id == "btn_sort":
+            self._sort = SORT_KEYS[(SORT_KEYS.index(self._sort) + 1) % len(SORT_KEYS)]
+            event.button.label = f"Sort: {self._sort}"
+            self.refresh_inventory()
             
         elif event.button.id == "btn_main_menu":
-            print("Stub: 'Return to Main Menu' button pressed.")
-            # self.app.pop_screen()
-            pass
\ No newline at end of file
+            # The screen stays installed; it refreshes when shown again
+            self.app.pop_screen()
\ No newline at end of file
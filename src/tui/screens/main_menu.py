@@ -11,10 +11,10 @@ from textual.widgets import Header, Footer, Static, Button
 from textual.containers import Vertical
 from textual.app import ComposeResult
 
-# Import other screens to switch to
-from tui.screens.hero_screen import HeroScreen
-from tui.screens.base_screen import BaseScreen
-from tui.screens.battle_screen import BattleScreen
+from utils import startup_trace
+
+# Other screens are shown by name (see GameApp.SCREENS); their modules
+# are only imported when first shown
 
 class MainMenuScreen(Screen):
     """
@@ -42,6 +42,14 @@ class MainMenuScreen(Screen):
 
         yield Footer()
 
+    def on_mount(self) -> None:
+        """
+        The main menu is the first screen: its first frame ends a
+        traced startup (see utils/startup_trace.py).
+        """
+        startup_trace.mark("main_menu_mounted")
+        self.call_after_refresh(startup_trace.ready)
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
         Handle button press events on the main menu.
@@ -50,25 +58,27 @@ class MainMenuScreen(Screen):
             # print("Stub: 'New Game' pressed.")
             # Future: Call controller to initialize a new game state
             self.app.controller.new_game() # Call controller
-            self.app.push_screen(BaseScreen()) # e.g., go to base
+            self.app.push_screen("base") # e.g., go to base
 
         elif event.button.id == "btn_load_game":
             # print("Stub: 'Load Game' pressed.")
             # Future: Call controller to load game state
-            self.app.controller.load_game() # Call controller
-            self.app.push_screen(BaseScreen()) # e.g., go to base
+            if self.app.controller.load_game(): # Call controller
+                self.app.push_screen("base") # e.g., go to base
+            else:
+                self.notify("No saved game could be loaded.", severity="warning")
 
         elif event.button.id == "btn_goto_base":
             # print("Stub: 'Go to Base' pressed.")
-            self.app.push_screen(BaseScreen())
+            self.app.push_screen("base")
 
         elif event.button.id == "btn_goto_heroes":
             # print("Stub: 'Go to Heroes' pressed.")
-            self.app.push_screen(HeroScreen())
+            self.app.push_screen("heroes")
 
         elif event.button.id == "btn_goto_battle":
              # print("Stub: 'Go to Battle' pressed.")
-             self.app.push_screen(BattleScreen())
+             self.app.push_screen("battle")
 
         elif event.button.id == "btn_quit":
             # print("Stub: 'Quit' pressed.")
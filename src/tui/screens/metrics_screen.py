@@ -0,0 +1,87 @@
+"""
+metrics_screen.py
+
+A hidden debug overlay (F12 from any screen) listing the per-function
+metrics of the game rules (GameController.metrics(), see
+utils/instrumentation.py), refreshed every second.
+"""
+
+from textual.screen import ModalScreen
+from textual.widgets import DataTable, Static
+from textual.containers import Vertical
+from textual.app import ComposeResult
+from typing import TYPE_CHECKING
+
+from utils import instrumentation
+
+if TYPE_CHECKING:
+    from tui.app import GameApp
+
+# Seconds between two refreshes of the table
+REFRESH_INTERVAL = 1.0
+
+class MetricsScreen(ModalScreen):
+    """
+    Overlay with one table row per instrumented function that was called.
+    """
+    app: "GameApp"
+
+    DEFAULT_CSS = """
+    MetricsScreen {
+        align: center middle;
+    }
+    #metrics_box {
+        width: 90%;
+        height: 80%;
+        border: round $accent;
+        background: $surface;
+    }
+    #metrics_table {
+        height: 1fr;
+    }
+    """
+
+    BINDINGS = [
+        ("escape,f12", "app.pop_screen", "Close"),
+        ("e", "toggle_instrumentation", "On/off"),
+        ("r", "reset", "Reset"),
+    ]
+
+    COLUMNS = ("function", "calls", "total ms", "mean us", "p50 us", "p99 us", "max us", "alloc blocks")
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="metrics_box"):
+            yield Static("", id="metrics_status")
+            yield DataTable(id="metrics_table", cursor_type="row", zebra_stripes=True)
+
+    def on_mount(self) -> None:
+        self.query_one("#metrics_table", DataTable).add_columns(*self.COLUMNS)
+        self.set_interval(REFRESH_INTERVAL, self.refresh_metrics)
+
+    def on_screen_resume(self) -> None:
+        self.refresh_metrics()
+
+    def refresh_metrics(self) -> None:
+        metrics = self.app.controller.metrics()
+        state = "on" if instrumentation.is_enabled() else "off (press e to turn on)"
+        self.query_one("#metrics_status", Static).update(
+            f"Game rule metrics: {state} - r: reset, Esc: close"
+        )
+        table = self.query_one("#metrics_table", DataTable)
+        table.clear()
+        for name, m in metrics.items():
+            table.add_row(
+                name, f"{m['calls']:,}", f"{m['total_ms']:.1f}", f"{m['mean_us']:.1f}",
+                f"<{m['p50_us']:g}", f"<{m['p99_us']:g}", f"{m['max_us']:.0f}", f"{m['alloc_blocks']:,}",
+            )
+
+    def action_toggle_instrumentation(self) -> None:
+        if instrumentation.is_enabled():
+            instrumentation.disable()
+        else:
+            instrumentation.enable()
+        self.refresh_metrics()
+
+    def action_reset(self) -> None:
+        self.app.controller.metrics(reset=True)
+        self.refresh_metrics()
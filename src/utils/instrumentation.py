@@ -0,0 +1,162 @@
+"""
+instrumentation.py
+
+Opt-in per-function metrics for the game rules: call counts, latency
+histograms and allocation counts of every public function of the
+modules in INSTRUMENTED_MODULES.
+
+Instrumentation is off by default and then costs nothing: enable()
+replaces the public functions of those modules by timing wrappers
+(module attributes, so calls like battle_system.process_battle_turn
+and calls inside the module both go through them) and disable() puts
+the originals back. A name imported elsewhere with 'from module import
+function' before enable() keeps calling the original.
+
+Latencies are kept in power-of-two buckets of microseconds, so
+recording a call is a few integer operations whatever the number of
+calls. Allocations are the net number of memory blocks the call left
+allocated (sys.getallocatedblocks), a cheap hint at which rule creates
+garbage; both figures include the functions a function calls.
+
+Usage:
+    instrumentation.enable()
+    ... play ...
+    instrumentation.snapshot() # or GameController.metrics()
+"""
+
+import functools
+import importlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Modules whose public functions are instrumented
+INSTRUMENTED_MODULES = (
+    "game_logic.battle_system",
+    "game_logic.hero_manager",
+    "game_logic.item_manager",
+    "game_logic.base_manager",
+)
+
+# Set to 1 to enable instrumentation at startup (see main.py)
+ENABLE_ENV = "TUI_GAME_METRICS"
+
+# Latency histogram buckets: bucket b holds calls of < 2**b microseconds
+HISTOGRAM_BUCKETS = 32
+
+class FunctionStats:
+    """
+    Metrics of one function.
+    """
+    __slots__ = ("calls", "total_ns", "max_ns", "histogram", "alloc_blocks")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self.alloc_blocks = 0
+
+    def record(self, elapsed_ns: int, alloc_blocks: int):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[min((elapsed_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.alloc_blocks += alloc_blocks
+
+    def percentile_us(self, fraction: float) -> float:
+        """
+        Upper bound (bucket limit) of the given fraction of call latencies.
+        """
+        target = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return float(2 ** bucket)
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1000 if self.calls else 0.0,
+            "p50_us": self.percentile_us(0.5),
+            "p99_us": self.percentile_us(0.99),
+            "max_us": self.max_ns / 1000,
+            "alloc_blocks": self.alloc_blocks,
+            # Upper bound in microseconds -> calls
+            "histogram": {2 ** b: c for b, c in enumerate(self.histogram) if c},
+        }
+
+_stats: Dict[str, FunctionStats] = {}
+# (module, attribute name, original function) of every installed wrapper
+_originals: List[Tuple[Any, str, Callable]] = []
+
+def _wrap(qualified_name: str, func: Callable) -> Callable:
+    stats = _stats.setdefault(qualified_name, FunctionStats())
+    clock = time.perf_counter_ns
+    blocks = sys.getallocatedblocks
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        blocks_before = blocks()
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.record(clock() - start, blocks() - blocks_before)
+    return wrapper
+
+def _public_functions(module) -> List[Tuple[str, Callable]]:
+    return [
+        (name, value) for name, value in vars(module).items()
+        if not name.startswith("_") and callable(value) and not isinstance(value, type)
+        and getattr(value, "__module__", None) == module.__name__
+    ]
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+def enable():
+    """
+    Starts recording the public functions of INSTRUMENTED_MODULES.
+    """
+    if _originals:
+        return
+    for module_name in INSTRUMENTED_MODULES:
+        module = importlib.import_module(module_name)
+        short_name = module_name.rsplit(".", 1)[-1]
+        for name, func in _public_functions(module):
+            _originals.append((module, name, func))
+            setattr(module, name, _wrap(f"{short_name}.{name}", func))
+
+def disable():
+    """
+    Restores the original functions; recorded metrics are kept.
+    """
+    while _originals:
+        module, name, func = _originals.pop()
+        setattr(module, name, func)
+
+def enable_from_env():
+    if os.environ.get(ENABLE_ENV, "") not in ("", "0"):
+        enable()
+
+def reset():
+    """
+    Clears the recorded metrics.
+    """
+    for stats in _stats.values():
+        stats.__init__()
+
+def snapshot(min_calls: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Metrics of every instrumented function called at least min_calls
+    times, by 'module.function', most total time first.
+    """
+    items = [(name, s) for name, s in _stats.items() if s.calls >= min_calls]
+    items.sort(key=lambda item: item[1].total_ns, reverse=True)
+    return {name: s.to_dict() for name, s in items}
@@ -2,33 +2,140 @@
 logger.py
 
 Provides a shared logging utility for the application.
+
+Modules get a child of the "tui_game" logger and log with lazy
+%-style arguments:
+    log = get_logger(__name__)
+    log.debug("Calculating stats for %s", hero.name)
+The message is only formatted when its level is enabled, and the level
+check is cached by the logging module, so a disabled debug call in a hot
+loop costs about as much as an attribute lookup. Don't build messages
+with f-strings; they are formatted even when the level is off.
+
+Nothing is written until an entry point (main.py, simulate.py) calls
+setup_logger(). Records are then put on a queue by the calling thread
+and written by a background thread to a rotating file, one JSON object
+per line; the game never waits for the disk and nothing reaches the
+terminal Textual draws on. Before setup (e.g., in tests or benchmarks)
+only warnings and errors are shown, on stderr.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+from typing import Optional
+
+# Parent of all the game's loggers
+ROOT_LOGGER = "tui_game"
+
+# Environment variables overriding the setup_logger defaults
+LEVEL_ENV = "TUI_GAME_LOG_LEVEL" # e.g. DEBUG
+FILE_ENV = "TUI_GAME_LOG_FILE"
+
+DEFAULT_LEVEL = logging.INFO
+DEFAULT_FILE = "game.log"
+MAX_FILE_BYTES = 1024 * 1024
+BACKUP_COUNT = 3
+
+# Attributes every LogRecord has; any other attribute came from 'extra='
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object: time, level, logger, message,
+    the fields passed with extra={...} and the traceback, if any.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns the logger of a module (pass __name__), below "tui_game".
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+# The application's root logger, for code that imported it before
+# get_logger existed. Importing it no longer configures anything.
+log = logging.getLogger(ROOT_LOGGER)
 
-def setup_logger() -> logging.Logger:
+def _level_from_env() -> int:
     """
-    Configures and returns a root logger for the application.
+    Returns the level named by TUI_GAME_LOG_LEVEL, or DEFAULT_LEVEL if it
+    is unset or not a level name (with a warning on stderr).
+    """
+    name = os.environ.get(LEVEL_ENV, "").strip().upper()
+    if not name:
+        return DEFAULT_LEVEL
+    level = logging.getLevelNamesMapping().get(name)
+    if level is None:
+        print(f"Warning: unknown {LEVEL_ENV} '{name}', using "
+              f"{logging.getLevelName(DEFAULT_LEVEL)}.", file=sys.stderr)
+        return DEFAULT_LEVEL
+    return level
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logger(level: Optional[int] = None, filepath: Optional[str] = None) -> logging.Logger:
     """
-    
-    # This setup is basic. For Textual, logging to a file
-    # or the Textual dev console is often preferred over stdout.
-    
-    logger = logging.getLogger("tui_game")
-    logger.setLevel(logging.DEBUG) # Set to DEBUG for development
-    
+    Configures and returns the root logger for the application:
+    records of 'level' and above go through a queue to a rotating
+    JSON-lines file. Defaults come from the TUI_GAME_LOG_LEVEL and
+    TUI_GAME_LOG_FILE environment variables, then INFO and 'game.log'
+    (an unknown level name falls back to INFO).
+    Calling it again only changes the level.
+    """
+    global _listener
+    logger = logging.getLogger(ROOT_LOGGER)
+    if level is None:
+        level = _level_from_env()
+    logger.setLevel(level)
+
     # Avoid adding duplicate handlers if called multiple times
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    if _listener is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            filepath or os.environ.get(FILE_ENV) or DEFAULT_FILE,
+            maxBytes=MAX_FILE_BYTES, backupCount=BACKUP_COUNT, delay=True,
         )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
-    logger.info("Logger configured (stub).")
+        file_handler.setFormatter(StructuredFormatter())
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(records, file_handler)
+        _listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        logger.propagate = False
+        atexit.register(shutdown_logger)
+
+    logger.info("Logger configured.", extra={"level_name": logging.getLevelName(logger.level)})
     return logger
 
-# Initialize a default logger for easy import
-log = setup_logger()
\ No newline at end of file
+def shutdown_logger():
+    """
+    Writes the queued records and stops the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logger = logging.getLogger(ROOT_LOGGER)
+        for handler in [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+            logger.removeHandler(handler)
+        logger.propagate = True
@@ -0,0 +1,146 @@
+"""
+startup_trace.py
+
+Times the phases of a cold start of the game (see 'python main.py
+--trace-startup') and checks them against a budget.
+
+Code on the startup path marks its work with
+    with startup_trace.phase("GameState init"):
+        ...
+and notable moments with startup_trace.mark("main_menu_mounted").
+Both do nothing unless a trace was started with begin(), so they can
+stay in place. This module only imports the standard library, so
+importing it does not show up in the import timings it takes.
+"""
+
+import contextlib
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Seconds a cold start may take; keys are phase or mark names of a report
+STARTUP_BUDGETS: Dict[str, float] = {
+    "first_frame": 2.0, # Main menu on screen
+    "imports": 1.0,
+}
+
+class StartupTrace:
+    """
+    Phases (with their nesting depth) and marks of one startup, in
+    seconds since the trace began.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self._depth = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        entry = {"name": name, "start": self.elapsed(), "seconds": 0.0, "depth": self._depth}
+        self.phases.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry["seconds"] = self.elapsed() - entry["start"]
+
+    def mark(self, name: str):
+        # Only the first occurrence counts (e.g., the first mount of a screen)
+        self.marks.setdefault(name, self.elapsed())
+
+    def to_dict(self) -> Dict[str, Any]:
+        import platform
+        return {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "phases": self.phases,
+            "marks": self.marks,
+        }
+
+    def write(self, filepath: str):
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+_active: Optional[StartupTrace] = None
+
+# Called once the first frame is on screen, traced or not
+_ready_callbacks: List[Callable[[], None]] = []
+
+def begin() -> StartupTrace:
+    """
+    Starts tracing; phase() and mark() record into the returned trace.
+    """
+    global _active
+    _active = StartupTrace()
+    return _active
+
+def end() -> Optional[StartupTrace]:
+    """
+    Stops tracing and returns the trace (None if none was running).
+    """
+    global _active
+    trace, _active = _active, None
+    return trace
+
+def phase(name: str):
+    """
+    Times a block as a startup phase if a trace is running.
+    """
+    return _active.phase(name) if _active is not None else contextlib.nullcontext()
+
+def mark(name: str):
+    if _active is not None:
+        _active.mark(name)
+
+def on_ready(callback: Callable[[], None]):
+    """
+    Calls callback once the first frame is on screen (e.g., to exit a
+    headless run), whether or not a trace is running.
+    """
+    _ready_callbacks.append(callback)
+
+def ready():
+    """
+    Marks the first frame as painted (called by the first screen) and
+    runs the on_ready() callbacks.
+    """
+    if _active is not None:
+        _active.mark("first_frame")
+    callbacks = _ready_callbacks[:]
+    _ready_callbacks.clear()
+    for callback in callbacks:
+        callback()
+
+def timings(report: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Seconds of every phase (its first occurrence) and mark of a report,
+    by name. Marks count from the start of the trace.
+    """
+    result: Dict[str, float] = {}
+    for entry in report["phases"]:
+        result.setdefault(entry["name"], entry["seconds"])
+    result.update(report["marks"])
+    return result
+
+def check_budget(report: Dict[str, Any], budgets: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Compares a report (StartupTrace.to_dict) with budgets (default
+    STARTUP_BUDGETS). Returns one message per exceeded or missing entry;
+    an empty list means the startup is within budget.
+    """
+    measured = timings(report)
+    problems = []
+    for name, limit in (budgets if budgets is not None else STARTUP_BUDGETS).items():
+        seconds = measured.get(name)
+        if seconds is None:
+            problems.append(f"{name}: not measured")
+        elif seconds > limit:
+            problems.append(f"{name}: {seconds:.3f}s exceeds budget of {limit:.3f}s")
+    return problems